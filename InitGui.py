@@ -90,6 +90,14 @@ class ExportPlusWorkbench(Workbench):
             "ExportPlus_SVG",
             "ExportPlus_DXF",
             "ExportPlus_PDF",
+            "Separator",
+            "ExportPlus_Watch",
+            "ExportPlus_StopWatch",
+            "ExportPlus_History",
+            "ExportPlus_ProfiledExport",
+            "Separator",
+            "ExportPlus_Overrides",
+            "ExportPlus_ExportDocument",
         ]
 
         # Option 1: Add to File menu (integrates with standard FreeCAD workflow)
@@ -152,6 +160,8 @@ def init_global_integration():
         FreeCAD.Console.PrintLog("ExportPlus: Initializing global integration...\n")
         import exportplus_init_global
         exportplus_init_global.add_to_file_menu()
+        import exportplus_warmer
+        exportplus_warmer.install()
     except Exception as e:
         import traceback
         FreeCAD.Console.PrintWarning(f"ExportPlus: Could not register global integration: {e}\n")
@@ -0,0 +1,132 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2026 ExportPlus Workbench                               *
+# *                                                                         *
+# *   This file is part of the ExportPlus FreeCAD Workbench.                *
+# *                                                                         *
+# *   ExportPlus is free software: you can redistribute it and/or modify    *
+# *   it under the terms of the GNU Lesser General Public License as        *
+# *   published by the Free Software Foundation, either version 2.1 of the  *
+# *   License, or (at your option) any later version.                       *
+# *                                                                         *
+# *   ExportPlus is distributed in the hope that it will be useful, but     *
+# *   WITHOUT ANY WARRANTY; without even the implied warranty of            *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU      *
+# *   Lesser General Public License for more details.                       *
+# *                                                                         *
+# *   You should have received a copy of the GNU Lesser General Public      *
+# *   License along with ExportPlus. If not, see                            *
+# *   <https://www.gnu.org/licenses/>.                                      *
+# *                                                                         *
+# ***************************************************************************
+
+"""Small in-memory caches shared by the ExportPlus export stages"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+class ResultCache:
+    """Thread-safe LRU cache bounded by entry count and (optionally) size
+
+    Values are stored together with a caller-supplied size in bytes so
+    that caches holding large results (BREP strings, meshes) can be kept
+    under a memory budget. A max_bytes of 0 disables the size limit.
+    on_evict(key, value) is called for entries pushed out by the limits.
+    """
+
+    def __init__(self, max_entries=128, max_bytes=0, on_evict=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.on_evict = on_evict
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        """Return the cached value for key and mark it as recently used"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, size=0):
+        """Store value under key, evicting least recently used entries"""
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._total_bytes -= old[1]
+            if self.max_bytes and size > self.max_bytes:
+                # Never cache a single value larger than the whole budget
+                return
+            self._entries[key] = (value, size)
+            self._total_bytes += size
+            evicted = self._evict()
+        if self.on_evict is not None:
+            for evicted_key, evicted_value in evicted:
+                self.on_evict(evicted_key, evicted_value)
+
+    def discard(self, key):
+        """Remove key from the cache if present"""
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._total_bytes -= old[1]
+
+    def clear(self):
+        """Drop every cached entry"""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def _evict(self):
+        evicted = []
+        while self._entries and (
+            len(self._entries) > self.max_entries
+            or (self.max_bytes and self._total_bytes > self.max_bytes)
+        ):
+            key, (value, size) = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            evicted.append((key, value))
+        return evicted
+
+    @property
+    def total_bytes(self):
+        return self._total_bytes
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+def shape_to_brep(shape):
+    """Serialize a shape to a BREP string, dropping any stored triangulation"""
+    # copy() does not carry the mesh over, so the string (and its digest)
+    # does not depend on whether the shape has been tessellated before
+    return shape.copy().exportBrepToString()
+
+
+def shape_from_brep(brep):
+    """Rebuild a shape from a BREP string produced by shape_to_brep()"""
+    import Part
+
+    shape = Part.Shape()
+    shape.importBrepFromString(brep)
+    return shape
+
+
+def brep_digest(brep):
+    """Return a stable hex digest for a BREP string"""
+    return hashlib.sha1(brep.encode("utf-8")).hexdigest()
@@ -0,0 +1,173 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2026 ExportPlus Workbench                               *
+# *                                                                         *
+# *   This file is part of the ExportPlus FreeCAD Workbench.                *
+# *                                                                         *
+# *   ExportPlus is free software: you can redistribute it and/or modify    *
+# *   it under the terms of the GNU Lesser General Public License as        *
+# *   published by the Free Software Foundation, either version 2.1 of the  *
+# *   License, or (at your option) any later version.                       *
+# *                                                                         *
+# *   ExportPlus is distributed in the hope that it will be useful, but     *
+# *   WITHOUT ANY WARRANTY; without even the implied warranty of            *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU      *
+# *   Lesser General Public License for more details.                       *
+# *                                                                         *
+# *   You should have received a copy of the GNU Lesser General Public      *
+# *   License along with ExportPlus. If not, see                            *
+# *   <https://www.gnu.org/licenses/>.                                      *
+# *                                                                         *
+# ***************************************************************************
+
+
+"""Shape pre-check - find broken geometry before an export starts
+
+Invalid or self-intersecting shapes tend to make Import.export or
+Mesh.export fail (or hang) late in a long batch. With PreCheckMode set,
+every selected object is checked in the worker pool before anything is
+scaled or written: BRep validity, closed shells of solids and degenerate
+faces, plus an optional boolean self-intersection check. Results are
+cached by shape fingerprint, so unchanged parts are checked only once.
+"""
+
+import FreeCAD
+
+import exportplus_cache
+import exportplus_fingerprint
+import exportplus_parallel
+import exportplus_settings
+
+
+# off: no check, report: warn and export anyway, skip: leave failing
+# objects out, abort: refuse to export
+PRECHECK_MODES = ("off", "report", "skip", "abort")
+
+# Faces smaller than (bounding box diagonal * DEGENERATE_RATIO) ** 2 are degenerate
+DEGENERATE_RATIO = 1e-7
+
+_check_cache = exportplus_cache.ResultCache(max_entries=4096)
+
+
+def get_mode():
+    """Return the configured pre-check mode"""
+    mode = exportplus_settings.current().PreCheckMode.lower()
+    return mode if mode in PRECHECK_MODES else "off"
+
+
+def _check_worker(task):
+    """Return the problems found in one shape - executed in a worker"""
+    brep, self_intersection = task
+    shape = exportplus_cache.shape_from_brep(brep)
+    problems = []
+    if not shape.isValid():
+        problems.append("invalid shape")
+
+    open_shells = sum(
+        1 for solid in shape.Solids for shell in solid.Shells if not shell.isClosed()
+    )
+    if open_shells:
+        problems.append(f"{open_shells} open shell(s)")
+
+    min_area = (shape.BoundBox.DiagonalLength * DEGENERATE_RATIO) ** 2
+    degenerate = sum(1 for face in shape.Faces if face.Area <= min_area)
+    if degenerate:
+        problems.append(f"{degenerate} degenerate face(s)")
+
+    if self_intersection:
+        try:
+            shape.check(True)
+        except Exception as e:
+            problems.append(f"self-intersection: {str(e).strip()}")
+    return tuple(problems)
+
+
+def check_objects(objects):
+    """
+    Check the shapes of objects in parallel
+
+    Returns a list of (object, problems) for the objects that failed.
+    Objects without a shape are not checked.
+    """
+    self_intersection = exportplus_settings.current().PreCheckSelfIntersection
+    checked = []
+    tasks = []
+    task_keys = []
+    results = {}
+    for obj in objects:
+        shape = getattr(obj, "Shape", None)
+        if shape is None or shape.isNull():
+            continue
+        key = (exportplus_fingerprint.object_fingerprint(obj), self_intersection)
+        checked.append((obj, key))
+        if key in results:
+            continue
+        cached = _check_cache.get(key)
+        if cached is not None:
+            results[key] = cached
+        else:
+            # Mark as pending so identical shapes are checked once
+            results[key] = None
+            tasks.append((exportplus_cache.shape_to_brep(shape), self_intersection))
+            task_keys.append(key)
+
+    for key, problems in zip(task_keys, exportplus_parallel.map_parallel(_check_worker, tasks)):
+        results[key] = problems
+        _check_cache.put(key, problems)
+
+    FreeCAD.Console.PrintLog(
+        f"ExportPlus: Pre-checked {len(checked)} object(s), "
+        f"{len(checked) - len(tasks)} taken from cache\n"
+    )
+    return [(obj, results[key]) for obj, key in checked if results[key]]
+
+
+def precheck(objects, mode=None):
+    """
+    Check objects before an export according to PreCheckMode
+
+    Returns the objects to export. Failures are reported in the report
+    view; in skip mode the failing objects are left out, in abort mode
+    a ValueError is raised.
+    """
+    if mode is None:
+        mode = get_mode()
+    objects = list(objects)
+    if mode == "off":
+        return objects
+
+    failures = check_objects(objects)
+    if not failures:
+        return objects
+
+    for obj, problems in failures:
+        FreeCAD.Console.PrintWarning(
+            f"ExportPlus: {obj.Label}: {', '.join(problems)}\n"
+        )
+    if mode == "abort":
+        raise ValueError(
+            f"{len(failures)} object(s) failed the pre-export check: "
+            + ", ".join(obj.Label for obj, _ in failures)
+        )
+    if mode == "skip":
+        failed = set(id(obj) for obj, _ in failures)
+        FreeCAD.Console.PrintWarning(
+            f"ExportPlus: Skipping {len(failures)} object(s) that failed the pre-export check\n"
+        )
+        return [obj for obj in objects if id(obj) not in failed]
+    return objects
+
+
+def check_batch(objects):
+    """
+    Check every object of a batch in one parallel pass
+
+    The results are cached for the per-export checks; in abort mode a
+    ValueError is raised before the first file is written.
+    """
+    mode = get_mode()
+    if mode == "abort":
+        precheck(objects, mode)
+    elif mode != "off":
+        check_objects(objects)
@@ -25,17 +25,33 @@
 
 import os
 import sys
-import tempfile
+import time
 import FreeCAD
 import FreeCADGui
-import Part
 from PySide import QtGui, QtCore
 
+import exportplus_overrides
+import exportplus_profiles
+import exportplus_selection
+from exportplus_export import (
+    EXPORT_FUNCTIONS,
+    FORMAT_EXTENSIONS,
+    export_dxf,
+    export_obj,
+    export_pdf,
+    export_step,
+    export_stl,
+    export_svg,
+    export_with_scaling,
+    get_scaling_factor,
+    scale_object,
+)
+
 
 class QuickExportDialog(QtGui.QDialog):
     """Quick export dialog to choose format"""
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, objects=None):
         super(QuickExportDialog, self).__init__(parent)
         self.setWindowTitle("Quick Export with Scaling")
         self.setModal(True)
@@ -49,6 +65,7 @@ class QuickExportDialog(QtGui.QDialog):
 
         # Format buttons with icons and shortcuts
         self.format_buttons = {}
+        self.estimate_labels = {}
         formats = [
             ("STEP", "S", "CAD interchange format"),
             ("STL", "T", "3D printing / mesh format"),
@@ -56,6 +73,8 @@ class QuickExportDialog(QtGui.QDialog):
             ("DXF", "D", "2D CAD format"),
             ("SVG", "V", "2D vector graphics"),
             ("PDF", "P", "Portable document format"),
+            ("PLY", "L", "Point cloud (binary PLY)"),
+            ("NPZ", "N", "Point cloud (NumPy arrays)"),
         ]
 
         for format_name, shortcut, description in formats:
@@ -66,6 +85,29 @@ class QuickExportDialog(QtGui.QDialog):
             btn.clicked.connect(lambda checked=False, fmt=format_name: self.accept_format(fmt))
             self.format_buttons[format_name] = btn
             layout.addWidget(btn)
+            estimate_label = QtGui.QLabel("")
+            estimate_label.setStyleSheet("color: gray; padding-left: 8px;")
+            self.estimate_labels[format_name] = estimate_label
+            layout.addWidget(estimate_label)
+
+        # Export profiles
+        layout.addSpacing(10)
+        profiles_label = QtGui.QLabel("Or run export profiles:")
+        profiles_label.setStyleSheet("font-weight: bold;")
+        layout.addWidget(profiles_label)
+        self.profile_list = QtGui.QListWidget()
+        self.profile_list.setMaximumHeight(110)
+        self.profile_list.itemDoubleClicked.connect(self.accept_profile_item)
+        layout.addWidget(self.profile_list)
+        profile_buttons = QtGui.QHBoxLayout()
+        btn_run_profiles = QtGui.QPushButton("Export Checked Profiles...")
+        btn_run_profiles.clicked.connect(self.accept_profiles)
+        profile_buttons.addWidget(btn_run_profiles)
+        btn_save_profile = QtGui.QPushButton("Save Settings as Profile...")
+        btn_save_profile.clicked.connect(self.save_profile)
+        profile_buttons.addWidget(btn_save_profile)
+        layout.addLayout(profile_buttons)
+        self.load_profiles()
 
         # Cancel button
         layout.addSpacing(10)
@@ -75,14 +117,89 @@ class QuickExportDialog(QtGui.QDialog):
 
         self.setLayout(layout)
         self.selected_format = None
+        self.selected_profiles = []
 
         # Set size
-        self.resize(450, 400)
+        self.resize(450, 780)
+
+        # Estimates are computed once the dialog is shown
+        self.objects = objects or []
+        if self.objects:
+            for estimate_label in self.estimate_labels.values():
+                estimate_label.setText("Estimating...")
+            QtCore.QTimer.singleShot(0, self.update_estimates)
+
+    def update_estimates(self):
+        """Show the estimated time, size and triangle count of each format"""
+        import exportplus_estimate
+
+        # Formats resolving to the same objects share one estimate_all() call
+        groups = {}
+        for format_name in self.estimate_labels:
+            objects = exportplus_selection.resolve_selection(self.objects, format_name)
+            key = tuple(obj.Name for obj in objects)
+            groups.setdefault(key, (objects, []))[1].append(format_name)
+        estimates = {}
+        for objects, formats in groups.values():
+            estimates.update(exportplus_estimate.estimate_all(objects, formats))
+
+        for format_name, estimate_label in self.estimate_labels.items():
+            estimate = estimates.get(format_name)
+            if estimate is None:
+                estimate_label.setText("")
+                continue
+            estimate_label.setText(estimate.summary())
+            estimate_label.setToolTip(f"Estimated from {estimate.source}")
+            if estimate.is_large:
+                estimate_label.setStyleSheet("color: #c0392b; font-weight: bold; padding-left: 8px;")
+                self.format_buttons[format_name].setToolTip(
+                    self.format_buttons[format_name].toolTip()
+                    + f"\n\nWarning: large export ({estimate.summary()})"
+                )
 
     def accept_format(self, format_name):
         self.selected_format = format_name
         self.accept()
 
+    def load_profiles(self):
+        """Fill the profile list from the stored export profiles"""
+        self.profile_list.clear()
+        for profile in exportplus_profiles.load_profiles().values():
+            scale = "preferences" if profile.scale is None else f"{profile.scale:g}"
+            item = QtGui.QListWidgetItem(f"{profile.name} ({profile.format}, scale {scale})")
+            item.setData(QtCore.Qt.UserRole, profile.name)
+            item.setFlags(item.flags() | QtCore.Qt.ItemIsUserCheckable)
+            item.setCheckState(QtCore.Qt.Unchecked)
+            self.profile_list.addItem(item)
+
+    def accept_profile_item(self, item):
+        self.selected_profiles = [item.data(QtCore.Qt.UserRole)]
+        self.accept()
+
+    def accept_profiles(self):
+        self.selected_profiles = [
+            self.profile_list.item(i).data(QtCore.Qt.UserRole)
+            for i in range(self.profile_list.count())
+            if self.profile_list.item(i).checkState() == QtCore.Qt.Checked
+        ]
+        if self.selected_profiles:
+            self.accept()
+
+    def save_profile(self):
+        """Store the current preferences for one format as a new profile"""
+        format_name, ok = QtGui.QInputDialog.getItem(
+            self, "Save Export Profile", "Format:", list(EXPORT_FUNCTIONS), 0, False
+        )
+        if not ok:
+            return
+        name, ok = QtGui.QInputDialog.getText(self, "Save Export Profile", "Profile name:")
+        if not ok or not name.strip():
+            return
+        exportplus_profiles.add_profile(
+            exportplus_profiles.profile_from_current(name.strip(), format_name)
+        )
+        self.load_profiles()
+
     def keyPressEvent(self, event):
         """Handle keyboard shortcuts"""
         key = event.text().upper()
@@ -93,6 +210,8 @@ class QuickExportDialog(QtGui.QDialog):
             'D': 'DXF',
             'V': 'SVG',
             'P': 'PDF',
+            'L': 'PLY',
+            'N': 'NPZ',
         }
 
         if key in format_map:
@@ -101,6 +220,155 @@ class QuickExportDialog(QtGui.QDialog):
             super(QuickExportDialog, self).keyPressEvent(event)
 
 
+class ExportHistoryDialog(QtGui.QDialog):
+    """Browse the export history and its timing trends"""
+
+    EXPORT_COLUMNS = [
+        ("Time", "timestamp"),
+        ("Document", "document"),
+        ("Objects", "objects"),
+        ("Format", "format"),
+        ("Scale", "scale"),
+        ("Seconds", "total_seconds"),
+        ("Size (bytes)", "size_bytes"),
+        ("Triangles", "triangles"),
+        ("Status", "status"),
+        ("Stages", "stages"),
+    ]
+
+    TREND_COLUMNS = [
+        ("Document", "document"),
+        ("Objects", "objects"),
+        ("Format", "format"),
+        ("Runs", "count"),
+        ("First (s)", "first_seconds"),
+        ("Last (s)", "last_seconds"),
+        ("Average (s)", "avg_seconds"),
+        ("Last / first", "ratio"),
+    ]
+
+    def __init__(self, parent=None):
+        super(ExportHistoryDialog, self).__init__(parent)
+        self.setWindowTitle("Export History")
+
+        layout = QtGui.QVBoxLayout()
+
+        # Filters
+        filter_layout = QtGui.QHBoxLayout()
+        self.filter_edit = QtGui.QLineEdit()
+        self.filter_edit.setPlaceholderText("Filter by document, object or file")
+        self.filter_edit.returnPressed.connect(self.refresh)
+        filter_layout.addWidget(self.filter_edit)
+        self.format_combo = QtGui.QComboBox()
+        self.format_combo.addItems(["All formats"] + list(EXPORT_FUNCTIONS.keys()))
+        self.format_combo.currentIndexChanged.connect(self.refresh)
+        filter_layout.addWidget(self.format_combo)
+        layout.addLayout(filter_layout)
+
+        tabs = QtGui.QTabWidget()
+        self.exports_table = self._make_table(self.EXPORT_COLUMNS)
+        self.trends_table = self._make_table(self.TREND_COLUMNS)
+        tabs.addTab(self.exports_table, "Exports")
+        tabs.addTab(self.trends_table, "Trends")
+        layout.addWidget(tabs)
+
+        # Buttons
+        button_layout = QtGui.QHBoxLayout()
+        btn_csv = QtGui.QPushButton("Export CSV...")
+        btn_csv.clicked.connect(self.export_csv)
+        button_layout.addWidget(btn_csv)
+        btn_clear = QtGui.QPushButton("Clear History")
+        btn_clear.clicked.connect(self.clear_history)
+        button_layout.addWidget(btn_clear)
+        button_layout.addStretch()
+        btn_close = QtGui.QPushButton("Close")
+        btn_close.clicked.connect(self.accept)
+        button_layout.addWidget(btn_close)
+        layout.addLayout(button_layout)
+
+        self.setLayout(layout)
+        self.resize(1000, 500)
+        self.refresh()
+
+    @staticmethod
+    def _make_table(columns):
+        table = QtGui.QTableWidget(0, len(columns))
+        table.setHorizontalHeaderLabels([title for title, _ in columns])
+        table.setEditTriggers(QtGui.QAbstractItemView.NoEditTriggers)
+        table.setSelectionBehavior(QtGui.QAbstractItemView.SelectRows)
+        table.setSortingEnabled(True)
+        return table
+
+    @staticmethod
+    def _format_value(key, value):
+        if value is None:
+            return ""
+        if key == "timestamp":
+            return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(value))
+        if isinstance(value, float):
+            return f"{value:.3f}"
+        return str(value)
+
+    def _fill(self, table, columns, rows):
+        table.setSortingEnabled(False)
+        table.setRowCount(len(rows))
+        for row_index, row in enumerate(rows):
+            for col_index, (_, key) in enumerate(columns):
+                value = row.get(key)
+                item = QtGui.QTableWidgetItem()
+                if isinstance(value, (int, float)) and key != "timestamp":
+                    item.setData(QtCore.Qt.DisplayRole, value)
+                else:
+                    item.setText(self._format_value(key, value))
+                table.setItem(row_index, col_index, item)
+        table.setSortingEnabled(True)
+        table.resizeColumnsToContents()
+
+    def refresh(self):
+        import exportplus_history
+
+        format_name = self.format_combo.currentText()
+        if format_name == "All formats":
+            format_name = None
+        try:
+            exports = exportplus_history.query(text=self.filter_edit.text() or None, format_name=format_name)
+            trends = exportplus_history.trends()
+        except Exception as e:
+            FreeCAD.Console.PrintError(f"ExportPlus: Could not read export history: {e}\n")
+            return
+        if format_name:
+            trends = [row for row in trends if row["format"] == format_name]
+        self._fill(self.exports_table, self.EXPORT_COLUMNS, exports)
+        self._fill(self.trends_table, self.TREND_COLUMNS, trends)
+
+    def export_csv(self):
+        import exportplus_history
+
+        file_path = QtGui.QFileDialog.getSaveFileName(
+            self,
+            "Export History to CSV",
+            "exportplus_history.csv",
+            "CSV files (*.csv);;All files (*.*)"
+        )[0]
+        if not file_path:
+            return
+        count = exportplus_history.dump_csv(file_path)
+        FreeCAD.Console.PrintMessage(f"Wrote {count} history entries to {file_path}\n")
+
+    def clear_history(self):
+        import exportplus_history
+
+        answer = QtGui.QMessageBox.question(
+            self,
+            "Clear History",
+            "Delete all recorded exports?",
+            QtGui.QMessageBox.Yes | QtGui.QMessageBox.No
+        )
+        if answer == QtGui.QMessageBox.Yes:
+            exportplus_history.clear()
+            self.refresh()
+
+
 def get_icon_path(format_name):
     """Get the path to the icon for a specific format"""
     icon_file = f"export-{format_name.lower()}.svg"
@@ -127,85 +395,10 @@ def get_icon_path(format_name):
     return "Std_Export"
 
 
-def get_scaling_factor(format_name):
-    """Get the scaling factor for a specific export format"""
-    param_grp = FreeCAD.ParamGet("User parameter:BaseApp/Preferences/Mod/ExportPlus")
-
-    # Try format-specific setting first
-    scale = param_grp.GetFloat(f"{format_name}ScalingFactor", 0.0)
-
-    # If not set, use global setting
-    if scale == 0.0:
-        scale = param_grp.GetFloat("GlobalScalingFactor", 1.0)
-
-    return scale
-
-
-def scale_object(obj, scale_factor):
-    """Create a scaled copy of an object"""
-    if scale_factor == 1.0:
-        return obj
-
-    if hasattr(obj, "Shape") and hasattr(obj.Shape, "scale"):
-        # Create a copy and scale it
-        scaled_shape = obj.Shape.copy()
-        scaled_shape.scale(scale_factor)
-        return scaled_shape
-
-    return obj
-
-
-def export_with_scaling(file_path, objects, format_name, export_func):
-    """
-    Generic export function with scaling support
-
-    Parameters:
-    - file_path: Output file path
-    - objects: List of objects to export
-    - format_name: Format identifier (e.g., "STEP", "STL")
-    - export_func: The actual export function to call
-    """
-    scale_factor = get_scaling_factor(format_name)
-
-    FreeCAD.Console.PrintMessage(
-        f"Exporting {format_name} with scaling factor: {scale_factor}\n"
-    )
-
-    if scale_factor == 1.0:
-        # No scaling needed, export directly
-        export_func(file_path, objects)
-    else:
-        # Create temporary scaled objects
-        doc = FreeCAD.ActiveDocument
-        temp_objs = []
-
-        try:
-            for obj in objects:
-                if hasattr(obj, "Shape") and obj.Shape:
-                    # Create a temporary object with scaled shape
-                    temp_obj = doc.addObject("Part::Feature", "TempScaled")
-                    # Make a copy and scale it - scale() returns a new shape
-                    scaled_shape = obj.Shape.copy()
-                    scaled_shape.scale(scale_factor)
-                    temp_obj.Shape = scaled_shape
-                    temp_objs.append(temp_obj)
-                else:
-                    temp_objs.append(obj)
-
-            # Recompute to ensure shapes are valid
-            doc.recompute()
-
-            # Export the scaled objects
-            export_func(file_path, temp_objs)
-
-        finally:
-            # Clean up temporary objects
-            for obj in temp_objs:
-                if hasattr(obj, "Name") and obj.Name.startswith("TempScaled"):
-                    try:
-                        doc.removeObject(obj.Name)
-                    except:
-                        pass  # Object might already be deleted
+def get_export_selection(format_name=None):
+    """Get the selected objects, expanded to the final shapes to export"""
+    selection = FreeCADGui.Selection.getSelection()
+    return exportplus_selection.resolve_selection(selection, format_name)
 
 
 class ExportPlusSTEP:
@@ -231,16 +424,12 @@ class ExportPlusSTEP:
             return
 
         # Get selected objects
-        selection = FreeCADGui.Selection.getSelection()
+        selection = get_export_selection('STEP')
         if not selection:
             FreeCAD.Console.PrintError("No objects selected for export\n")
             return
 
         # Export with scaling
-        def export_step(path, objs):
-            import Import
-            Import.export(objs, path)
-
         export_with_scaling(file_path, selection, "STEP", export_step)
 
         FreeCAD.Console.PrintMessage(f"Exported to {file_path}\n")
@@ -271,19 +460,11 @@ class ExportPlusSTL:
         if not file_path:
             return
 
-        selection = FreeCADGui.Selection.getSelection()
+        selection = get_export_selection('STL')
         if not selection:
             FreeCAD.Console.PrintError("No objects selected for export\n")
             return
 
-        def export_stl(path, objs):
-            import Mesh
-            # Merge all shapes and export
-            shapes = [obj.Shape for obj in objs if hasattr(obj, 'Shape')]
-            if shapes:
-                compound = Part.makeCompound(shapes)
-                Mesh.export([compound], path)
-
         export_with_scaling(file_path, selection, "STL", export_stl)
 
         FreeCAD.Console.PrintMessage(f"Exported to {file_path}\n")
@@ -313,18 +494,11 @@ class ExportPlusOBJ:
         if not file_path:
             return
 
-        selection = FreeCADGui.Selection.getSelection()
+        selection = get_export_selection('OBJ')
         if not selection:
             FreeCAD.Console.PrintError("No objects selected for export\n")
             return
 
-        def export_obj(path, objs):
-            import Mesh
-            shapes = [obj.Shape for obj in objs if hasattr(obj, 'Shape')]
-            if shapes:
-                compound = Part.makeCompound(shapes)
-                Mesh.export([compound], path)
-
         export_with_scaling(file_path, selection, "OBJ", export_obj)
 
         FreeCAD.Console.PrintMessage(f"Exported to {file_path}\n")
@@ -354,15 +528,11 @@ class ExportPlusSVG:
         if not file_path:
             return
 
-        selection = FreeCADGui.Selection.getSelection()
+        selection = get_export_selection('SVG')
         if not selection:
             FreeCAD.Console.PrintError("No objects selected for export\n")
             return
 
-        def export_svg(path, objs):
-            import importSVG
-            importSVG.export(objs, path)
-
         export_with_scaling(file_path, selection, "SVG", export_svg)
 
         FreeCAD.Console.PrintMessage(f"Exported to {file_path}\n")
@@ -393,15 +563,11 @@ class ExportPlusDXF:
         if not file_path:
             return
 
-        selection = FreeCADGui.Selection.getSelection()
+        selection = get_export_selection('DXF')
         if not selection:
             FreeCAD.Console.PrintError("No objects selected for export\n")
             return
 
-        def export_dxf(path, objs):
-            import importDXF
-            importDXF.export(objs, path)
-
         export_with_scaling(file_path, selection, "DXF", export_dxf)
 
         FreeCAD.Console.PrintMessage(f"Exported to {file_path}\n")
@@ -431,18 +597,11 @@ class ExportPlusPDF:
         if not file_path:
             return
 
-        selection = FreeCADGui.Selection.getSelection()
+        selection = get_export_selection('PDF')
         if not selection:
             FreeCAD.Console.PrintError("No objects selected for export\n")
             return
 
-        def export_pdf(path, objs):
-            # PDF export typically requires TechDraw pages
-            FreeCAD.Console.PrintWarning(
-                "PDF export requires TechDraw pages. "
-                "Use TechDraw workbench to create drawings first.\n"
-            )
-
         export_with_scaling(file_path, selection, "PDF", export_pdf)
 
         FreeCAD.Console.PrintMessage(f"Exported to {file_path}\n")
@@ -475,8 +634,13 @@ class ExportPlusQuick:
             return
 
         # Show format selection dialog
-        dialog = QuickExportDialog(QtGui.QApplication.activeWindow())
-        if dialog.exec_() != QtGui.QDialog.Accepted or not dialog.selected_format:
+        dialog = QuickExportDialog(QtGui.QApplication.activeWindow(), objects=selection)
+        if dialog.exec_() != QtGui.QDialog.Accepted:
+            return
+        if dialog.selected_profiles:
+            self.run_profiles(selection, dialog.selected_profiles)
+            return
+        if not dialog.selected_format:
             return
 
         format_name = dialog.selected_format
@@ -489,6 +653,8 @@ class ExportPlusQuick:
             'DXF': ('.dxf', 'DXF files (*.dxf);;All files (*.*)'),
             'SVG': ('.svg', 'SVG files (*.svg);;All files (*.*)'),
             'PDF': ('.pdf', 'PDF files (*.pdf);;All files (*.*)'),
+            'PLY': ('.ply', 'PLY point clouds (*.ply);;All files (*.*)'),
+            'NPZ': ('.npz', 'NumPy archives (*.npz);;All files (*.*)'),
         }
 
         ext, file_filter = format_info.get(format_name, ('.step', 'All files (*.*)'))
@@ -504,53 +670,235 @@ class ExportPlusQuick:
         if not file_path:
             return
 
-        # Define export functions
-        def export_step(path, objs):
-            import Import
-            Import.export(objs, path)
-
-        def export_stl(path, objs):
-            import Mesh
-            shapes = [obj.Shape for obj in objs if hasattr(obj, 'Shape')]
-            if shapes:
-                compound = Part.makeCompound(shapes)
-                Mesh.export([compound], path)
-
-        def export_obj(path, objs):
-            import Mesh
-            shapes = [obj.Shape for obj in objs if hasattr(obj, 'Shape')]
-            if shapes:
-                compound = Part.makeCompound(shapes)
-                Mesh.export([compound], path)
-
-        def export_dxf(path, objs):
-            import importDXF
-            importDXF.export(objs, path)
-
-        def export_svg(path, objs):
-            import importSVG
-            importSVG.export(objs, path)
-
-        def export_pdf(path, objs):
-            FreeCAD.Console.PrintWarning(
-                "PDF export requires TechDraw pages. "
-                "Use TechDraw workbench to create drawings first.\n"
+        selection = get_export_selection(format_name)
+        if not selection:
+            FreeCAD.Console.PrintError("No exportable objects in selection\n")
+            return
+
+        export_func = EXPORT_FUNCTIONS.get(format_name)
+        if export_func:
+            self.export(file_path, selection, format_name, export_func)
+            FreeCAD.Console.PrintMessage(f"Exported to {file_path}\n")
+
+    def export(self, file_path, selection, format_name, export_func):
+        """Run the chosen export"""
+        export_with_scaling(file_path, selection, format_name, export_func)
+
+    def run_profiles(self, selection, names):
+        """Export the selection with the named profiles"""
+        stored = exportplus_profiles.load_profiles()
+        profiles = [stored[name] for name in names if name in stored]
+        if not profiles:
+            return
+        parent = QtGui.QApplication.activeWindow()
+
+        if len(profiles) == 1:
+            profile = profiles[0]
+            ext = FORMAT_EXTENSIONS[profile.format]
+            file_path = QtGui.QFileDialog.getSaveFileName(
+                parent,
+                f"Export {profile.name}",
+                "",
+                f"{profile.format} files (*{ext});;All files (*.*)"
+            )[0]
+            if not file_path:
+                return
+            try:
+                exportplus_profiles.export_profile(file_path, selection, profile)
+            except ValueError as e:
+                FreeCAD.Console.PrintError(f"ExportPlus: {e}\n")
+                return
+            FreeCAD.Console.PrintMessage(f"Exported to {file_path}\n")
+            return
+
+        folder = QtGui.QFileDialog.getExistingDirectory(parent, "Export Profiles to Folder")
+        if not folder:
+            return
+        stem = selection[0].Document.Label
+        results = exportplus_profiles.run_profiles(selection, profiles, folder, stem)
+        failed = [(profile, error) for profile, _, error in results if error]
+        if failed:
+            QtGui.QMessageBox.warning(
+                parent,
+                "Export Profiles",
+                "\n".join(f"{profile.name}: {error}" for profile, error in failed)
             )
 
-        # Map format to export function
-        export_functions = {
-            'STEP': export_step,
-            'STL': export_stl,
-            'OBJ': export_obj,
-            'DXF': export_dxf,
-            'SVG': export_svg,
-            'PDF': export_pdf,
+    def IsActive(self):
+        return FreeCAD.ActiveDocument is not None
+
+
+class ExportPlusProfiledExport(ExportPlusQuick):
+    """Quick export under the profiler, saving the profile next to the output"""
+
+    def GetResources(self):
+        return {
+            'Pixmap': 'Std_Export',
+            'MenuText': 'Export with Profiling...',
+            'ToolTip': 'Quick export under the profiler\n\nSaves a flamegraph-compatible profile '
+                       '(.folded) and a memory summary (.memory.txt) next to the exported file'
         }
 
-        export_func = export_functions.get(format_name)
-        if export_func:
-            export_with_scaling(file_path, selection, format_name, export_func)
-            FreeCAD.Console.PrintMessage(f"Exported to {file_path}\n")
+    def export(self, file_path, selection, format_name, export_func):
+        import exportplus_profiler
+        exportplus_profiler.profile_export(file_path, selection, format_name, export_func)
+
+
+class ExportPlusWatch:
+    """Watch the selection and re-export it after every change"""
+
+    def GetResources(self):
+        return {
+            'Pixmap': 'Std_Export',
+            'MenuText': 'Watch and Re-export...',
+            'ToolTip': 'Export the selection to STL/OBJ and keep the file up to date\n\n'
+                       'The selected objects are re-exported in the background after every recompute that changes them'
+        }
+
+    def Activated(self):
+        import exportplus_watch
+
+        if not FreeCADGui.Selection.getSelection():
+            FreeCAD.Console.PrintError("No objects selected for export\n")
+            return
+
+        format_name, ok = QtGui.QInputDialog.getItem(
+            QtGui.QApplication.activeWindow(),
+            "Watch and Re-export",
+            "Export format:",
+            list(exportplus_watch.WATCH_FORMATS),
+            0,
+            False
+        )
+        if not ok:
+            return
+
+        file_path = QtGui.QFileDialog.getSaveFileName(
+            QtGui.QApplication.activeWindow(),
+            f"Watch {format_name}",
+            "",
+            f"{format_name} files (*.{format_name.lower()});;All files (*.*)"
+        )[0]
+
+        if not file_path:
+            return
+
+        selection = get_export_selection(format_name)
+        if not selection:
+            FreeCAD.Console.PrintError("No exportable objects in selection\n")
+            return
+
+        exportplus_watch.start_watch(FreeCAD.ActiveDocument, selection, file_path, format_name)
+        FreeCAD.Console.PrintMessage(f"Watching {len(selection)} object(s), exporting to {file_path}\n")
+
+    def IsActive(self):
+        return FreeCAD.ActiveDocument is not None
+
+
+class ExportPlusStopWatch:
+    """Stop all watch-mode re-exports"""
+
+    def GetResources(self):
+        return {
+            'Pixmap': 'Std_Export',
+            'MenuText': 'Stop Watching',
+            'ToolTip': 'Stop all background re-exports started with Watch and Re-export'
+        }
+
+    def Activated(self):
+        import exportplus_watch
+
+        count = len(exportplus_watch.active_watches())
+        exportplus_watch.stop_all()
+        FreeCAD.Console.PrintMessage(f"Stopped {count} watch(es)\n")
+
+    def IsActive(self):
+        import exportplus_watch
+        return bool(exportplus_watch.active_watches())
+
+
+class ExportPlusHistory:
+    """Show the export history"""
+
+    def GetResources(self):
+        return {
+            'Pixmap': 'Std_Export',
+            'MenuText': 'Export History...',
+            'ToolTip': 'Show recorded exports with their durations, sizes and trends'
+        }
+
+    def Activated(self):
+        dialog = ExportHistoryDialog(QtGui.QApplication.activeWindow())
+        dialog.exec_()
+
+    def IsActive(self):
+        return True
+
+
+class ExportPlusOverrides:
+    """Add per-object export override properties to the selection"""
+
+    def GetResources(self):
+        return {
+            'Pixmap': 'Std_Export',
+            'MenuText': 'Add Export Overrides',
+            'ToolTip': 'Add ExportPlus properties (scale, tessellation, output name, formats)\n'
+                       'to the selected objects; on containers they apply to their contents'
+        }
+
+    def Activated(self):
+        selection = FreeCADGui.Selection.getSelection()
+        for obj in selection:
+            exportplus_overrides.add_override_properties(obj)
+        FreeCAD.Console.PrintMessage(
+            f"ExportPlus: Added export overrides to {len(selection)} object(s)\n"
+        )
+
+    def IsActive(self):
+        return bool(FreeCADGui.Selection.getSelection())
+
+
+class ExportPlusExportDocument:
+    """Export the whole document using per-object overrides"""
+
+    def GetResources(self):
+        return {
+            'Pixmap': 'Std_Export',
+            'MenuText': 'Export Document with Overrides...',
+            'ToolTip': 'Export every object of the document with its ExportPlus overrides\n'
+                       'in one batch, one file per output name and format'
+        }
+
+    def Activated(self):
+        doc = FreeCAD.ActiveDocument
+        parent = QtGui.QApplication.activeWindow()
+        planned = []
+        for obj in doc.Objects:
+            for format_name in exportplus_overrides.parse_formats(getattr(obj, "ExportPlusFormats", "")):
+                if format_name not in planned:
+                    planned.append(format_name)
+        formats, ok = QtGui.QInputDialog.getText(
+            parent, "Export Document", "Formats (comma separated):", text=", ".join(planned) or "STEP"
+        )
+        if not ok or not formats.strip():
+            return
+        folder = QtGui.QFileDialog.getExistingDirectory(
+            parent, "Export Document to Folder", os.path.dirname(doc.FileName)
+        )
+        if not folder:
+            return
+        try:
+            results = exportplus_overrides.export_document(
+                doc, folder, exportplus_overrides.parse_formats(formats)
+            )
+        except ValueError as e:
+            QtGui.QMessageBox.warning(parent, "Export Document", str(e))
+            return
+        failed = [(path, error) for path, _, error in results if error]
+        if failed:
+            QtGui.QMessageBox.warning(
+                parent, "Export Document", "\n".join(f"{path}: {error}" for path, error in failed)
+            )
 
     def IsActive(self):
         return FreeCAD.ActiveDocument is not None
@@ -564,3 +912,9 @@ FreeCADGui.addCommand('ExportPlus_OBJ', ExportPlusOBJ())
 FreeCADGui.addCommand('ExportPlus_SVG', ExportPlusSVG())
 FreeCADGui.addCommand('ExportPlus_DXF', ExportPlusDXF())
 FreeCADGui.addCommand('ExportPlus_PDF', ExportPlusPDF())
+FreeCADGui.addCommand('ExportPlus_ProfiledExport', ExportPlusProfiledExport())
+FreeCADGui.addCommand('ExportPlus_Watch', ExportPlusWatch())
+FreeCADGui.addCommand('ExportPlus_StopWatch', ExportPlusStopWatch())
+FreeCADGui.addCommand('ExportPlus_History', ExportPlusHistory())
+FreeCADGui.addCommand('ExportPlus_Overrides', ExportPlusOverrides())
+FreeCADGui.addCommand('ExportPlus_ExportDocument', ExportPlusExportDocument())
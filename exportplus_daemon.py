@@ -0,0 +1,451 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2026 ExportPlus Workbench                               *
+# *                                                                         *
+# *   This file is part of the ExportPlus FreeCAD Workbench.                *
+# *                                                                         *
+# *   ExportPlus is free software: you can redistribute it and/or modify    *
+# *   it under the terms of the GNU Lesser General Public License as        *
+# *   published by the Free Software Foundation, either version 2.1 of the  *
+# *   License, or (at your option) any later version.                       *
+# *                                                                         *
+# *   ExportPlus is distributed in the hope that it will be useful, but     *
+# *   WITHOUT ANY WARRANTY; without even the implied warranty of            *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU      *
+# *   Lesser General Public License for more details.                       *
+# *                                                                         *
+# *   You should have received a copy of the GNU Lesser General Public      *
+# *   License along with ExportPlus. If not, see                            *
+# *   <https://www.gnu.org/licenses/>.                                      *
+# *                                                                         *
+# ***************************************************************************
+
+"""ExportPlus daemon - a warm FreeCAD process that accepts export jobs
+
+Starting FreeCAD and importing the CAD modules dominates the run time of
+small headless conversions. The daemon pays that cost once and then
+serves jobs over localhost HTTP or a Unix socket, keeping recently used
+documents and tessellations in memory.
+
+Start it with FreeCADCmd:
+
+    FreeCADCmd -c "import exportplus_daemon; exportplus_daemon.serve()"
+
+and submit jobs from any Python (FreeCAD is not needed on the client side):
+
+    import exportplus_daemon
+    exportplus_daemon.submit({
+        "document": "/parts/bracket.FCStd",
+        "objects": ["Body"],
+        "formats": ["STL", "STEP"],
+        "scale": 0.0393701,
+        "output": "/exports",
+    })
+
+Addresses are "host:port" for HTTP (POST /jobs, GET /status,
+POST /shutdown) or "unix:/path/to/socket" for newline-delimited JSON.
+FreeCAD is only imported on the server side, so this module doubles as
+the client library.
+
+Every request must carry the daemon's token, which serve() writes to a
+file only the user can read (see token_path). submit() reads it from
+there. HTTP requests also need a JSON Content-Type and no Origin header,
+so web pages in a browser cannot reach the daemon.
+"""
+
+import hmac
+import json
+import os
+import secrets
+import socket
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+
+DEFAULT_ADDRESS = "127.0.0.1:47801"
+
+TOKEN_HEADER = "X-ExportPlus-Token"
+
+
+def _log(message):
+    import FreeCAD
+    FreeCAD.Console.PrintLog(f"ExportPlus daemon: {message}\n")
+
+
+class ExportDaemon:
+    """Runs export jobs against a cache of open documents"""
+
+    def __init__(self, max_documents=8, tessellation_cache_mb=512):
+        import exportplus_cache
+        import exportplus_mesh
+
+        self.documents = exportplus_cache.ResultCache(
+            max_entries=max_documents, on_evict=self._close_document
+        )
+        if tessellation_cache_mb > 0:
+            exportplus_mesh.enable_tessellation_cache(tessellation_cache_mb)
+        self.started = time.time()
+        self.jobs_done = 0
+        self.jobs_failed = 0
+
+    @staticmethod
+    def _close_document(path, entry):
+        import FreeCAD
+
+        doc_name = entry[0]
+        try:
+            FreeCAD.closeDocument(doc_name)
+            _log(f"closed {path}")
+        except NameError:
+            pass  # Already closed
+
+    def open_document(self, path):
+        """Return an open document for path, reusing it while the file is unchanged"""
+        import FreeCAD
+
+        path = os.path.abspath(path)
+        mtime = os.path.getmtime(path)
+        entry = self.documents.get(path)
+        if entry is not None:
+            doc_name, cached_mtime = entry
+            try:
+                doc = FreeCAD.getDocument(doc_name)
+            except NameError:
+                doc = None
+            if doc is not None and cached_mtime == mtime:
+                return doc
+            self.documents.discard(path)
+            if doc is not None:
+                FreeCAD.closeDocument(doc_name)
+
+        doc = FreeCAD.openDocument(path, True)  # hidden
+        self.documents.put(path, (doc.Name, mtime))
+        _log(f"opened {path}")
+        return doc
+
+    @staticmethod
+    def resolve_objects(doc, names, format_name=None):
+        """Find objects by Name or Label (default: the whole document) and expand containers"""
+        import exportplus_selection
+
+        if not names:
+            return exportplus_selection.resolve_selection(doc.RootObjects, format_name, explicit=False)
+        objects = []
+        for name in names:
+            obj = doc.getObject(name)
+            if obj is None:
+                matches = doc.getObjectsByLabel(name)
+                obj = matches[0] if matches else None
+            if obj is None:
+                raise ValueError(f"Object '{name}' not found in {doc.FileName}")
+            objects.append(obj)
+        return exportplus_selection.resolve_selection(objects, format_name)
+
+    @staticmethod
+    def output_path(job, doc, format_name):
+        import exportplus_export
+
+        outputs = job.get("outputs") or {}
+        if format_name in outputs:
+            return outputs[format_name]
+        ext = exportplus_export.FORMAT_EXTENSIONS[format_name]
+        stem = os.path.splitext(os.path.basename(doc.FileName))[0]
+        folder = job.get("output") or os.path.dirname(doc.FileName)
+        return os.path.join(folder, stem + ext)
+
+    def run_job(self, job):
+        """
+        Run one export job
+
+        Job keys:
+        - document: Path of the .FCStd file
+        - objects: Object names or labels (optional, default: the whole document)
+        - formats: List of format names (e.g. ["STL", "STEP"])
+        - scale: Scaling factor (optional, default: ExportPlus preferences)
+        - output: Output folder (optional, default: next to the document)
+        - outputs: Explicit {format: path} mapping (optional)
+        - settings: ExportPlus settings to override for this job (optional),
+          e.g. {"MeshLinearDeflection": 0.05, "OutputCompression": "gzip"}
+        """
+        import exportplus_settings
+
+        settings = exportplus_settings.current()
+        if job.get("settings"):
+            settings = settings.override(**job["settings"])
+        with exportplus_settings.using(settings):
+            return self._run_formats(job)
+
+    def _run_formats(self, job):
+        import exportplus_export
+
+        doc = self.open_document(job["document"])
+        scale = job.get("scale")
+
+        results = []
+        for format_name in job.get("formats") or ["STEP"]:
+            format_name = format_name.upper()
+            export_func = exportplus_export.EXPORT_FUNCTIONS.get(format_name)
+            if export_func is None:
+                raise ValueError(f"Unknown format '{format_name}'")
+            objects = self.resolve_objects(doc, job.get("objects"), format_name)
+            if not objects:
+                raise ValueError(f"No exportable objects in {doc.FileName}")
+            path = self.output_path(job, doc, format_name)
+            start = time.time()
+            exportplus_export.export_with_scaling(
+                path, objects, format_name, export_func, scale_factor=scale
+            )
+            results.append({
+                "format": format_name,
+                "path": path,
+                "seconds": round(time.time() - start, 3),
+            })
+        return results
+
+    def status(self):
+        import exportplus_mesh
+
+        tessellations = exportplus_mesh.tessellation_cache()
+        return {
+            "uptime": round(time.time() - self.started, 1),
+            "jobs_done": self.jobs_done,
+            "jobs_failed": self.jobs_failed,
+            "documents": len(self.documents),
+            "tessellations": len(tessellations) if tessellations is not None else 0,
+            "tessellation_bytes": tessellations.total_bytes if tessellations is not None else 0,
+        }
+
+    def handle(self, message):
+        """Handle one request message and return the reply dict"""
+        command = message.get("command", "export")
+        if command == "status":
+            return {"ok": True, "status": self.status()}
+        if command != "export":
+            return {"ok": False, "error": f"Unknown command '{command}'"}
+        try:
+            outputs = self.run_job(message)
+        except Exception as e:
+            self.jobs_failed += 1
+            _log(f"job failed: {e}")
+            return {"ok": False, "error": str(e)}
+        self.jobs_done += 1
+        return {"ok": True, "outputs": outputs}
+
+
+class _HTTPHandler(BaseHTTPRequestHandler):
+    server_version = "ExportPlus"
+
+    def _reply(self, code, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _authorized(self, needs_json):
+        """Reply with an error and return False unless the request may be handled"""
+        if self.headers.get("Origin") is not None:
+            # Sent by browsers only, a web page must not drive the daemon
+            self._reply(403, {"ok": False, "error": "Cross-origin requests are not accepted"})
+            return False
+        if not _token_matches(self.server.token, self.headers.get(TOKEN_HEADER)):
+            self._reply(401, {"ok": False, "error": "Missing or wrong daemon token"})
+            return False
+        content_type = self.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        if needs_json and content_type != "application/json":
+            self._reply(415, {"ok": False, "error": "Content-Type must be application/json"})
+            return False
+        return True
+
+    def do_GET(self):
+        if not self._authorized(needs_json=False):
+            return
+        if self.path.rstrip("/") == "/status":
+            self._reply(200, self.server.export_daemon.handle({"command": "status"}))
+        else:
+            self._reply(404, {"ok": False, "error": "Not found"})
+
+    def do_POST(self):
+        if not self._authorized(needs_json=True):
+            return
+        route = self.path.rstrip("/")
+        if route == "/shutdown":
+            self._reply(200, {"ok": True})
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+            return
+        if route != "/jobs":
+            self._reply(404, {"ok": False, "error": "Not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            job = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError as e:
+            self._reply(400, {"ok": False, "error": f"Invalid job: {e}"})
+            return
+        reply = self.server.export_daemon.handle(job)
+        self._reply(200 if reply["ok"] else 500, reply)
+
+    def log_message(self, format, *args):
+        _log(format % args)
+
+
+class _UnixHandler(socketserver.StreamRequestHandler):
+    """Newline-delimited JSON: one request per line, one reply per line"""
+
+    def handle(self):
+        for line in self.rfile:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                message = json.loads(line)
+            except ValueError as e:
+                reply = {"ok": False, "error": f"Invalid job: {e}"}
+            else:
+                if not _token_matches(self.server.token, message.pop("token", None)):
+                    reply = {"ok": False, "error": "Missing or wrong daemon token"}
+                elif message.get("command") == "shutdown":
+                    self.wfile.write(b'{"ok": true}\n')
+                    threading.Thread(target=self.server.shutdown, daemon=True).start()
+                    return
+                else:
+                    reply = self.server.export_daemon.handle(message)
+            self.wfile.write((json.dumps(reply) + "\n").encode("utf-8"))
+            self.wfile.flush()
+
+
+def _parse_address(address):
+    if address.startswith("unix:"):
+        return "unix", address[len("unix:"):]
+    address = address.replace("http://", "").rstrip("/")
+    host, _, port = address.rpartition(":")
+    return "http", (host or "127.0.0.1", int(port))
+
+
+def token_path(address):
+    """
+    Return the file holding the token of the daemon at address: next to
+    the socket for Unix sockets, in ~/.exportplus for HTTP ports
+    """
+    kind, target = _parse_address(address)
+    if kind == "unix":
+        return target + ".token"
+    return os.path.join(os.path.expanduser("~"), ".exportplus", f"daemon-{target[1]}.token")
+
+
+def _write_token(path):
+    """Create a new token in a file readable by the current user only"""
+    os.makedirs(os.path.dirname(path) or os.curdir, mode=0o700, exist_ok=True)
+    if os.path.exists(path):
+        os.remove(path)
+    token = secrets.token_urlsafe(32)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "w") as f:
+        f.write(token)
+    return token
+
+
+def read_token(address):
+    """Return the token of the daemon at address, or None without access to its token file"""
+    try:
+        with open(token_path(address)) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _token_matches(expected, given):
+    return isinstance(given, str) and hmac.compare_digest(expected.encode("utf-8"), given.encode("utf-8"))
+
+
+def serve(address=None, max_documents=None, tessellation_cache_mb=None):
+    """
+    Run the daemon until it receives a shutdown request
+
+    Parameters default to the DaemonAddress, DaemonMaxDocuments and
+    DaemonTessellationCacheMB preferences. Requests are handled one at a
+    time, since FreeCAD documents must not be used from several threads.
+    A new token is written to token_path(address) on every start.
+    """
+    import FreeCAD
+    import exportplus_settings
+
+    settings = exportplus_settings.current()
+    if address is None:
+        address = settings.DaemonAddress
+    if max_documents is None:
+        max_documents = settings.DaemonMaxDocuments
+    if tessellation_cache_mb is None:
+        tessellation_cache_mb = settings.DaemonTessellationCacheMB
+
+    kind, target = _parse_address(address)
+    if kind == "unix":
+        if os.path.exists(target):
+            os.remove(target)
+        server = socketserver.UnixStreamServer(target, _UnixHandler)
+    else:
+        if target[0] not in ("127.0.0.1", "localhost", "::1"):
+            FreeCAD.Console.PrintWarning(
+                f"ExportPlus daemon: listening on {target[0]}, which is not a loopback address\n"
+            )
+        server = HTTPServer(target, _HTTPHandler)
+
+    server.export_daemon = ExportDaemon(max_documents, tessellation_cache_mb)
+    token_file = token_path(address)
+    server.token = _write_token(token_file)
+    FreeCAD.Console.PrintMessage(f"ExportPlus daemon listening on {address}, token in {token_file}\n")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if kind == "unix" and os.path.exists(target):
+            os.remove(target)
+        if os.path.exists(token_file):
+            os.remove(token_file)
+    FreeCAD.Console.PrintMessage("ExportPlus daemon stopped\n")
+
+
+def submit(job, address=DEFAULT_ADDRESS, timeout=None, token=None):
+    """
+    Send one message (export job, or {"command": "status"}) and return the reply
+
+    The token defaults to the one the daemon wrote to token_path(address).
+    """
+    if token is None:
+        token = read_token(address)
+    kind, target = _parse_address(address)
+    if kind == "unix":
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(target)
+            with sock.makefile("rwb") as stream:
+                stream.write((json.dumps(dict(job, token=token)) + "\n").encode("utf-8"))
+                stream.flush()
+                return json.loads(stream.readline())
+
+    import urllib.error
+    import urllib.request
+
+    host, port = target
+    headers = {"Content-Type": "application/json", TOKEN_HEADER: token or ""}
+    if job.get("command") == "status":
+        request = urllib.request.Request(f"http://{host}:{port}/status", headers=headers)
+    elif job.get("command") == "shutdown":
+        request = urllib.request.Request(f"http://{host}:{port}/shutdown", data=b"{}", headers=headers)
+    else:
+        request = urllib.request.Request(
+            f"http://{host}:{port}/jobs", data=json.dumps(job).encode("utf-8"), headers=headers
+        )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return json.loads(e.read())
+
+
+if __name__ == "__main__":
+    serve()
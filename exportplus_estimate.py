@@ -0,0 +1,253 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2026 ExportPlus Workbench                               *
+# *                                                                         *
+# *   This file is part of the ExportPlus FreeCAD Workbench.                *
+# *                                                                         *
+# *   ExportPlus is free software: you can redistribute it and/or modify    *
+# *   it under the terms of the GNU Lesser General Public License as        *
+# *   published by the Free Software Foundation, either version 2.1 of the  *
+# *   License, or (at your option) any later version.                       *
+# *                                                                         *
+# *   ExportPlus is distributed in the hope that it will be useful, but     *
+# *   WITHOUT ANY WARRANTY; without even the implied warranty of            *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU      *
+# *   Lesser General Public License for more details.                       *
+# *                                                                         *
+# *   You should have received a copy of the GNU Lesser General Public      *
+# *   License along with ExportPlus. If not, see                            *
+# *   <https://www.gnu.org/licenses/>.                                      *
+# *                                                                         *
+# ***************************************************************************
+
+"""Pre-export cost estimates (time, output size, triangle count)
+
+Estimates are built from cheap statistics only: face and edge counts and
+bounding boxes of the selection, rates measured by previous exports in the
+export history, and exact triangle counts from the tessellation cache when
+it holds the shapes. No geometry is tessellated or written.
+"""
+
+import math
+import statistics
+
+import FreeCAD
+
+import exportplus_export
+import exportplus_history
+import exportplus_mesh
+import exportplus_points
+
+
+# Fallback rates per format, used until the history has measurements.
+# seconds/bytes are per face (per triangle for mesh formats).
+DEFAULT_RATES = {
+    'STEP': {"seconds_per_face": 0.002, "bytes_per_face": 4000},
+    'STL': {"seconds_per_triangle": 4e-6, "triangles_per_face": 60},
+    'OBJ': {"seconds_per_triangle": 8e-6, "triangles_per_face": 60},
+    'DXF': {"seconds_per_face": 0.02, "bytes_per_face": 2500},
+    'SVG': {"seconds_per_face": 0.02, "bytes_per_face": 1500},
+    'PDF': {"seconds_per_face": 0.02, "bytes_per_face": 800},
+    'PLY': {"seconds_per_face": 0.003},
+    'NPZ': {"seconds_per_face": 0.003},
+}
+
+# Linear deflection the default triangles_per_face was measured at
+REFERENCE_DEFLECTION = 0.1
+
+# Estimates above these limits are flagged in the Quick Export dialog
+WARN_SECONDS = 60.0
+WARN_BYTES = 500 * 1024 * 1024
+
+
+class Estimate:
+    """Estimated cost of exporting a selection to one format"""
+
+    def __init__(self, format_name, seconds, size_bytes, triangles=None, source="defaults"):
+        self.format_name = format_name
+        self.seconds = seconds
+        self.size_bytes = size_bytes
+        self.triangles = triangles
+        self.source = source
+
+    @property
+    def is_large(self):
+        return self.seconds > WARN_SECONDS or self.size_bytes > WARN_BYTES
+
+    def summary(self):
+        """Short human readable form, e.g. '~3 s, ~12.5 MB, ~250k triangles'"""
+        parts = [f"~{format_seconds(self.seconds)}", f"~{format_bytes(self.size_bytes)}"]
+        if self.triangles:
+            parts.append(f"~{format_count(self.triangles)} triangles")
+        return ", ".join(parts)
+
+    def __repr__(self):
+        return f"<Estimate {self.format_name}: {self.summary()} ({self.source})>"
+
+
+def format_seconds(seconds):
+    if seconds < 1.0:
+        return "<1 s"
+    if seconds < 120.0:
+        return f"{seconds:.0f} s"
+    return f"{seconds / 60.0:.0f} min"
+
+
+def format_bytes(size):
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024.0 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024.0
+
+
+def format_count(count):
+    if count >= 1e6:
+        return f"{count / 1e6:.1f}M"
+    if count >= 1e3:
+        return f"{count / 1e3:.0f}k"
+    return str(int(count))
+
+
+def selection_stats(objects):
+    """Return cheap statistics of a selection: faces, edges and bounding box diagonal"""
+    faces = edges = 0
+    box = FreeCAD.BoundBox()
+    for obj in objects:
+        shape = getattr(obj, "Shape", None)
+        if shape is None or shape.isNull():
+            continue
+        faces += len(shape.Faces)
+        edges += len(shape.Edges)
+        box.add(shape.BoundBox)
+    return {
+        "faces": faces,
+        "edges": edges,
+        "diagonal": box.DiagonalLength if box.isValid() else 0.0,
+    }
+
+
+def _median(values):
+    values = [v for v in values if v is not None]
+    return statistics.median(values) if values else None
+
+
+def _density(linear_deflection, scale_factor):
+    """Triangle density relative to REFERENCE_DEFLECTION, growing with 1 / sqrt(deflection)"""
+    # Deflections are absolute, so scaling up the model means more triangles
+    effective = linear_deflection / max(scale_factor or 1.0, 1e-9)
+    return math.sqrt(REFERENCE_DEFLECTION / max(effective, 1e-9))
+
+
+def _history_rates(format_name):
+    """Median per-face / per-triangle rates measured by recent exports
+
+    triangles_per_face is normalized to REFERENCE_DEFLECTION like the defaults.
+    """
+    rows = exportplus_history.recent_rates(format_name)
+    if not rows:
+        return None
+    rates = {
+        "seconds_per_face": _median(r["total_seconds"] / r["faces"] for r in rows),
+        "bytes_per_face": _median(r["size_bytes"] / r["faces"] for r in rows if r["size_bytes"]),
+    }
+    if format_name in exportplus_mesh.MESH_FORMATS:
+        rates["triangles_per_face"] = _median(
+            r["triangles"] / r["faces"] / _density(r["linear_deflection"], r["scale"])
+            for r in rows if r["triangles"] and r["linear_deflection"]
+        )
+        rates["seconds_per_triangle"] = _median(
+            r["total_seconds"] / r["triangles"] for r in rows if r["triangles"]
+        )
+        rates["bytes_per_triangle"] = _median(
+            r["size_bytes"] / r["triangles"] for r in rows if r["triangles"] and r["size_bytes"]
+        )
+    return rates
+
+
+def estimate(objects, format_name, stats=None, scale_factor=None):
+    """
+    Estimate the cost of exporting objects to format_name
+
+    Parameters:
+    - objects: Objects that would be exported
+    - format_name: Format identifier (e.g., "STEP", "STL")
+    - stats: Precomputed selection_stats(objects), to share between formats
+    - scale_factor: Scale the export would use (defaults to the preferences)
+    """
+    if stats is None:
+        stats = selection_stats(objects)
+    if scale_factor is None:
+        scale_factor = exportplus_export.get_scaling_factor(format_name)
+    faces = max(stats["faces"], 1)
+    is_mesh = format_name in exportplus_mesh.MESH_FORMATS
+
+    # Exactly this export was done before: reuse its measurements
+    labels = [obj.Label for obj in objects]
+    document = ""
+    if objects:
+        document = objects[0].Document.FileName or objects[0].Document.Name
+    try:
+        previous = exportplus_history.last_export(document, labels, format_name, scale_factor)
+        rates = _history_rates(format_name)
+    except Exception as e:
+        FreeCAD.Console.PrintLog(f"ExportPlus: History unavailable for estimates: {e}\n")
+        previous = rates = None
+    if previous is not None and previous["size_bytes"] is not None:
+        return Estimate(
+            format_name, previous["total_seconds"], previous["size_bytes"],
+            previous["triangles"], source="previous export",
+        )
+
+    merged = dict(DEFAULT_RATES.get(format_name, DEFAULT_RATES['STEP']))
+    source = "defaults"
+    if rates:
+        merged.update({k: v for k, v in rates.items() if v is not None})
+        source = "history"
+
+    if format_name in exportplus_points.POINT_FORMATS:
+        # The file size follows from the point count alone
+        size = len(objects) * exportplus_points.get_point_count() * exportplus_points.BYTES_PER_POINT
+        return Estimate(format_name, faces * merged["seconds_per_face"], size, source=source)
+
+    if not is_mesh:
+        return Estimate(
+            format_name,
+            faces * merged["seconds_per_face"],
+            faces * merged["bytes_per_face"],
+            source=source,
+        )
+
+    linear, _ = exportplus_mesh.get_tessellation()
+    triangles = None
+    cached = None
+    if scale_factor == 1.0:
+        # The cache is keyed on the shapes as exported, i.e. after scaling
+        cached = exportplus_mesh.cached_triangle_count(objects, linear)
+    if cached is not None:
+        triangles = cached
+        source = "cached tessellation"
+    if triangles is None:
+        per_face = merged["triangles_per_face"] * _density(linear, scale_factor)
+        triangles = faces * max(per_face, 2.0)
+
+    budget = exportplus_mesh.get_budget(format_name)
+    if budget:
+        triangles = min(triangles, budget)
+
+    bytes_per_triangle = merged.get("bytes_per_triangle") or exportplus_mesh.BYTES_PER_TRIANGLE[format_name]
+    size = exportplus_mesh.FILE_OVERHEAD[format_name] + triangles * bytes_per_triangle
+    seconds = triangles * merged["seconds_per_triangle"]
+    return Estimate(format_name, seconds, size, int(triangles), source=source)
+
+
+def estimate_all(objects, formats):
+    """Return {format: Estimate} for several formats, sharing the statistics"""
+    stats = selection_stats(objects)
+    result = {}
+    for format_name in formats:
+        try:
+            result[format_name] = estimate(objects, format_name, stats)
+        except Exception as e:
+            FreeCAD.Console.PrintLog(f"ExportPlus: Could not estimate {format_name}: {e}\n")
+    return result
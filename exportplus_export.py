@@ -0,0 +1,392 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2026 ExportPlus Workbench                               *
+# *                                                                         *
+# *   This file is part of the ExportPlus FreeCAD Workbench.                *
+# *                                                                         *
+# *   ExportPlus is free software: you can redistribute it and/or modify    *
+# *   it under the terms of the GNU Lesser General Public License as        *
+# *   published by the Free Software Foundation, either version 2.1 of the  *
+# *   License, or (at your option) any later version.                       *
+# *                                                                         *
+# *   ExportPlus is distributed in the hope that it will be useful, but     *
+# *   WITHOUT ANY WARRANTY; without even the implied warranty of            *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU      *
+# *   Lesser General Public License for more details.                       *
+# *                                                                         *
+# *   You should have received a copy of the GNU Lesser General Public      *
+# *   License along with ExportPlus. If not, see                            *
+# *   <https://www.gnu.org/licenses/>.                                      *
+# *                                                                         *
+# ***************************************************************************
+
+"""Export machinery shared by the GUI commands, watch mode and the daemon
+
+This module does not import FreeCADGui or Qt, so it can be used from
+FreeCADCmd (headless) as well as from the GUI.
+"""
+
+import contextlib
+import functools
+import math
+
+import FreeCAD
+
+import exportplus_check
+import exportplus_history
+import exportplus_mesh
+import exportplus_output
+import exportplus_points
+import exportplus_projection
+import exportplus_selection
+import exportplus_settings
+import exportplus_split
+import exportplus_store
+import exportplus_verify
+
+
+def get_scaling_factor(format_name):
+    """Get the scaling factor for a specific export format"""
+    # Format-specific setting first, then the global one
+    return exportplus_settings.current().scaling_factor(format_name)
+
+
+def scale_object(obj, scale_factor):
+    """Create a scaled copy of an object"""
+    if scale_factor == 1.0:
+        return obj
+
+    if hasattr(obj, "Shape") and hasattr(obj.Shape, "scale"):
+        # Create a copy and scale it
+        scaled_shape = obj.Shape.copy()
+        scaled_shape.scale(scale_factor)
+        return scaled_shape
+
+    return obj
+
+
+def output_file(file_path, format_name):
+    """Return the path an export of format_name to file_path is finally written to"""
+    if exportplus_split.is_split_export(format_name):
+        # Split exports are never compressed
+        return exportplus_output.split_compression(file_path)[0]
+    return exportplus_output.output_path(file_path)
+
+
+def _output_target(file_path, format_name):
+    """Return (path, atomic): the final output path and whether to write it through a temp file"""
+    if exportplus_split.is_split_export(format_name):
+        # Split exports write their chunks and index atomically themselves
+        if exportplus_output.split_compression(file_path)[1] is not None:
+            FreeCAD.Console.PrintWarning(
+                "ExportPlus: Split exports are not compressed, enable MeshSplitZip to bundle them\n"
+            )
+        return output_file(file_path, format_name), False
+    return output_file(file_path, format_name), True
+
+
+def _write(export_func, file_path, objects, atomic):
+    """Run a writer, through a temporary file that is moved into place on success"""
+    if not atomic:
+        return export_func(file_path, objects)
+    with exportplus_output.atomic_output(file_path) as temp_path:
+        return export_func(temp_path, objects)
+
+
+def stale_objects(objects):
+    """
+    Return the objects among objects and their dependencies that need a
+    recompute - touched ones and everything depending on them - dependencies first
+    """
+    found = {}
+    for obj in objects:
+        if getattr(obj, "Document", None) is None or not hasattr(obj, "OutListRecursive"):
+            continue
+        for dep in [obj] + obj.OutListRecursive:
+            found.setdefault((dep.Document.Name, dep.Name), dep)
+    touched = [key for key, obj in found.items() if obj.isTouched()]
+    if not touched:
+        return []
+    # A partial recompute only follows dependencies, so the dependents of a
+    # touched object up to the selection have to be passed in as well
+    stale = {}
+    pending = touched
+    while pending:
+        key = pending.pop()
+        if key in stale:
+            continue
+        stale[key] = found[key]
+        for parent in found[key].InList:
+            parent_key = (parent.Document.Name, parent.Name)
+            if parent_key in found and parent_key not in stale:
+                pending.append(parent_key)
+    # An object's recursive OutList is longer than that of each of its dependencies
+    depth = {key: len(obj.OutListRecursive) for key, obj in stale.items()}
+    return [stale[key] for key in sorted(stale, key=depth.get)]
+
+
+def recompute_subgraph(objects):
+    """
+    Recompute only the touched objects objects depend on and their
+    dependents up to objects, instead of the whole document; returns the
+    number of recomputed objects
+    """
+    stale = stale_objects(objects)
+    by_document = {}
+    for obj in stale:
+        by_document.setdefault(obj.Document.Name, (obj.Document, []))[1].append(obj)
+    for doc, doc_objects in by_document.values():
+        try:
+            doc.recompute(doc_objects)
+        except TypeError:
+            # FreeCAD versions without partial document recomputes
+            for obj in doc_objects:
+                obj.recompute()
+
+    for obj in stale:
+        if "Invalid" in obj.State:
+            FreeCAD.Console.PrintWarning(
+                f"ExportPlus: {obj.Label} failed to recompute, its last valid shape is exported\n"
+            )
+    if stale:
+        FreeCAD.Console.PrintLog(f"ExportPlus: Recomputed {len(stale)} stale object(s) before export\n")
+    return len(stale)
+
+
+def _object_scale(obj, scale_factor, object_scales):
+    if object_scales:
+        return object_scales.get(obj.Name, scale_factor)
+    return scale_factor
+
+
+def _should_verify(file_path, format_name):
+    """Return True if the written file should be read back and checked"""
+    if format_name not in exportplus_verify.VERIFY_FORMATS or not exportplus_verify.is_enabled():
+        return False
+    # Compressed files cannot be memory-mapped
+    return exportplus_output.split_compression(file_path)[1] is None
+
+
+def export_with_scaling(file_path, objects, format_name, export_func, scale_factor=None, object_scales=None):
+    """
+    Generic export function with scaling support
+
+    Parameters:
+    - file_path: Output file path, or a writable binary stream / "-" for
+      stdout (see exportplus_stream)
+    - objects: List of objects to export
+    - format_name: Format identifier (e.g., "STEP", "STL")
+    - export_func: The actual export function to call
+    - scale_factor: Scaling factor to use instead of the preferences
+    - object_scales: {object name: factor} overriding scale_factor for
+      single objects (e.g. from per-object overrides)
+
+    The export is recorded in the export history; writers may return a
+    dict of statistics (e.g. {"triangles": 1200}) to be stored with it.
+    Writers get a temporary path that replaces file_path only on success;
+    a ".gz" or ".zip" suffix compresses the output. With PreCheckMode set,
+    shapes are checked first (see exportplus_check); with OutputStore,
+    identical exports are linked from the output store (see exportplus_store).
+    """
+    import exportplus_stream
+    if exportplus_stream.is_stream(file_path):
+        return exportplus_stream.export_to_stream(
+            file_path, objects, format_name, export_func, scale_factor, object_scales
+        )
+
+    if scale_factor is None:
+        scale_factor = get_scaling_factor(format_name)
+    file_path, atomic = _output_target(file_path, format_name)
+
+    FreeCAD.Console.PrintMessage(
+        f"Exporting {format_name} with scaling factor: {scale_factor}\n"
+    )
+
+    tessellation = None
+    if format_name in exportplus_mesh.MESH_FORMATS:
+        linear, angular = exportplus_mesh.get_tessellation()
+        tessellation = (linear, math.degrees(angular))
+
+    with exportplus_history.ExportRecord(
+        file_path, objects, format_name, scale_factor, tessellation
+    ) as record, contextlib.ExitStack() as stack:
+        if exportplus_settings.current().RecomputeBeforeExport:
+            # Pending changes would otherwise be exported stale
+            with record.stage("recompute"):
+                recompute_subgraph(objects)
+
+        if exportplus_check.get_mode() != "off":
+            # Broken shapes are reported (or dropped) before any work is spent on them
+            with record.stage("check"):
+                objects = exportplus_check.precheck(objects)
+            if not objects:
+                raise ValueError("No objects left to export after the pre-export check")
+
+        # Contents of placed App::Parts are written in global coordinates
+        objects, object_scales = stack.enter_context(
+            exportplus_selection.placed_objects(objects, format_name, object_scales)
+        )
+
+        store_key = None
+        if atomic and exportplus_store.is_enabled():
+            store_key = exportplus_store.artifact_key(
+                objects, format_name, file_path, scale_factor, object_scales
+            )
+            if store_key is not None:
+                # An identical export was written before - link it instead
+                with record.stage("store"):
+                    stats = exportplus_store.fetch(store_key, file_path)
+                if stats is not None:
+                    record.update(stats)
+                    return
+
+        mesh_writer = atomic and export_func in (export_stl, export_obj)
+        if mesh_writer and exportplus_mesh.use_bounded_memory(format_name):
+            # Objects are scaled chunk by chunk by the writer, no scaled copies are kept
+            bounded = functools.partial(
+                exportplus_mesh.export_mesh_bounded,
+                format_name=format_name,
+                scale_factor=scale_factor,
+                object_scales=object_scales,
+            )
+            with record.stage("write"):
+                record.update(_write(bounded, file_path, objects, atomic))
+        elif scale_factor == 1.0 and not object_scales:
+            # No scaling needed, export directly
+            with record.stage("write"):
+                record.update(_write(export_func, file_path, objects, atomic))
+        else:
+            # Create temporary scaled objects
+            doc = objects[0].Document if objects else FreeCAD.ActiveDocument
+            temp_objs = []
+
+            try:
+                with record.stage("scale"):
+                    for obj in objects:
+                        if hasattr(obj, "Shape") and obj.Shape:
+                            # Create a temporary object with scaled shape
+                            temp_obj = doc.addObject("Part::Feature", "TempScaled")
+                            # Make a copy and scale it - scale() returns a new shape
+                            scaled_shape = obj.Shape.copy()
+                            scaled_shape.scale(_object_scale(obj, scale_factor, object_scales))
+                            temp_obj.Shape = scaled_shape
+                            temp_objs.append(temp_obj)
+                        else:
+                            temp_objs.append(obj)
+
+                # Recompute the temporary objects only, not the whole document
+                with record.stage("recompute"):
+                    recompute_subgraph(
+                        [obj for obj in temp_objs if getattr(obj, "Name", "").startswith("TempScaled")]
+                    )
+
+                # Export the scaled objects
+                with record.stage("write"):
+                    record.update(_write(export_func, file_path, temp_objs, atomic))
+
+            finally:
+                # Clean up temporary objects
+                for obj in temp_objs:
+                    if hasattr(obj, "Name") and obj.Name.startswith("TempScaled"):
+                        try:
+                            doc.removeObject(obj.Name)
+                        except:
+                            pass  # Object might already be deleted
+
+        if atomic and _should_verify(file_path, format_name):
+            with record.stage("verify"):
+                count = record.stats.get("points" if format_name == 'PLY' else "triangles")
+                exportplus_verify.report(file_path, objects, scale_factor, count, object_scales)
+
+        if store_key is not None:
+            with record.stage("store"):
+                exportplus_store.put(store_key, file_path, record.stats)
+
+
+def export_step(path, objs):
+    """Write objects to a STEP file"""
+    import Import
+    Import.export(objs, path)
+
+
+def export_stl(path, objs):
+    """Write objects to an STL file as one merged mesh"""
+    return exportplus_mesh.export_mesh(path, objs, 'STL')
+
+
+def export_obj(path, objs):
+    """Write objects to an OBJ file as one merged mesh"""
+    return exportplus_mesh.export_mesh(path, objs, 'OBJ')
+
+
+def export_dxf(path, objs):
+    """Write objects to a DXF file, projecting 3D bodies first"""
+    import importDXF
+    with exportplus_projection.projected_objects(objs) as flat_objs:
+        importDXF.export(flat_objs, path)
+
+
+def export_svg(path, objs):
+    """Write objects to an SVG file, projecting 3D bodies first"""
+    import importSVG
+    with exportplus_projection.projected_objects(objs) as flat_objs:
+        importSVG.export(flat_objs, path)
+
+
+def export_pdf(path, objs):
+    """Write a TechDraw page, or projected views of 3D bodies, to a PDF file"""
+    if not FreeCAD.GuiUp:
+        # TechDraw pages and projected sheets are both rendered by Qt widgets
+        raise RuntimeError("PDF export needs the FreeCAD GUI, it is not available headless")
+    pages = [obj for obj in objs if obj.isDerivedFrom("TechDraw::DrawPage")]
+    if pages:
+        import TechDrawGui
+        if len(pages) > 1:
+            FreeCAD.Console.PrintWarning("Several TechDraw pages selected, exporting the first one\n")
+        TechDrawGui.exportPageAsPdf(pages[0], path)
+        return
+
+    bodies = [obj for obj in objs if exportplus_projection.needs_projection(obj)]
+    if not bodies or not exportplus_projection.write_pdf(
+        path, exportplus_projection.project_objects(bodies)
+    ):
+        FreeCAD.Console.PrintWarning(
+            "PDF export needs 3D bodies or a TechDraw page. "
+            "Use TechDraw workbench to create drawings first.\n"
+        )
+
+
+def export_ply(path, objs):
+    """Write surface samples of objects to a binary PLY point cloud"""
+    return exportplus_points.export_points(path, objs, 'PLY')
+
+
+def export_npz(path, objs):
+    """Write surface samples of objects to a NumPy .npz file"""
+    return exportplus_points.export_points(path, objs, 'NPZ')
+
+
+# File extension for each export format
+FORMAT_EXTENSIONS = {
+    'STEP': '.step',
+    'STL': '.stl',
+    'OBJ': '.obj',
+    'DXF': '.dxf',
+    'SVG': '.svg',
+    'PDF': '.pdf',
+    'PLY': '.ply',
+    'NPZ': '.npz',
+}
+
+# Writer for each export format
+EXPORT_FUNCTIONS = {
+    'STEP': export_step,
+    'STL': export_stl,
+    'OBJ': export_obj,
+    'DXF': export_dxf,
+    'SVG': export_svg,
+    'PDF': export_pdf,
+    'PLY': export_ply,
+    'NPZ': export_npz,
+}
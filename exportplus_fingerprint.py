@@ -0,0 +1,170 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2026 ExportPlus Workbench                               *
+# *                                                                         *
+# *   This file is part of the ExportPlus FreeCAD Workbench.                *
+# *                                                                         *
+# *   ExportPlus is free software: you can redistribute it and/or modify    *
+# *   it under the terms of the GNU Lesser General Public License as        *
+# *   published by the Free Software Foundation, either version 2.1 of the  *
+# *   License, or (at your option) any later version.                       *
+# *                                                                         *
+# *   ExportPlus is distributed in the hope that it will be useful, but     *
+# *   WITHOUT ANY WARRANTY; without even the implied warranty of            *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU      *
+# *   Lesser General Public License for more details.                       *
+# *                                                                         *
+# *   You should have received a copy of the GNU Lesser General Public      *
+# *   License along with ExportPlus. If not, see                            *
+# *   <https://www.gnu.org/licenses/>.                                      *
+# *                                                                         *
+# ***************************************************************************
+
+
+"""Geometric fingerprints - cheap change detection for caches
+
+Dumping a shape to BREP just to hash it costs nearly as much as exporting
+it. A fingerprint hashes cheap signals instead: the topology counts, the
+bounding box, volume, area and edge length, low-order moments of the
+vertex positions and the placement. Two shapes with the same fingerprint
+are treated as equal by the tessellation, projection and check caches.
+
+Fingerprints of document objects are memoized and forgotten when the
+document observer reports a change to the object; objects waiting for a
+recompute are never memoized. With FingerprintStrict the fingerprint is
+the digest of the full BREP, for when a false match is not acceptable.
+"""
+
+import hashlib
+import threading
+
+import FreeCAD
+
+import exportplus_cache
+import exportplus_settings
+
+
+# Significant digits kept of measured values, so round-off noise of
+# repeated measurements does not change the fingerprint
+DIGITS = 12
+
+# (document name, object name, strict) -> fingerprint
+_memo = {}
+_lock = threading.Lock()
+_observer = None
+
+
+def is_strict():
+    """Return True if fingerprints are full BREP digests"""
+    return exportplus_settings.current().FingerprintStrict
+
+
+def _number(value):
+    value = float(value)
+    # -0.0 and 0.0 must hash alike
+    return format(value + 0.0, f".{DIGITS}g")
+
+
+def _measure(shape, name):
+    try:
+        return getattr(shape, name)
+    except Exception:
+        # Some shape types (e.g. a bare vertex) cannot be measured
+        return 0.0
+
+
+def _vertex_moments(shape):
+    """Sums of vertex coordinates and their products (catches moved or rotated features)"""
+    sums = [0.0] * 9
+    for vertex in shape.Vertexes:
+        x, y, z = vertex.X, vertex.Y, vertex.Z
+        for index, value in enumerate((x, y, z, x * x, y * y, z * z, x * y, y * z, z * x)):
+            sums[index] += value
+    return sums
+
+
+def shape_fingerprint(shape, strict=None):
+    """Return a stable hex fingerprint for a shape"""
+    if strict is None:
+        strict = is_strict()
+    if strict:
+        return "brep:" + exportplus_cache.brep_digest(exportplus_cache.shape_to_brep(shape))
+
+    box = shape.BoundBox
+    signals = [
+        shape.ShapeType,
+        len(shape.Solids), len(shape.Shells), len(shape.Faces),
+        len(shape.Edges), len(shape.Vertexes),
+    ]
+    signals += [
+        _number(value)
+        for value in (
+            box.XMin, box.YMin, box.ZMin, box.XMax, box.YMax, box.ZMax,
+            _measure(shape, "Volume"), _measure(shape, "Area"), _measure(shape, "Length"),
+        )
+    ]
+    signals += [_number(value) for value in _vertex_moments(shape)]
+    signals += [_number(value) for value in shape.Placement.toMatrix().A]
+    return "fp:" + hashlib.sha1(repr(signals).encode("utf-8")).hexdigest()
+
+
+class _FingerprintObserver:
+    """Document observer forgetting the fingerprints of changed objects"""
+
+    def slotChangedObject(self, obj, prop):
+        forget(obj)
+
+    def slotRecomputedObject(self, obj):
+        forget(obj)
+
+    def slotDeletedObject(self, obj):
+        forget(obj)
+
+    def slotDeletedDocument(self, doc):
+        with _lock:
+            for key in [key for key in _memo if key[0] == doc.Name]:
+                del _memo[key]
+
+
+def _install():
+    global _observer
+    if _observer is None:
+        _observer = _FingerprintObserver()
+        FreeCAD.addDocumentObserver(_observer)
+
+
+def forget(obj):
+    """Drop the memoized fingerprints of obj"""
+    try:
+        names = (obj.Document.Name, obj.Name)
+    except Exception:
+        return
+    with _lock:
+        for strict in (False, True):
+            _memo.pop(names + (strict,), None)
+
+
+def object_fingerprint(obj, strict=None):
+    """Return the fingerprint of obj.Shape, memoized until the object changes"""
+    if strict is None:
+        strict = is_strict()
+    _install()
+    key = (obj.Document.Name, obj.Name, strict)
+    with _lock:
+        fingerprint = _memo.get(key)
+    if fingerprint is not None:
+        return fingerprint
+
+    fingerprint = shape_fingerprint(obj.Shape, strict)
+    # A touched object gets a new shape on the next recompute
+    if not obj.isTouched() and "Touched" not in obj.State:
+        with _lock:
+            _memo[key] = fingerprint
+    return fingerprint
+
+
+def clear():
+    """Forget every memoized fingerprint"""
+    with _lock:
+        _memo.clear()
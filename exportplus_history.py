@@ -0,0 +1,339 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2026 ExportPlus Workbench                               *
+# *                                                                         *
+# *   This file is part of the ExportPlus FreeCAD Workbench.                *
+# *                                                                         *
+# *   ExportPlus is free software: you can redistribute it and/or modify    *
+# *   it under the terms of the GNU Lesser General Public License as        *
+# *   published by the Free Software Foundation, either version 2.1 of the  *
+# *   License, or (at your option) any later version.                       *
+# *                                                                         *
+# *   ExportPlus is distributed in the hope that it will be useful, but     *
+# *   WITHOUT ANY WARRANTY; without even the implied warranty of            *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU      *
+# *   Lesser General Public License for more details.                       *
+# *                                                                         *
+# *   You should have received a copy of the GNU Lesser General Public      *
+# *   License along with ExportPlus. If not, see                            *
+# *   <https://www.gnu.org/licenses/>.                                      *
+# *                                                                         *
+# ***************************************************************************
+
+"""Export history - every export recorded in a local SQLite database
+
+Each export_with_scaling() run is recorded with its document, objects,
+format, scale, tessellation settings, per-stage durations, output size,
+triangle count and output hash. Stages are timed with stage(), which
+writers can use anywhere below export_with_scaling() without passing the
+record around. Stage durations may nest (e.g. "tessellate" inside "write").
+"""
+
+import csv
+import hashlib
+import json
+import os
+import sqlite3
+import struct
+import threading
+import time
+from contextlib import contextmanager
+
+import FreeCAD
+
+import exportplus_settings
+
+
+COLUMNS = (
+    "id", "timestamp", "document", "objects", "format", "scale",
+    "linear_deflection", "angular_deflection", "path", "status", "error",
+    "total_seconds", "stages", "size_bytes", "triangles", "sha256",
+    "faces", "edges",
+)
+
+_local = threading.local()
+_schema_ready = set()
+
+
+def is_enabled():
+    return exportplus_settings.current().HistoryEnabled
+
+
+def get_history_path():
+    """Return the path of the history database"""
+    path = exportplus_settings.current().HistoryPath
+    if not path:
+        path = os.path.join(FreeCAD.getUserAppDataDir(), "ExportPlus", "history.sqlite")
+    return path
+
+
+def _connect():
+    path = get_history_path()
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=10)
+    conn.row_factory = sqlite3.Row
+    if path not in _schema_ready:
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS exports ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp REAL, document TEXT,"
+            " objects TEXT, format TEXT, scale REAL, linear_deflection REAL,"
+            " angular_deflection REAL, path TEXT, status TEXT, error TEXT,"
+            " total_seconds REAL, stages TEXT, size_bytes INTEGER, triangles INTEGER,"
+            " sha256 TEXT, faces INTEGER, edges INTEGER)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS exports_time ON exports (timestamp)")
+        conn.commit()
+        _schema_ready.add(path)
+    return conn
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _stl_triangles(path):
+    """Read the triangle count from a binary STL header (None for ASCII STL)"""
+    size = os.path.getsize(path)
+    if size < 84:
+        return None
+    with open(path, "rb") as f:
+        f.seek(80)
+        count = struct.unpack("<I", f.read(4))[0]
+    # An ASCII STL does not match the binary size formula
+    return count if size == 84 + 50 * count else None
+
+
+class ExportRecord:
+    """Collects timings and statistics of one export, then saves them
+
+    Use as a context manager around the export; while active, stage()
+    calls anywhere in the same thread are timed into this record.
+    """
+
+    def __init__(self, path, objects, format_name, scale_factor, tessellation=None):
+        self.path = path
+        self.format_name = format_name
+        self.scale_factor = scale_factor
+        self.tessellation = tessellation or (None, None)
+        self.document = ""
+        self.objects = []
+        self.faces = 0
+        self.edges = 0
+        count_topology = is_enabled()
+        for obj in objects:
+            doc = getattr(obj, "Document", None)
+            if doc is not None and not self.document:
+                self.document = doc.FileName or doc.Name
+            self.objects.append(getattr(obj, "Label", str(obj)))
+            shape = getattr(obj, "Shape", None) if count_topology else None
+            if shape is not None and not shape.isNull():
+                self.faces += len(shape.Faces)
+                self.edges += len(shape.Edges)
+        self.stages = {}
+        self.stats = {}
+        self._start = None
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    def update(self, stats):
+        """Merge statistics returned by a writer (e.g. {"triangles": 1200})"""
+        if stats:
+            self.stats.update(stats)
+
+    def __enter__(self):
+        self._previous = getattr(_local, "record", None)
+        _local.record = self
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _local.record = self._previous
+        total = time.perf_counter() - self._start
+        try:
+            self.save(total, exc)
+        except (sqlite3.Error, OSError) as e:
+            FreeCAD.Console.PrintWarning(f"ExportPlus: Could not record export history: {e}\n")
+        return False
+
+    def save(self, total_seconds, error=None):
+        if not is_enabled():
+            return
+        size = triangles = sha = None
+        if error is None and os.path.isfile(self.path):
+            size = os.path.getsize(self.path)
+            triangles = self.stats.get("triangles")
+            if triangles is None and self.path.lower().endswith(".stl"):
+                triangles = _stl_triangles(self.path)
+            if exportplus_settings.current().HistoryHashOutputs:
+                with self.stage("hash"):
+                    sha = _file_sha256(self.path)
+        elif error is None:
+            triangles = self.stats.get("triangles")
+
+        conn = _connect()
+        try:
+            conn.execute(
+                "INSERT INTO exports (timestamp, document, objects, format, scale,"
+                " linear_deflection, angular_deflection, path, status, error,"
+                " total_seconds, stages, size_bytes, triangles, sha256, faces, edges)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    time.time(), self.document, json.dumps(self.objects), self.format_name,
+                    self.scale_factor, self.tessellation[0], self.tessellation[1], self.path,
+                    "failed" if error is not None else "ok",
+                    str(error) if error is not None else None,
+                    round(total_seconds, 4),
+                    json.dumps({k: round(v, 4) for k, v in self.stages.items()}),
+                    size, triangles, sha, self.faces, self.edges,
+                ),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+
+def current_record():
+    """Return the ExportRecord active in this thread, or None"""
+    return getattr(_local, "record", None)
+
+
+@contextmanager
+def stage(name):
+    """Time a block into the active export record (no-op without one)"""
+    record = current_record()
+    if record is None:
+        yield
+        return
+    with record.stage(name):
+        yield
+
+
+def report(stats):
+    """Add writer statistics to the active export record"""
+    record = current_record()
+    if record is not None:
+        record.update(stats)
+
+
+def query(limit=500, text=None, format_name=None):
+    """Return the most recent exports as dicts, newest first"""
+    sql = "SELECT * FROM exports"
+    where = []
+    params = []
+    if text:
+        where.append("(document LIKE ? OR objects LIKE ? OR path LIKE ?)")
+        params += [f"%{text}%"] * 3
+    if format_name:
+        where.append("format = ?")
+        params.append(format_name)
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY timestamp DESC LIMIT ?"
+    params.append(limit)
+    conn = _connect()
+    try:
+        return [dict(row) for row in conn.execute(sql, params)]
+    finally:
+        conn.close()
+
+
+def trends(limit=200):
+    """
+    Summarize repeated exports of the same objects to the same format
+
+    Returns dicts with count, first/last/average/max seconds and the ratio
+    of the last run to the first, slowest-growing first.
+    """
+    conn = _connect()
+    try:
+        rows = conn.execute(
+            "SELECT document, objects, format, COUNT(*) AS count,"
+            " AVG(total_seconds) AS avg_seconds, MAX(total_seconds) AS max_seconds,"
+            " AVG(size_bytes) AS avg_size, MAX(timestamp) AS last_time,"
+            " (SELECT total_seconds FROM exports f WHERE f.document = e.document AND"
+            "  f.objects = e.objects AND f.format = e.format AND f.status = 'ok'"
+            "  ORDER BY timestamp ASC LIMIT 1) AS first_seconds,"
+            " (SELECT total_seconds FROM exports l WHERE l.document = e.document AND"
+            "  l.objects = e.objects AND l.format = e.format AND l.status = 'ok'"
+            "  ORDER BY timestamp DESC LIMIT 1) AS last_seconds"
+            " FROM exports e WHERE status = 'ok'"
+            " GROUP BY document, objects, format ORDER BY last_time DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
+    finally:
+        conn.close()
+    result = []
+    for row in rows:
+        row = dict(row)
+        first = row["first_seconds"] or 0.0
+        row["ratio"] = (row["last_seconds"] or 0.0) / first if first > 0 else None
+        result.append(row)
+    result.sort(key=lambda r: r["ratio"] or 0.0, reverse=True)
+    return result
+
+
+def last_export(document, objects, format_name, scale_factor):
+    """Return the latest successful export of exactly these objects, or None"""
+    conn = _connect()
+    try:
+        row = conn.execute(
+            "SELECT * FROM exports WHERE status = 'ok' AND document = ? AND objects = ?"
+            " AND format = ? AND scale = ? ORDER BY timestamp DESC LIMIT 1",
+            (document, json.dumps(list(objects)), format_name, scale_factor),
+        ).fetchone()
+    finally:
+        conn.close()
+    return dict(row) if row is not None else None
+
+
+def recent_rates(format_name, limit=200):
+    """Return recent successful exports of a format that have face counts"""
+    conn = _connect()
+    try:
+        rows = conn.execute(
+            "SELECT total_seconds, size_bytes, triangles, faces, linear_deflection, scale"
+            " FROM exports WHERE status = 'ok' AND format = ? AND faces > 0"
+            " ORDER BY timestamp DESC LIMIT ?",
+            (format_name, limit),
+        ).fetchall()
+    finally:
+        conn.close()
+    return [dict(row) for row in rows]
+
+
+def dump_csv(path):
+    """Write the whole history to a CSV file and return the number of rows"""
+    conn = _connect()
+    try:
+        rows = conn.execute("SELECT * FROM exports ORDER BY timestamp").fetchall()
+    finally:
+        conn.close()
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        for row in rows:
+            writer.writerow([row[c] for c in COLUMNS])
+    return len(rows)
+
+
+def clear():
+    """Delete every history entry"""
+    conn = _connect()
+    try:
+        conn.execute("DELETE FROM exports")
+        conn.commit()
+    finally:
+        conn.close()
@@ -144,6 +144,33 @@ def add_to_file_menu():
             action.setToolTip(f"Export to {label} with scaling")
             action.triggered.connect(lambda checked=False, cmd=cmd_name: FreeCADGui.runCommand(cmd))
 
+        export_menu.addSeparator()
+
+        watch_action = export_menu.addAction("Watch and Re-export...")
+        watch_action.setToolTip("Keep an STL/OBJ export up to date while editing")
+        watch_action.triggered.connect(lambda checked=False: FreeCADGui.runCommand("ExportPlus_Watch"))
+
+        stop_action = export_menu.addAction("Stop Watching")
+        stop_action.triggered.connect(lambda checked=False: FreeCADGui.runCommand("ExportPlus_StopWatch"))
+
+        history_action = export_menu.addAction("Export History...")
+        history_action.setToolTip("Show recorded exports with their durations and sizes")
+        history_action.triggered.connect(lambda checked=False: FreeCADGui.runCommand("ExportPlus_History"))
+
+        profile_action = export_menu.addAction("Export with Profiling...")
+        profile_action.setToolTip("Export and save a flamegraph profile and memory summary next to the file")
+        profile_action.triggered.connect(lambda checked=False: FreeCADGui.runCommand("ExportPlus_ProfiledExport"))
+
+        export_menu.addSeparator()
+
+        overrides_action = export_menu.addAction("Add Export Overrides")
+        overrides_action.setToolTip("Add per-object scale, tessellation and output name properties")
+        overrides_action.triggered.connect(lambda checked=False: FreeCADGui.runCommand("ExportPlus_Overrides"))
+
+        document_action = export_menu.addAction("Export Document with Overrides...")
+        document_action.setToolTip("Export the whole document using per-object overrides")
+        document_action.triggered.connect(lambda checked=False: FreeCADGui.runCommand("ExportPlus_ExportDocument"))
+
         FreeCAD.Console.PrintLog("ExportPlus: Added to File menu\n")
 
     except Exception as e:
@@ -0,0 +1,457 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2026 ExportPlus Workbench                               *
+# *                                                                         *
+# *   This file is part of the ExportPlus FreeCAD Workbench.                *
+# *                                                                         *
+# *   ExportPlus is free software: you can redistribute it and/or modify    *
+# *   it under the terms of the GNU Lesser General Public License as        *
+# *   published by the Free Software Foundation, either version 2.1 of the  *
+# *   License, or (at your option) any later version.                       *
+# *                                                                         *
+# *   ExportPlus is distributed in the hope that it will be useful, but     *
+# *   WITHOUT ANY WARRANTY; without even the implied warranty of            *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU      *
+# *   Lesser General Public License for more details.                       *
+# *                                                                         *
+# *   You should have received a copy of the GNU Lesser General Public      *
+# *   License along with ExportPlus. If not, see                            *
+# *   <https://www.gnu.org/licenses/>.                                      *
+# *                                                                         *
+# ***************************************************************************
+
+"""Mesh export path (STL, OBJ) with optional triangle / file-size budget
+
+Without a budget the selection is merged into one compound and written
+with FreeCAD's default mesh export. With a budget, every object gets a
+share of the triangle budget proportional to its surface area and is
+tessellated with a deflection chosen to fit that share, falling back to
+quadric decimation when even a coarse tessellation is too dense.
+"""
+
+import gc
+import math
+import os
+import struct
+
+import FreeCAD
+import Part
+
+import exportplus_cache
+import exportplus_fingerprint
+import exportplus_history
+import exportplus_memory
+import exportplus_output
+import exportplus_settings
+import exportplus_tessellate
+import exportplus_meshdata
+from exportplus_meshdata import MeshData
+
+
+# Formats written by the mesh export path
+MESH_FORMATS = ('STL', 'OBJ')
+
+# Approximate output size per triangle (binary STL is exact: 50 bytes)
+BYTES_PER_TRIANGLE = {
+    'STL': 50,
+    'OBJ': 45,
+}
+
+# Fixed output size independent of the triangle count
+FILE_OVERHEAD = {
+    'STL': 84,
+    'OBJ': 64,
+}
+
+# Smallest triangle share given to any object
+MIN_TRIANGLES_PER_OBJECT = 12
+
+# Upper bound for the angular deflection when coarsening a tessellation
+MAX_ANGULAR_DEFLECTION = math.radians(60.0)
+
+
+# Tessellation cache, keyed by (shape fingerprint, deflections). Disabled
+# until enable_tessellation_cache() is called.
+_tessellation_cache = None
+
+
+def get_tessellation():
+    """Return (linear deflection in mm, angular deflection in radians)"""
+    settings = exportplus_settings.current()
+    linear = settings.MeshLinearDeflection
+    if linear <= 0.0:
+        # Fall back to the deviation used by FreeCAD's own mesh export
+        linear = settings.MeshMaxDeviationExport
+    angular = settings.MeshAngularDeflection
+    return linear, math.radians(angular)
+
+
+def get_budget(format_name):
+    """Return the triangle budget for a mesh format (0 = no budget)"""
+    settings = exportplus_settings.current()
+    triangles = settings.MeshBudgetTriangles
+    max_bytes = settings.MeshBudgetBytes
+    if max_bytes > 0:
+        per_triangle = BYTES_PER_TRIANGLE.get(format_name, 50)
+        overhead = FILE_OVERHEAD.get(format_name, 0)
+        from_bytes = max(1, (max_bytes - overhead) // per_triangle)
+        triangles = min(triangles, from_bytes) if triangles > 0 else from_bytes
+    return max(0, triangles)
+
+
+def get_memory_limit():
+    """Return the memory ceiling of bounded mesh exports in bytes (0 = unbounded)"""
+    return max(exportplus_settings.current().MemoryLimitMB, 0) * 1024 * 1024
+
+
+def use_bounded_memory(format_name):
+    """Return True if format_name exports should run in memory-bounded mode"""
+    return format_name in MESH_FORMATS and get_memory_limit() > 0
+
+
+def enable_tessellation_cache(max_mb=512, max_entries=1024):
+    """Keep tessellations in memory so identical shapes are meshed only once"""
+    global _tessellation_cache
+    _tessellation_cache = exportplus_cache.ResultCache(
+        max_entries=max_entries, max_bytes=max_mb * 1024 * 1024
+    )
+    return _tessellation_cache
+
+
+def disable_tessellation_cache():
+    """Drop the tessellation cache"""
+    global _tessellation_cache
+    _tessellation_cache = None
+
+
+def tessellation_cache():
+    """Return the tessellation cache, or None when it is disabled"""
+    return _tessellation_cache
+
+
+def _cache_key(shape, linear_deflection, angular_deflection):
+    return (exportplus_fingerprint.shape_fingerprint(shape), linear_deflection, angular_deflection)
+
+
+def cached_triangle_count(objs, linear_deflection, angular_deflection=None):
+    """Return the triangle count of objs if all their tessellations are cached, else None"""
+    cache = _tessellation_cache
+    if cache is None:
+        return None
+    if angular_deflection is None:
+        angular_deflection = get_tessellation()[1]
+    total = 0
+    for obj in objs:
+        shape = getattr(obj, 'Shape', None)
+        if shape is None or shape.isNull():
+            continue
+        data = cache.get(_cache_key(shape, linear_deflection, angular_deflection))
+        if data is None:
+            return None
+        total += data.triangle_count
+    return total
+
+
+def _mesh_shape(shape, linear_deflection, angular_deflection):
+    import MeshPart
+
+    return MeshPart.meshFromShape(
+        Shape=shape,
+        LinearDeflection=linear_deflection,
+        AngularDeflection=angular_deflection,
+        Relative=False,
+    )
+
+
+def cache_put(cache, key, mesh):
+    """Store a Mesh.Mesh or MeshData in the cache and return the cached MeshData"""
+    data = mesh if isinstance(mesh, MeshData) else MeshData.from_mesh(mesh)
+    # Cached arrays are shared with every caller, make them read-only
+    data.points.flags.writeable = False
+    data.facets.flags.writeable = False
+    cache.put(key, data, size=data.nbytes)
+    return data
+
+
+def tessellate_shape(shape, linear_deflection, angular_deflection, cache_result=True):
+    """Tessellate a shape into a Mesh.Mesh with absolute deflections"""
+    cache = _tessellation_cache
+    if cache is None:
+        return _mesh_shape(shape, linear_deflection, angular_deflection)
+    key = _cache_key(shape, linear_deflection, angular_deflection)
+    data = cache.get(key)
+    if data is not None:
+        return data.to_mesh()
+    mesh = _mesh_shape(shape, linear_deflection, angular_deflection)
+    if cache_result:
+        cache_put(cache, key, mesh)
+    return mesh
+
+
+def _tessellate_new(shape, linear_deflection, angular_deflection, allow_parallel):
+    if allow_parallel and exportplus_tessellate.is_large(shape):
+        data = exportplus_tessellate.tessellate_parallel(shape, linear_deflection, angular_deflection)
+        if data is not None:
+            return data
+    return MeshData.from_mesh(_mesh_shape(shape, linear_deflection, angular_deflection))
+
+
+def tessellate_data(shape, linear_deflection, angular_deflection, name=None, allow_parallel=False,
+                    cache_result=True):
+    """
+    Tessellate a shape into MeshData; cached results are shared without copying
+
+    With allow_parallel, shapes above the ParallelTessellationFaces threshold
+    are split over the worker pool (not from inside a worker). With
+    cache_result=False a new mesh is not added to the tessellation cache.
+    """
+    cache = _tessellation_cache
+    if cache is None:
+        data = _tessellate_new(shape, linear_deflection, angular_deflection, allow_parallel)
+    else:
+        key = _cache_key(shape, linear_deflection, angular_deflection)
+        data = cache.get(key)
+        if data is None:
+            data = _tessellate_new(shape, linear_deflection, angular_deflection, allow_parallel)
+            if cache_result:
+                data = cache_put(cache, key, data)
+    if name is not None:
+        data = MeshData(data.points, data.facets, [(name, 0, data.triangle_count)])
+    return data
+
+
+def tessellate_brep(task):
+    """
+    Scale and tessellate one shape given as (brep, scale_factor, linear,
+    angular[, name]) into MeshData - the worker pool entry point
+    """
+    brep, scale_factor, linear_deflection, angular_deflection, *name = task
+    shape = exportplus_cache.shape_from_brep(brep)
+    if scale_factor != 1.0:
+        shape.scale(scale_factor)
+    return tessellate_data(shape, linear_deflection, angular_deflection, *name)
+
+
+def allocate_budget(shapes, total_triangles):
+    """Split a triangle budget between shapes proportionally to surface area"""
+    areas = [max(shape.Area, 0.0) for shape in shapes]
+    total_area = sum(areas)
+    if total_area <= 0.0:
+        return [max(MIN_TRIANGLES_PER_OBJECT, total_triangles // max(len(shapes), 1))] * len(shapes)
+    return [
+        max(MIN_TRIANGLES_PER_OBJECT, int(total_triangles * area / total_area))
+        for area in areas
+    ]
+
+
+def decimate_mesh(mesh, target_triangles, tolerance):
+    """Reduce a mesh to about target_triangles using quadric decimation"""
+    mesh = mesh.copy()
+    count = mesh.CountFacets
+    if count <= target_triangles:
+        return mesh
+    try:
+        mesh.decimate(int(target_triangles))
+    except TypeError:
+        # Older FreeCAD only offers the (tolerance, reduction) signature
+        mesh.decimate(tolerance, 1.0 - float(target_triangles) / count)
+    return mesh
+
+
+def mesh_to_budget(shape, target_triangles, linear_deflection, angular_deflection, max_iterations=4,
+                   cache_result=True):
+    """Tessellate shape so that it stays within target_triangles"""
+    mesh = tessellate_shape(shape, linear_deflection, angular_deflection, cache_result)
+    for _ in range(max_iterations):
+        count = mesh.CountFacets
+        if count <= target_triangles:
+            return mesh
+        # The triangle count grows roughly with 1 / linear deflection on
+        # curved faces and with 1 / angular deflection around small radii
+        ratio = float(count) / target_triangles
+        linear_deflection *= min(ratio * 1.1, 10.0)
+        angular_deflection = min(angular_deflection * math.sqrt(ratio), MAX_ANGULAR_DEFLECTION)
+        mesh = tessellate_shape(shape, linear_deflection, angular_deflection, cache_result)
+
+    if mesh.CountFacets > target_triangles:
+        mesh = decimate_mesh(mesh, target_triangles, linear_deflection)
+    return mesh
+
+
+def build_budget_mesh(shapes, total_triangles):
+    """Return one merged Mesh.Mesh of all shapes within total_triangles"""
+    import Mesh
+
+    linear, angular = get_tessellation()
+    merged = Mesh.Mesh()
+    for shape, share in zip(shapes, allocate_budget(shapes, total_triangles)):
+        merged.addMesh(mesh_to_budget(shape, share, linear, angular))
+    return merged
+
+
+def export_mesh(path, objs, format_name):
+    """
+    Write objects to a mesh file, honouring the configured budget and split mode
+
+    Parameters:
+    - path: Output file path (the extension selects the mesh format)
+    - objs: Objects to export
+    - format_name: Format identifier ("STL", "OBJ") used for the budget
+    """
+    import Mesh
+
+    import exportplus_split
+    if exportplus_split.get_split_mode() != "none":
+        return exportplus_split.export_split(path, objs, format_name)
+
+    shapes = [obj.Shape for obj in objs if hasattr(obj, 'Shape') and not obj.Shape.isNull()]
+    if not shapes:
+        return
+
+    budget = get_budget(format_name)
+    if not budget:
+        if _tessellation_cache is None and not any(exportplus_tessellate.is_large(s) for s in shapes):
+            compound = Part.makeCompound(shapes)
+            Mesh.export([compound], path)
+            return
+        # Mesh every shape separately so unchanged shapes hit the cache and
+        # huge shapes are split over the worker pool
+        linear, angular = get_tessellation()
+        with exportplus_history.stage("tessellate"):
+            merged = MeshData.merge([
+                tessellate_data(shape, linear, angular, allow_parallel=True) for shape in shapes
+            ])
+        with exportplus_history.stage("mesh_write"):
+            merged.write(path, format_name, exportplus_output.get_buffer_size())
+        return {"triangles": merged.triangle_count}
+
+    max_bytes = exportplus_settings.current().MeshBudgetBytes
+    for _ in range(3):
+        with exportplus_history.stage("tessellate"):
+            mesh = build_budget_mesh(shapes, budget)
+        with exportplus_history.stage("mesh_write"):
+            mesh.write(path)
+        size = os.path.getsize(path)
+        if not max_bytes or size <= max_bytes:
+            break
+        # Byte estimates are approximate for text formats - tighten and retry
+        budget = max(1, int(budget * float(max_bytes) / size * 0.95))
+
+    FreeCAD.Console.PrintMessage(
+        f"ExportPlus: Mesh budget mode wrote {mesh.CountFacets} triangles "
+        f"({size} bytes)\n"
+    )
+    return {"triangles": mesh.CountFacets}
+
+
+class _ChunkWriter:
+    """Appends MeshData chunk by chunk to one binary STL or OBJ file"""
+
+    def __init__(self, path, format_name):
+        self.format_name = format_name
+        self.triangles = 0
+        self.vertices = 0
+        self.file = open(path, "wb", buffering=exportplus_output.get_buffer_size())
+        if format_name == 'STL':
+            self.file.write(exportplus_meshdata.STL_HEADER)
+            self.file.write(struct.pack("<I", 0))
+
+    def write(self, meshes):
+        """Append a list of MeshData"""
+        merged = MeshData.merge(meshes)
+        if not merged.triangle_count:
+            return
+        if self.format_name == 'STL':
+            merged.write_stl_records(self.file)
+        else:
+            merged.write_obj(self.file, self.vertices)
+        self.triangles += merged.triangle_count
+        self.vertices += merged.vertex_count
+
+    def close(self):
+        if self.format_name == 'STL':
+            self.file.seek(80)
+            self.file.write(struct.pack("<I", self.triangles))
+        self.file.close()
+
+
+def export_mesh_bounded(path, objs, format_name, scale_factor=1.0, object_scales=None):
+    """
+    Write objects to a mesh file chunk by chunk under the MemoryLimitMB ceiling
+
+    Objects are scaled, tessellated and appended to the file one chunk at a
+    time; each chunk's scaled shapes and meshes are released before the
+    next one starts, so no merged compound of the whole selection exists.
+
+    Parameters:
+    - path: Output file path
+    - objs: Objects to export, not yet scaled
+    - format_name: "STL" or "OBJ"
+    - scale_factor: Scaling factor applied to every object
+    - object_scales: {object name: factor} overriding scale_factor
+    """
+    limit = get_memory_limit()
+    chunk_limit = max(limit // 4, 1)
+    linear, angular = get_tessellation()
+    objs = [obj for obj in objs if hasattr(obj, 'Shape') and not obj.Shape.isNull()]
+    budget = get_budget(format_name)
+    budgets = allocate_budget([obj.Shape for obj in objs], budget) if budget else [0] * len(objs)
+
+    writer = _ChunkWriter(path, format_name)
+    chunks = 0
+    # ru_maxrss would cover the whole process lifetime, so the peak of this
+    # export is taken from the samples of the chunk loop
+    peak = None
+    pending = []
+    pending_bytes = 0
+    try:
+        for obj, obj_budget in zip(objs, budgets):
+            with exportplus_history.stage("tessellate"):
+                shape = obj.Shape.copy()
+                factor = (object_scales or {}).get(obj.Name, scale_factor)
+                if factor != 1.0:
+                    shape.scale(factor)
+                # Cached meshes would outlive their chunk and defeat the limit
+                if obj_budget:
+                    mesh = MeshData.from_mesh(
+                        mesh_to_budget(shape, obj_budget, linear, angular, cache_result=False), obj.Label
+                    )
+                else:
+                    mesh = tessellate_data(
+                        shape, linear, angular, obj.Label, allow_parallel=True, cache_result=False
+                    )
+                del shape
+            pending.append(mesh)
+            pending_bytes += mesh.nbytes
+            del mesh
+
+            rss = exportplus_memory.current_rss()
+            if rss is not None:
+                peak = rss if peak is None else max(peak, rss)
+            if pending_bytes >= chunk_limit or (rss is not None and rss > limit):
+                with exportplus_history.stage("mesh_write"):
+                    writer.write(pending)
+                chunks += 1
+                pending = []
+                pending_bytes = 0
+                gc.collect()
+
+        with exportplus_history.stage("mesh_write"):
+            writer.write(pending)
+        if pending:
+            chunks += 1
+        pending = []
+    finally:
+        writer.close()
+
+    FreeCAD.Console.PrintMessage(
+        f"ExportPlus: Memory-bounded export wrote {writer.triangles} triangles from "
+        f"{len(objs)} object(s) in {chunks} chunk(s), peak RSS "
+        f"{exportplus_memory.format_mb(peak)} (limit {exportplus_memory.format_mb(limit)})\n"
+    )
+    if peak is not None and peak > limit:
+        FreeCAD.Console.PrintWarning(
+            "ExportPlus: Peak memory exceeded MemoryLimitMB (the document itself counts towards it)\n"
+        )
+    return {"triangles": writer.triangles}
@@ -0,0 +1,260 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2026 ExportPlus Workbench                               *
+# *                                                                         *
+# *   This file is part of the ExportPlus FreeCAD Workbench.                *
+# *                                                                         *
+# *   ExportPlus is free software: you can redistribute it and/or modify    *
+# *   it under the terms of the GNU Lesser General Public License as        *
+# *   published by the Free Software Foundation, either version 2.1 of the  *
+# *   License, or (at your option) any later version.                       *
+# *                                                                         *
+# *   ExportPlus is distributed in the hope that it will be useful, but     *
+# *   WITHOUT ANY WARRANTY; without even the implied warranty of            *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU      *
+# *   Lesser General Public License for more details.                       *
+# *                                                                         *
+# *   You should have received a copy of the GNU Lesser General Public      *
+# *   License along with ExportPlus. If not, see                            *
+# *   <https://www.gnu.org/licenses/>.                                      *
+# *                                                                         *
+# ***************************************************************************
+
+"""Array-backed triangle mesh shared by the mesh writers
+
+MeshData keeps vertices in one contiguous float array (n x 3) and faces in
+one uint32 array (m x 3), plus the face ranges of the objects it was built
+from. It is cheap to pickle (worker results), to cache (its size is known
+exactly) and to transform, merge and weld with vectorized numpy operations,
+and it writes binary STL and OBJ without creating a Python object per
+vertex or face.
+"""
+
+import numpy
+
+
+STL_HEADER = b"ExportPlus binary STL".ljust(80, b" ")
+STL_RECORD = numpy.dtype([
+    ("normal", "<f4", (3,)),
+    ("vertices", "<f4", (3, 3)),
+    ("attribute", "<u2"),
+])
+
+# Rows formatted per write call by the text writers
+BLOCK_ROWS = 65536
+
+
+class MeshData:
+    """
+    Triangle mesh stored in contiguous arrays
+
+    Attributes:
+    - points: (n, 3) float64 or float32 vertex coordinates
+    - facets: (m, 3) uint32 vertex indices
+    - ranges: [(name, first facet, end facet), ...] of the source objects
+    """
+
+    __slots__ = ("points", "facets", "ranges")
+
+    def __init__(self, points, facets, ranges=None):
+        points = numpy.asarray(points)
+        if points.dtype not in (numpy.float32, numpy.float64):
+            points = points.astype(numpy.float64)
+        self.points = numpy.ascontiguousarray(points.reshape(-1, 3))
+        self.facets = numpy.ascontiguousarray(numpy.asarray(facets, dtype=numpy.uint32).reshape(-1, 3))
+        self.ranges = list(ranges) if ranges is not None else []
+
+    def __getstate__(self):
+        return self.points, self.facets, self.ranges
+
+    def __setstate__(self, state):
+        self.points, self.facets, self.ranges = state
+
+    def __repr__(self):
+        return f"<MeshData {self.vertex_count} vertices, {self.triangle_count} triangles>"
+
+    @classmethod
+    def empty(cls):
+        return cls(numpy.zeros((0, 3)), numpy.zeros((0, 3), dtype=numpy.uint32))
+
+    @classmethod
+    def from_mesh(cls, mesh, name=None):
+        """Build from a Mesh.Mesh"""
+        points, facets = mesh.Topology
+        data = cls(
+            numpy.array([(p.x, p.y, p.z) for p in points], dtype=numpy.float64).reshape(-1, 3),
+            numpy.array(facets, dtype=numpy.uint32).reshape(-1, 3),
+        )
+        if name is not None:
+            data.ranges = [(name, 0, data.triangle_count)]
+        return data
+
+    @classmethod
+    def from_triangles(cls, triangles, name=None):
+        """Build from an (m, 3, 3) array of corner coordinates (not welded)"""
+        triangles = numpy.asarray(triangles).reshape(-1, 3, 3)
+        count = len(triangles)
+        data = cls(triangles.reshape(-1, 3), numpy.arange(count * 3, dtype=numpy.uint32).reshape(-1, 3))
+        if name is not None:
+            data.ranges = [(name, 0, count)]
+        return data
+
+    @classmethod
+    def merge(cls, meshes):
+        """Concatenate several MeshData into one, keeping their object ranges"""
+        meshes = [mesh for mesh in meshes if mesh.triangle_count]
+        if not meshes:
+            return cls.empty()
+        if len(meshes) == 1:
+            return meshes[0]
+        dtype = numpy.result_type(*[mesh.points.dtype for mesh in meshes])
+        points = numpy.concatenate([mesh.points for mesh in meshes]).astype(dtype, copy=False)
+        offsets = numpy.cumsum([0] + [mesh.vertex_count for mesh in meshes[:-1]])
+        if offsets[-1] + meshes[-1].vertex_count > numpy.iinfo(numpy.uint32).max:
+            raise ValueError("Merged mesh has too many vertices for 32 bit indices")
+        facets = numpy.concatenate([
+            mesh.facets + numpy.uint32(offset) for mesh, offset in zip(meshes, offsets)
+        ])
+        ranges = []
+        start = 0
+        for mesh in meshes:
+            # Every face stays inside a range, unnamed meshes get an unnamed one
+            mesh_ranges = mesh.ranges or [(None, 0, mesh.triangle_count)]
+            ranges.extend((name, first + start, end + start) for name, first, end in mesh_ranges)
+            start += mesh.triangle_count
+        return cls(points, facets, ranges)
+
+    @property
+    def vertex_count(self):
+        return len(self.points)
+
+    @property
+    def triangle_count(self):
+        return len(self.facets)
+
+    @property
+    def nbytes(self):
+        return self.points.nbytes + self.facets.nbytes
+
+    def bounds(self):
+        """Return (xmin, ymin, zmin, xmax, ymax, zmax), or None for an empty mesh"""
+        if not self.vertex_count:
+            return None
+        used = self.points[numpy.unique(self.facets)] if self.triangle_count else self.points
+        return tuple(float(v) for v in numpy.concatenate([used.min(axis=0), used.max(axis=0)]))
+
+    def triangles(self):
+        """Return the (m, 3, 3) corner coordinates"""
+        return self.points[self.facets]
+
+    def normals(self):
+        """Return the (m, 3) unit face normals (zero for degenerate faces)"""
+        corners = self.triangles().astype(numpy.float64, copy=False)
+        normals = numpy.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+        lengths = numpy.linalg.norm(normals, axis=1)
+        lengths[lengths == 0.0] = 1.0
+        return normals / lengths[:, None]
+
+    def astype(self, dtype):
+        """Return a copy with points of dtype (e.g. numpy.float32 to halve memory)"""
+        return MeshData(self.points.astype(dtype), self.facets, self.ranges)
+
+    def scaled(self, factor):
+        """Return a copy scaled about the origin; faces are shared, not copied"""
+        return MeshData(self.points * factor, self.facets, self.ranges)
+
+    def transformed(self, matrix):
+        """Return a copy transformed by a 4x4 matrix (numpy array or FreeCAD.Matrix)"""
+        if hasattr(matrix, "A"):
+            matrix = matrix.A
+        matrix = numpy.asarray(matrix, dtype=numpy.float64).reshape(4, 4)
+        points = self.points @ matrix[:3, :3].T + matrix[:3, 3]
+        facets = self.facets
+        if numpy.linalg.det(matrix[:3, :3]) < 0.0:
+            # Mirroring flips the orientation, keep normals pointing outwards
+            facets = facets[:, ::-1]
+        return MeshData(points.astype(self.points.dtype, copy=False), facets, self.ranges)
+
+    def welded(self, tolerance=0.0):
+        """
+        Return a copy with coincident vertices merged and degenerate faces removed
+
+        Vertices closer than about tolerance are merged (exact duplicates
+        when tolerance is 0).
+        """
+        if not self.vertex_count:
+            return self
+        keys = self.points
+        if tolerance > 0.0:
+            keys = numpy.round(self.points / tolerance).astype(numpy.int64)
+        _, index, inverse = numpy.unique(keys, axis=0, return_index=True, return_inverse=True)
+        points = self.points[index]
+        facets = inverse.reshape(-1)[self.facets].astype(numpy.uint32)
+        keep = (
+            (facets[:, 0] != facets[:, 1])
+            & (facets[:, 1] != facets[:, 2])
+            & (facets[:, 0] != facets[:, 2])
+        )
+        ranges = self.ranges
+        if not keep.all():
+            kept_before = numpy.concatenate([[0], numpy.cumsum(keep)])
+            ranges = [(name, int(kept_before[first]), int(kept_before[end])) for name, first, end in ranges]
+            facets = facets[keep]
+        return MeshData(points, facets, ranges)
+
+    def to_mesh(self):
+        """Return a Mesh.Mesh with the same triangles"""
+        import Mesh
+        return Mesh.Mesh(self.triangles().tolist())
+
+    def stl_records(self, start=0, stop=None):
+        """Return the binary STL records of facets[start:stop] as a numpy array"""
+        facets = self.facets[start:stop]
+        records = numpy.zeros(len(facets), dtype=STL_RECORD)
+        corners = self.points[facets]
+        records["vertices"] = corners
+        normals = numpy.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+        lengths = numpy.linalg.norm(normals, axis=1)
+        lengths[lengths == 0.0] = 1.0
+        records["normal"] = normals / lengths[:, None]
+        return records
+
+    def write_stl_records(self, f):
+        """Write the binary STL records (no header) to the file object f"""
+        for start in range(0, self.triangle_count, BLOCK_ROWS):
+            f.write(self.stl_records(start, start + BLOCK_ROWS).tobytes())
+
+    def write_stl(self, f):
+        """Write a binary STL to the file object f"""
+        f.write(STL_HEADER)
+        f.write(numpy.uint32(self.triangle_count).tobytes())
+        self.write_stl_records(f)
+
+    def write_obj(self, f, vertex_offset=0):
+        """
+        Write OBJ vertex and face lines to the file object f
+
+        vertex_offset is the number of vertices already written to the same
+        file, so several MeshData can be appended to one OBJ.
+        """
+        for start in range(0, self.vertex_count, BLOCK_ROWS):
+            block = self.points[start:start + BLOCK_ROWS]
+            f.write((("v %.6f %.6f %.6f\n" * len(block)) % tuple(block.ravel().tolist())).encode("ascii"))
+        ranges = self.ranges or [(None, 0, self.triangle_count)]
+        for name, first, end in ranges:
+            if name is not None:
+                f.write(f"o {name}\n".encode("utf-8"))
+            for start in range(first, end, BLOCK_ROWS):
+                block = self.facets[start:min(start + BLOCK_ROWS, end)].astype(numpy.int64) + (vertex_offset + 1)
+                f.write((("f %d %d %d\n" * len(block)) % tuple(block.ravel().tolist())).encode("ascii"))
+
+    def write(self, path, format_name=None, buffer_size=1 << 20):
+        """Write the mesh to path as binary STL or OBJ (from format_name or the extension)"""
+        if format_name is None:
+            format_name = "OBJ" if path.lower().endswith(".obj") else "STL"
+        with open(path, "wb", buffering=buffer_size) as f:
+            if format_name.upper() == "OBJ":
+                self.write_obj(f)
+            else:
+                self.write_stl(f)
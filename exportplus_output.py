@@ -0,0 +1,170 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2026 ExportPlus Workbench                               *
+# *                                                                         *
+# *   This file is part of the ExportPlus FreeCAD Workbench.                *
+# *                                                                         *
+# *   ExportPlus is free software: you can redistribute it and/or modify    *
+# *   it under the terms of the GNU Lesser General Public License as        *
+# *   published by the Free Software Foundation, either version 2.1 of the  *
+# *   License, or (at your option) any later version.                       *
+# *                                                                         *
+# *   ExportPlus is distributed in the hope that it will be useful, but     *
+# *   WITHOUT ANY WARRANTY; without even the implied warranty of            *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU      *
+# *   Lesser General Public License for more details.                       *
+# *                                                                         *
+# *   You should have received a copy of the GNU Lesser General Public      *
+# *   License along with ExportPlus. If not, see                            *
+# *   <https://www.gnu.org/licenses/>.                                      *
+# *                                                                         *
+# ***************************************************************************
+
+"""Output layer for export writers
+
+Writers never write to the user's path directly. They write to a temporary
+file in the same folder, which is moved into place with one atomic rename
+once the export succeeded, so a failed or cancelled export never leaves a
+truncated file behind. For paths ending in ".gz" or ".zip" (e.g.
+"part.stl.gz", "part.obj.zip") the writer's file goes to the local
+temporary directory instead, and only the compressed result is written next
+to the target, so a network share sees the compressed bytes once.
+"""
+
+import contextlib
+import gzip
+import os
+import secrets
+import shutil
+import tempfile
+import zipfile
+
+import exportplus_settings
+
+
+COMPRESSIONS = {".gz": "gzip", ".zip": "zip"}
+
+# Suffix appended to output paths for the OutputCompression preference
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "zip": ".zip"}
+
+TEMP_ATTEMPTS = 100
+
+
+def get_buffer_size():
+    """Return the write buffer size in bytes (OutputBufferKB, default 1 MB)"""
+    size_kb = exportplus_settings.current().OutputBufferKB
+    return max(size_kb, 64) * 1024
+
+
+def get_compression():
+    """Return the configured output compression: "none", "gzip" or "zip" """
+    compression = exportplus_settings.current().OutputCompression.lower()
+    if compression not in COMPRESSION_SUFFIXES:
+        return "none"
+    return compression
+
+
+def split_compression(path):
+    """Return (inner_path, compression) for path, e.g. ("a.stl", "gzip") for "a.stl.gz" """
+    root, ext = os.path.splitext(path)
+    compression = COMPRESSIONS.get(ext.lower())
+    # A bare "a.zip" is an archive in its own right, not a compressed export
+    if compression is None or not os.path.splitext(root)[1]:
+        return path, None
+    return root, compression
+
+
+def output_path(path):
+    """Return path with the suffix of the OutputCompression preference appended"""
+    if split_compression(path)[1] is not None:
+        return path
+    compression = get_compression()
+    if compression == "none":
+        return path
+    return path + COMPRESSION_SUFFIXES[compression]
+
+
+def _temp_path(path, suffix):
+    """Create an empty temporary file next to path, with the usual permissions of new files"""
+    folder, filename = os.path.split(path)
+    for _ in range(TEMP_ATTEMPTS):
+        temp_path = os.path.join(folder or os.curdir, f".{filename}.{secrets.token_hex(4)}{suffix}")
+        try:
+            # Unlike mkstemp, the mode is filtered by the umask like any new file
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        except FileExistsError:
+            continue
+        os.close(fd)
+        return temp_path
+    raise FileExistsError(f"No free temporary name for {path}")
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _compress(source, path, compression, arcname):
+    """Stream source into path compressed, through a ".part" file next to path"""
+    buffer_size = get_buffer_size()
+    temp_path = _temp_path(path, ".part")
+    try:
+        with open(source, "rb", buffering=buffer_size) as src:
+            if compression == "gzip":
+                with open(temp_path, "wb", buffering=buffer_size) as raw:
+                    with gzip.GzipFile(filename=arcname, mode="wb", fileobj=raw, compresslevel=6) as dst:
+                        shutil.copyfileobj(src, dst, buffer_size)
+            else:
+                with zipfile.ZipFile(temp_path, "w", zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+                    with archive.open(arcname, "w", force_zip64=True) as dst:
+                        shutil.copyfileobj(src, dst, buffer_size)
+        os.replace(temp_path, path)
+    except:
+        _remove(temp_path)
+        raise
+
+
+@contextlib.contextmanager
+def atomic_output(path):
+    """
+    Yield a temporary path to write the content of path to
+
+    The temporary file has the extension of the format (the inner extension
+    for compressed paths) so extension based exporters pick the right
+    format. It is moved into place when the block succeeds and removed when
+    it raises; for compressed paths it lives in the local temporary
+    directory and is compressed into place. A writer that leaves it empty
+    (some only print a warning) raises ValueError and the existing file is kept.
+    """
+    inner_path, compression = split_compression(path)
+    if compression is None:
+        temp_folder = None
+        temp_path = _temp_path(path, os.path.splitext(inner_path)[1])
+    else:
+        temp_folder = tempfile.mkdtemp(prefix="exportplus-")
+        temp_path = os.path.join(temp_folder, os.path.basename(inner_path))
+    try:
+        yield temp_path
+        if not os.path.isfile(temp_path) or os.path.getsize(temp_path) == 0:
+            raise ValueError(f"Nothing was written to {path}, the existing file is kept")
+        if compression is None:
+            os.replace(temp_path, path)
+        else:
+            _compress(temp_path, path, compression, os.path.basename(inner_path))
+    finally:
+        if temp_folder is None:
+            _remove(temp_path)
+        else:
+            shutil.rmtree(temp_folder, ignore_errors=True)
+
+
+@contextlib.contextmanager
+def open_atomic(path, mode="wb"):
+    """Open a large-buffered file object that replaces path atomically on success"""
+    with atomic_output(path) as temp_path:
+        encoding = None if "b" in mode else "utf-8"
+        with open(temp_path, mode, buffering=get_buffer_size(), encoding=encoding) as f:
+            yield f
@@ -0,0 +1,234 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2026 ExportPlus Workbench                               *
+# *                                                                         *
+# *   This file is part of the ExportPlus FreeCAD Workbench.                *
+# *                                                                         *
+# *   ExportPlus is free software: you can redistribute it and/or modify    *
+# *   it under the terms of the GNU Lesser General Public License as        *
+# *   published by the Free Software Foundation, either version 2.1 of the  *
+# *   License, or (at your option) any later version.                       *
+# *                                                                         *
+# *   ExportPlus is distributed in the hope that it will be useful, but     *
+# *   WITHOUT ANY WARRANTY; without even the implied warranty of            *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU      *
+# *   Lesser General Public License for more details.                       *
+# *                                                                         *
+# *   You should have received a copy of the GNU Lesser General Public      *
+# *   License along with ExportPlus. If not, see                            *
+# *   <https://www.gnu.org/licenses/>.                                      *
+# *                                                                         *
+# ***************************************************************************
+
+"""Per-object export overrides
+
+Objects can carry ExportPlus properties overriding the export settings for
+themselves and, on containers, for everything inside them:
+
+- ExportPlusScale: scaling factor (0 = use the preferences)
+- ExportPlusLinearDeflection / ExportPlusAngularDeflection: tessellation
+  for STL/OBJ (0 = use the preferences)
+- ExportPlusOutputName: file name stem, objects sharing it go to one file
+  (empty = the document's file name)
+- ExportPlusFormats: comma separated formats the object is exported to
+  (empty = every format of the batch)
+
+export_document() exports a whole document in one batch with the overrides
+of every object resolved at once. Objects are grouped per output file and
+format, and tessellations are shared between formats through the
+tessellation cache.
+"""
+
+import os
+from collections import OrderedDict
+
+import FreeCAD
+
+import exportplus_check
+import exportplus_export
+import exportplus_mesh
+import exportplus_selection
+import exportplus_settings
+
+
+PROPERTY_GROUP = "ExportPlus"
+
+# Property name: (type, default, description)
+PROPERTIES = OrderedDict([
+    ("ExportPlusScale", ("App::PropertyFloat", 0.0, "Scaling factor for this object, 0 = preferences")),
+    ("ExportPlusLinearDeflection", ("App::PropertyFloat", 0.0, "Mesh linear deflection in mm, 0 = preferences")),
+    ("ExportPlusAngularDeflection", ("App::PropertyFloat", 0.0, "Mesh angular deflection in degrees, 0 = preferences")),
+    ("ExportPlusOutputName", ("App::PropertyString", "", "Output file name without extension, empty = document name")),
+    ("ExportPlusFormats", ("App::PropertyString", "", "Formats to export to (e.g. 'STEP, STL'), empty = all")),
+])
+
+
+def has_overrides(obj):
+    return any(hasattr(obj, name) for name in PROPERTIES)
+
+
+def add_override_properties(obj):
+    """Add the ExportPlus override properties to obj (existing ones are kept)"""
+    for name, (kind, default, description) in PROPERTIES.items():
+        if not hasattr(obj, name):
+            obj.addProperty(kind, name, PROPERTY_GROUP, description)
+            setattr(obj, name, default)
+
+
+def remove_override_properties(obj):
+    for name in PROPERTIES:
+        if hasattr(obj, name):
+            obj.removeProperty(name)
+
+
+def _parents(obj):
+    """Containers holding obj directly"""
+    return [parent for parent in obj.InList if obj in (getattr(parent, "Group", None) or [])]
+
+
+def get_overrides(obj):
+    """
+    Return the overrides in effect for obj as a dict
+
+    Every property is taken from the nearest object that sets it: obj
+    itself, then its containers (Body, Part, group) outwards.
+    """
+    overrides = {}
+    queue = [obj]
+    seen = set()
+    while queue and len(overrides) < len(PROPERTIES):
+        current = queue.pop(0)
+        if current.Name in seen:
+            continue
+        seen.add(current.Name)
+        for name, (_, default, _) in PROPERTIES.items():
+            if name not in overrides and hasattr(current, name):
+                value = getattr(current, name)
+                if value != default:
+                    overrides[name] = value
+        queue.extend(_parents(current))
+    return overrides
+
+
+def parse_formats(value):
+    """Split a format list such as 'STEP, stl' into ['STEP', 'STL']"""
+    return [f.strip().upper() for f in value.replace(";", ",").split(",") if f.strip()]
+
+
+def plan_document(doc, formats=None, objects=None):
+    """
+    Resolve the overrides of a document into export groups
+
+    Returns an OrderedDict {(output name, format): [(object, overrides), ...]}.
+    formats defaults to every format named by an override, or STEP.
+    """
+    roots = objects if objects is not None else doc.RootObjects
+    explicit = objects is not None
+    if not formats:
+        formats = []
+        for obj in doc.Objects:
+            for format_name in parse_formats(getattr(obj, "ExportPlusFormats", "")):
+                if format_name not in formats:
+                    formats.append(format_name)
+        formats = formats or ["STEP"]
+
+    default_name = os.path.splitext(os.path.basename(doc.FileName))[0] or doc.Label
+    groups = OrderedDict()
+    for format_name in formats:
+        format_name = format_name.upper()
+        if format_name not in exportplus_export.EXPORT_FUNCTIONS:
+            raise ValueError(f"Unknown format '{format_name}'")
+        for obj in exportplus_selection.resolve_selection(roots, format_name, explicit=explicit):
+            overrides = get_overrides(obj)
+            wanted = parse_formats(overrides.get("ExportPlusFormats", ""))
+            if wanted and format_name not in wanted:
+                continue
+            name = overrides.get("ExportPlusOutputName") or default_name
+            groups.setdefault((name, format_name), []).append((obj, overrides))
+    return groups
+
+
+def _group_settings(format_name, members):
+    """Return (settings, scale_factor, object_scales) for one output file"""
+    settings = exportplus_settings.current()
+    default_scale = settings.scaling_factor(format_name)
+    object_scales = {
+        obj.Name: overrides["ExportPlusScale"]
+        for obj, overrides in members if overrides.get("ExportPlusScale")
+    }
+
+    if format_name in exportplus_mesh.MESH_FORMATS:
+        # One file has one tessellation: the finest requested wins
+        linear = [o["ExportPlusLinearDeflection"] for _, o in members if o.get("ExportPlusLinearDeflection")]
+        angular = [o["ExportPlusAngularDeflection"] for _, o in members if o.get("ExportPlusAngularDeflection")]
+        values = {}
+        if linear:
+            values["MeshLinearDeflection"] = min(linear)
+        if angular:
+            values["MeshAngularDeflection"] = min(angular)
+        if len(set(linear)) > 1 or len(set(angular)) > 1:
+            FreeCAD.Console.PrintWarning(
+                "ExportPlus: Objects in one file request different tessellations, using the finest\n"
+            )
+        if values:
+            settings = settings.override(**values)
+
+    # Objects all sharing one override scale are exported with it directly
+    scales = set(object_scales.values())
+    if len(object_scales) == len(members) and len(scales) == 1:
+        return settings, scales.pop(), None
+    return settings, default_scale, object_scales or None
+
+
+def export_document(doc, folder=None, formats=None, objects=None):
+    """
+    Export a document with the per-object overrides of its objects
+
+    Parameters:
+    - doc: Document to export
+    - folder: Output folder (defaults to the document's folder)
+    - formats: Format names (defaults to the formats named by overrides, or STEP)
+    - objects: Restrict the export to these objects (default: the whole document)
+
+    Returns a list of (path, format, error) tuples, error is None on success.
+    """
+    if folder is None:
+        folder = os.path.dirname(doc.FileName)
+    groups = plan_document(doc, formats, objects)
+    planned = OrderedDict()
+    for members in groups.values():
+        for obj, _ in members:
+            planned[obj.Name] = obj
+    exportplus_check.check_batch(list(planned.values()))
+
+    own_cache = exportplus_mesh.tessellation_cache() is None
+    if own_cache:
+        exportplus_mesh.enable_tessellation_cache()
+
+    results = []
+    try:
+        for (name, format_name), members in groups.items():
+            path = os.path.join(folder, name + exportplus_export.FORMAT_EXTENSIONS[format_name])
+            settings, scale_factor, object_scales = _group_settings(format_name, members)
+            try:
+                with exportplus_settings.using(settings):
+                    exportplus_export.export_with_scaling(
+                        path,
+                        [obj for obj, _ in members],
+                        format_name,
+                        exportplus_export.EXPORT_FUNCTIONS[format_name],
+                        scale_factor=scale_factor,
+                        object_scales=object_scales,
+                    )
+                results.append((path, format_name, None))
+            except Exception as e:
+                FreeCAD.Console.PrintError(f"ExportPlus: Export to {path} failed: {e}\n")
+                results.append((path, format_name, str(e)))
+    finally:
+        if own_cache:
+            exportplus_mesh.disable_tessellation_cache()
+
+    done = sum(1 for _, _, error in results if error is None)
+    FreeCAD.Console.PrintMessage(f"ExportPlus: Document export wrote {done} of {len(results)} file(s)\n")
+    return results
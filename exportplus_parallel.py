@@ -0,0 +1,238 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2026 ExportPlus Workbench                               *
+# *                                                                         *
+# *   This file is part of the ExportPlus FreeCAD Workbench.                *
+# *                                                                         *
+# *   ExportPlus is free software: you can redistribute it and/or modify    *
+# *   it under the terms of the GNU Lesser General Public License as        *
+# *   published by the Free Software Foundation, either version 2.1 of the  *
+# *   License, or (at your option) any later version.                       *
+# *                                                                         *
+# *   ExportPlus is distributed in the hope that it will be useful, but     *
+# *   WITHOUT ANY WARRANTY; without even the implied warranty of            *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU      *
+# *   Lesser General Public License for more details.                       *
+# *                                                                         *
+# *   You should have received a copy of the GNU Lesser General Public      *
+# *   License along with ExportPlus. If not, see                            *
+# *   <https://www.gnu.org/licenses/>.                                      *
+# *                                                                         *
+# ***************************************************************************
+
+"""Worker pool helpers used by the parallel ExportPlus export stages
+
+Geometry work is handed to worker processes as plain data (BREP strings,
+tuples, numbers) so that it can be pickled. When process workers are not
+available (or disabled in the preferences) the same work is run in a
+thread pool, and with a single worker it simply runs inline.
+"""
+
+import atexit
+import collections
+import contextlib
+import functools
+import os
+import sys
+import threading
+import multiprocessing
+from multiprocessing import spawn as multiprocessing_spawn
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import FreeCAD
+
+import exportplus_settings
+
+
+_pool = None
+_pool_key = None
+_pool_lock = threading.Lock()
+
+
+def get_worker_count():
+    """Return the configured number of workers (0 in preferences = all cores)"""
+    count = exportplus_settings.current().WorkerCount
+    if count <= 0:
+        count = os.cpu_count() or 1
+    return count
+
+
+def use_process_workers():
+    """Return True if worker processes should be used instead of threads"""
+    return exportplus_settings.current().UseProcessWorkers
+
+
+def _find_python():
+    """Find a Python interpreter able to import FreeCAD for spawned workers"""
+    names = ["python.exe"] if sys.platform == "win32" else ["python3", "python"]
+    if os.path.basename(sys.executable).lower().startswith("python"):
+        # FreeCAD imported as a library into a plain interpreter
+        return sys.executable
+    home = FreeCAD.getHomePath()
+    for folder in ("bin", ""):
+        for name in names:
+            candidate = os.path.join(home, folder, name)
+            if os.path.isfile(candidate):
+                return candidate
+    return None
+
+
+def _process_context():
+    """Return (multiprocessing context, worker interpreter) suitable for FreeCAD, or None"""
+    # Workers are never forked from FreeCAD itself: the GUI and the watch
+    # and warmer threads may hold locks a forked child would inherit. A
+    # fork server starts from a fresh interpreter, so forking from it is safe.
+    python = _find_python()
+    if not python:
+        return None
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn"), python
+
+
+@contextlib.contextmanager
+def _worker_executable(python):
+    """
+    Start processes with python while the block runs
+
+    sys.executable is usually the FreeCAD binary, which cannot bootstrap a
+    worker. multiprocessing only has a process-wide executable setting, so
+    it is changed for as long as the workers start and restored afterwards.
+    """
+    previous = multiprocessing_spawn.get_executable()
+    multiprocessing_spawn.set_executable(python)
+    try:
+        yield
+    finally:
+        multiprocessing_spawn.set_executable(previous)
+
+
+def _process_pool():
+    """Return the shared worker process pool, started on first use, or None if unavailable"""
+    global _pool, _pool_key
+    found = _process_context()
+    if found is None:
+        FreeCAD.Console.PrintLog("ExportPlus: No worker interpreter found, using threads\n")
+        return None
+    context, python = found
+    size = get_worker_count()
+    key = (context.get_start_method(), python, size)
+    with _pool_lock:
+        if _pool is not None and _pool_key == key:
+            return _pool
+        _shutdown_locked()
+        pool = ProcessPoolExecutor(max_workers=size, mp_context=context)
+        try:
+            with _worker_executable(python):
+                # One task per worker while none is idle starts all of them now,
+                # while the worker interpreter is set
+                for future in [pool.submit(os.getpid) for _ in range(size)]:
+                    future.result()
+        except:
+            pool.shutdown(wait=False)
+            raise
+        _pool, _pool_key = pool, key
+        return pool
+
+
+def _shutdown_locked():
+    global _pool, _pool_key
+    if _pool is not None:
+        _pool.shutdown(wait=False)
+    _pool = _pool_key = None
+
+
+def shutdown_pool():
+    """Stop the shared worker processes; the next parallel call starts new ones"""
+    with _pool_lock:
+        _shutdown_locked()
+
+
+atexit.register(shutdown_pool)
+
+
+def map_parallel(func, items, max_workers=None, use_processes=None):
+    """
+    Apply func to every item using a worker pool and return the results in order
+
+    Parameters:
+    - func: Module-level function taking one item (must be picklable)
+    - items: Iterable of picklable work items
+    - max_workers: Tasks run at the same time (defaults to the WorkerCount preference)
+    - use_processes: Use worker processes instead of threads
+      (defaults to the UseProcessWorkers preference)
+    """
+    return list(imap_parallel(func, items, max_workers, use_processes))
+
+
+def imap_parallel(func, items, max_workers=None, use_processes=None):
+    """
+    Like map_parallel(), but yield the results in order as soon as each is ready
+
+    max_workers items are kept in flight, so later items are computed while
+    the caller is still consuming the first results. Worker processes are
+    shared between calls and only started once (see shutdown_pool).
+    """
+    items = list(items)
+    if not items:
+        return
+
+    if max_workers is None:
+        max_workers = get_worker_count()
+    max_workers = max(1, min(max_workers, len(items)))
+
+    if max_workers == 1:
+        for item in items:
+            yield func(item)
+        return
+
+    if use_processes is None:
+        use_processes = use_process_workers()
+        if not use_processes:
+            # Turned off in the preferences: release idle workers
+            shutdown_pool()
+
+    # Workers see the caller's settings, including per-job overrides and
+    # preferences not yet saved to disk
+    func = functools.partial(exportplus_settings.call_with, exportplus_settings.current(), func)
+
+    done = 0
+    pool = None
+    if use_processes:
+        try:
+            pool = _process_pool()
+        except (OSError, BrokenProcessPool) as e:
+            FreeCAD.Console.PrintWarning(
+                f"ExportPlus: Worker processes unavailable ({e}), using threads\n"
+            )
+
+    if pool is not None:
+        # Errors raised by func itself propagate; only a pool that broke
+        # (a worker died) falls back to threads
+        pending = collections.deque()
+        try:
+            for item in items:
+                pending.append(pool.submit(func, item))
+                if len(pending) >= max_workers:
+                    result = pending.popleft().result()
+                    done += 1
+                    yield result
+            while pending:
+                result = pending.popleft().result()
+                done += 1
+                yield result
+            return
+        except BrokenProcessPool as e:
+            shutdown_pool()
+            FreeCAD.Console.PrintWarning(
+                f"ExportPlus: Worker processes unavailable ({e}), using threads\n"
+            )
+        finally:
+            for future in pending:
+                future.cancel()
+
+    # Items already returned by a failed process pool are not computed again
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for result in pool.map(func, items[done:]):
+            yield result
@@ -0,0 +1,242 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2026 ExportPlus Workbench                               *
+# *                                                                         *
+# *   This file is part of the ExportPlus FreeCAD Workbench.                *
+# *                                                                         *
+# *   ExportPlus is free software: you can redistribute it and/or modify    *
+# *   it under the terms of the GNU Lesser General Public License as        *
+# *   published by the Free Software Foundation, either version 2.1 of the  *
+# *   License, or (at your option) any later version.                       *
+# *                                                                         *
+# *   ExportPlus is distributed in the hope that it will be useful, but     *
+# *   WITHOUT ANY WARRANTY; without even the implied warranty of            *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU      *
+# *   Lesser General Public License for more details.                       *
+# *                                                                         *
+# *   You should have received a copy of the GNU Lesser General Public      *
+# *   License along with ExportPlus. If not, see                            *
+# *   <https://www.gnu.org/licenses/>.                                      *
+# *                                                                         *
+# ***************************************************************************
+
+
+"""Point-cloud export - surface samples for machine learning datasets
+
+Every object is tessellated (sharing the tessellation cache with the mesh
+exports) and PointCount points are drawn from its surface: triangles are
+picked with probability proportional to their area and points placed
+uniformly inside them, all vectorized with numpy. Each point carries the
+unit normal of its triangle. Objects are meshed and sampled in the worker
+pool, and the result is written as a binary PLY or an uncompressed .npz:
+
+- points (n, 3) float32, normals (n, 3) float32
+- object (n,) int32 index into labels, labels (k,) str (npz only)
+
+Sampling is seeded with PointSeed and the object index, so repeated
+exports of the same geometry produce identical files.
+"""
+
+import numpy
+
+import FreeCAD
+
+import exportplus_cache
+import exportplus_fingerprint
+import exportplus_history
+import exportplus_mesh
+import exportplus_output
+import exportplus_parallel
+import exportplus_settings
+
+
+POINT_FORMATS = ("PLY", "NPZ")
+
+# Bytes per point in the written files (xyz, normal, object index)
+BYTES_PER_POINT = 28
+
+PLY_RECORD = numpy.dtype([
+    ("x", "<f4"), ("y", "<f4"), ("z", "<f4"),
+    ("nx", "<f4"), ("ny", "<f4"), ("nz", "<f4"),
+    ("object", "<i4"),
+])
+
+
+def get_point_count():
+    """Return the number of points sampled per object"""
+    return max(exportplus_settings.current().PointCount, 1)
+
+
+def sample_surface(data, count, seed=0):
+    """
+    Sample count points from the surface of a MeshData, weighted by area
+
+    Returns (points, normals) as (count, 3) float32 arrays; both are empty
+    for a mesh without area.
+    """
+    corners = data.triangles().astype(numpy.float64, copy=False)
+    cross = numpy.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    doubled_areas = numpy.linalg.norm(cross, axis=1)
+    total = doubled_areas.sum()
+    if not len(corners) or total <= 0.0:
+        empty = numpy.empty((0, 3), dtype=numpy.float32)
+        return empty, empty
+
+    rng = numpy.random.default_rng(seed)
+    chosen = rng.choice(len(corners), size=count, p=doubled_areas / total)
+    # Uniform barycentric coordinates (square-root warping)
+    r1 = numpy.sqrt(rng.random(count))
+    r2 = rng.random(count)
+    weights = numpy.stack([1.0 - r1, r1 * (1.0 - r2), r1 * r2], axis=1)
+    points = numpy.einsum("ij,ijk->ik", weights, corners[chosen])
+
+    lengths = doubled_areas[chosen]
+    normals = cross[chosen] / lengths[:, None]
+    return points.astype(numpy.float32), normals.astype(numpy.float32)
+
+
+def _sample_worker(task):
+    """Tessellate and sample one shape - executed in a worker"""
+    brep, linear, angular, count, seed = task
+    shape = exportplus_cache.shape_from_brep(brep)
+    data = exportplus_mesh.tessellate_data(shape, linear, angular)
+    return sample_surface(data, count, seed)
+
+
+def sampleable(objs):
+    """Return the objects with a surface to sample points from, warning about the others"""
+    result = []
+    for obj in objs:
+        shape = getattr(obj, "Shape", None)
+        if shape is None or shape.isNull():
+            continue
+        if shape.Area <= 0.0:
+            FreeCAD.Console.PrintWarning(
+                f"ExportPlus: {obj.Label} has no surface to sample points from, skipped\n"
+            )
+            continue
+        result.append(obj)
+    return result
+
+
+def iter_samples(objs, count=None, scales=None):
+    """
+    Yield (label, points, normals) for every object with a shape, in order
+
+    Cached tessellations are sampled in-process, the other objects in the
+    worker pool; results are yielded as soon as they are ready. scales
+    maps object names to a scale applied to a copy of the shape first.
+    """
+    if count is None:
+        count = get_point_count()
+    seed = exportplus_settings.current().PointSeed
+    linear, angular = exportplus_mesh.get_tessellation()
+    cache = exportplus_mesh.tessellation_cache()
+
+    labels = []
+    samples = []
+    tasks = []
+    objs = [obj for obj in objs if hasattr(obj, "Shape") and not obj.Shape.isNull()]
+    for index, obj in enumerate(objs):
+        shape = obj.Shape
+        factor = scales.get(obj.Name, 1.0) if scales else 1.0
+        if factor != 1.0:
+            shape = shape.copy()
+            shape.scale(factor)
+        labels.append(obj.Label)
+        object_seed = (seed, index)
+        data = None
+        if cache is not None:
+            data = cache.get((exportplus_fingerprint.shape_fingerprint(shape), linear, angular))
+        if data is not None:
+            samples.append(sample_surface(data, count, object_seed))
+        else:
+            samples.append(None)
+            tasks.append((exportplus_cache.shape_to_brep(shape), linear, angular, count, object_seed))
+
+    computed = exportplus_parallel.imap_parallel(_sample_worker, tasks)
+    for label, sample in zip(labels, samples):
+        if sample is None:
+            sample = next(computed)
+        yield (label,) + tuple(sample)
+
+
+def sample_objects(objs, count=None):
+    """
+    Sample count points per object with a surface (see sampleable)
+
+    Returns (labels, points, normals, object_index).
+    """
+    with exportplus_history.stage("sample"):
+        results = list(iter_samples(sampleable(objs), count))
+    if not results:
+        empty = numpy.empty((0, 3), dtype=numpy.float32)
+        return [], empty, empty, numpy.empty(0, dtype=numpy.int32)
+    labels = [label for label, _, _ in results]
+    points = numpy.concatenate([points for _, points, _ in results])
+    normals = numpy.concatenate([normals for _, _, normals in results])
+    object_index = numpy.concatenate([
+        numpy.full(len(points), index, dtype=numpy.int32)
+        for index, (_, points, _) in enumerate(results)
+    ])
+    return labels, points, normals, object_index
+
+
+def ply_header(count):
+    """Return the header of a binary little-endian PLY with count points"""
+    return (
+        "ply\n"
+        "format binary_little_endian 1.0\n"
+        "comment ExportPlus surface samples\n"
+        f"element vertex {count}\n"
+        "property float x\nproperty float y\nproperty float z\n"
+        "property float nx\nproperty float ny\nproperty float nz\n"
+        "property int object\n"
+        "end_header\n"
+    ).encode("ascii")
+
+
+def ply_records(points, normals, object_index):
+    """Return the binary PLY vertex records of the samples"""
+    records = numpy.empty(len(points), dtype=PLY_RECORD)
+    records["x"], records["y"], records["z"] = points.T
+    records["nx"], records["ny"], records["nz"] = normals.T
+    records["object"] = object_index
+    return records.tobytes()
+
+
+def write_ply(f, points, normals, object_index):
+    """Write a binary little-endian PLY point cloud to a binary file object"""
+    f.write(ply_header(len(points)))
+    f.write(ply_records(points, normals, object_index))
+
+
+def write_npz(f, labels, points, normals, object_index):
+    """Write the samples as an uncompressed .npz to a binary file object"""
+    numpy.savez(
+        f,
+        points=points,
+        normals=normals,
+        object=object_index,
+        labels=numpy.array(labels, dtype=str),
+    )
+
+
+def export_points(path, objs, format_name):
+    """
+    Sample objects and write a point cloud
+
+    Parameters:
+    - path: Output file path
+    - objs: Objects to sample (already scaled by export_with_scaling)
+    - format_name: "PLY" or "NPZ"
+    """
+    labels, points, normals, object_index = sample_objects(objs)
+    with exportplus_history.stage("points_write"):
+        with open(path, "wb", buffering=exportplus_output.get_buffer_size()) as f:
+            if format_name == "NPZ":
+                write_npz(f, labels, points, normals, object_index)
+            else:
+                write_ply(f, points, normals, object_index)
+    return {"points": len(points)}
@@ -0,0 +1,261 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2026 ExportPlus Workbench                               *
+# *                                                                         *
+# *   This file is part of the ExportPlus FreeCAD Workbench.                *
+# *                                                                         *
+# *   ExportPlus is free software: you can redistribute it and/or modify    *
+# *   it under the terms of the GNU Lesser General Public License as        *
+# *   published by the Free Software Foundation, either version 2.1 of the  *
+# *   License, or (at your option) any later version.                       *
+# *                                                                         *
+# *   ExportPlus is distributed in the hope that it will be useful, but     *
+# *   WITHOUT ANY WARRANTY; without even the implied warranty of            *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU      *
+# *   Lesser General Public License for more details.                       *
+# *                                                                         *
+# *   You should have received a copy of the GNU Lesser General Public      *
+# *   License along with ExportPlus. If not, see                            *
+# *   <https://www.gnu.org/licenses/>.                                      *
+# *                                                                         *
+# ***************************************************************************
+
+
+"""Profiled exports - capture where a slow export spends its time and memory
+
+profile_export() runs export_with_scaling() while a sampling thread records
+the Python stack of every thread at ProfilerIntervalMs intervals, and
+tracemalloc tracks allocations. Next to the output file it saves:
+
+- <output>.folded - sampled stacks in the folded format read by
+  flamegraph.pl, speedscope or inferno
+- <output>.prof - a cProfile dump (ProfilerMode "deterministic" only),
+  readable with pstats or snakeviz
+- <output>.memory.txt - wall time, peak Python allocations, process RSS and
+  the largest allocation sites near the peak
+
+FreeCAD and OpenCASCADE calls show up as the Python frame calling them.
+Long C++ calls hold the GIL and delay the sampler, so each sample counts
+for the intervals that passed since the previous one.
+Worker processes are not profiled; set WorkerCount to 1 to see the
+parallel stages in the calling process.
+"""
+
+import cProfile
+import collections
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+import FreeCAD
+
+import exportplus_estimate
+import exportplus_export
+import exportplus_memory
+import exportplus_settings
+
+
+PROFILER_MODES = ("sampling", "deterministic")
+
+# Frames kept per allocation traceback, and allocation sites listed
+TRACE_FRAMES = 10
+TOP_ALLOCATIONS = 25
+
+# Take a new allocation snapshot once traced memory grew by this factor
+SNAPSHOT_GROWTH = 1.25
+
+
+def get_mode():
+    mode = exportplus_settings.current().ProfilerMode.lower()
+    return mode if mode in PROFILER_MODES else "sampling"
+
+
+def profile_paths(path):
+    """Return {kind: path} of the profile files written for an export to path"""
+    return {
+        "folded": path + ".folded",
+        "prof": path + ".prof",
+        "memory": path + ".memory.txt",
+    }
+
+
+def _frame_name(code):
+    name = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    # Semicolons separate frames and spaces the count in the folded format
+    return name.replace(";", ":").replace(" ", "_")
+
+
+class _Sampler(threading.Thread):
+    """Records folded stacks of all other threads and the allocation peak"""
+
+    def __init__(self, interval):
+        super().__init__(name="ExportPlusProfiler", daemon=True)
+        self.interval = interval
+        self.stacks = collections.Counter()
+        self.samples = 0
+        self.peak_snapshot = None
+        self._snapshot_size = 0
+        self._last_snapshot = 0.0
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def run(self):
+        own_id = threading.get_ident()
+        names = {}
+        last = time.monotonic()
+        while not self._stop_event.wait(self.interval):
+            now = time.monotonic()
+            # A wakeup delayed by a call holding the GIL stands for every interval it missed
+            weight = max(1, int(round((now - last) / self.interval)))
+            last = now
+            for thread in threading.enumerate():
+                names[thread.ident] = thread.name
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_name(frame.f_code))
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, f"Thread-{thread_id}").replace(" ", "_"))
+                self.stacks[";".join(reversed(stack))] += weight
+            self.samples += weight
+            self._watch_memory()
+
+    def _watch_memory(self):
+        current = tracemalloc.get_traced_memory()[0]
+        now = time.monotonic()
+        if current > self._snapshot_size * SNAPSHOT_GROWTH and now - self._last_snapshot >= 1.0:
+            self.peak_snapshot = tracemalloc.take_snapshot()
+            self._snapshot_size = current
+            self._last_snapshot = now
+
+
+def _write_folded(path, stacks):
+    with open(path, "w", encoding="utf-8") as f:
+        for stack, count in sorted(stacks.items()):
+            f.write(f"{stack} {count}\n")
+
+
+def _allocation_lines(snapshot):
+    snapshot = snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+    ))
+    lines = []
+    for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+        frame = stat.traceback[0]
+        lines.append(
+            f"  {exportplus_estimate.format_bytes(stat.size):>10}  {stat.count:>8} blocks  "
+            f"{frame.filename}:{frame.lineno}"
+        )
+    return lines
+
+
+def _write_memory(path, info, sampler, end_snapshot):
+    lines = [
+        "ExportPlus export profile",
+        f"Output:     {info['output']}",
+        f"Format:     {info['format']}",
+        f"Status:     {info['status']}",
+        f"Wall time:  {info['seconds']:.3f} s",
+        f"Samples:    {sampler.samples} (every {sampler.interval * 1000:g} ms)",
+        f"Python allocations: peak {exportplus_estimate.format_bytes(info['traced_peak'])}, "
+        f"{exportplus_estimate.format_bytes(info['traced_end'])} still allocated at the end",
+    ]
+    if info["rss_before"] is not None:
+        lines.append(
+            f"Process RSS: {exportplus_memory.format_mb(info['rss_before'])} before, "
+            f"{exportplus_memory.format_mb(info['rss_after'])} after, "
+            f"peak {exportplus_memory.format_mb(info['rss_peak'])}"
+        )
+    if sampler.peak_snapshot is not None:
+        lines += ["", "Largest allocation sites near the peak:"]
+        lines += _allocation_lines(sampler.peak_snapshot)
+    lines += ["", "Allocation sites still holding memory at the end:"]
+    lines += _allocation_lines(end_snapshot)
+    lines += [
+        "",
+        "Allocations made in OpenCASCADE and other C++ code are not traced;",
+        "compare the process RSS with the Python allocations to see their share.",
+    ]
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def profile_export(file_path, objects, format_name, export_func, mode=None, **kwargs):
+    """
+    Run export_with_scaling() under the profiler and save the profile files
+
+    Parameters:
+    - file_path, objects, format_name, export_func: As for export_with_scaling()
+    - mode: "sampling" or "deterministic" (defaults to ProfilerMode); the
+      deterministic mode adds a cProfile dump, at the cost of a slower export
+    - kwargs: Passed on to export_with_scaling()
+
+    Returns the {kind: path} dict of the written profile files. Errors of
+    the export are re-raised after the profile has been saved.
+    """
+    if mode is None:
+        mode = get_mode()
+    interval = max(exportplus_settings.current().ProfilerIntervalMs, 1) / 1000.0
+    paths = profile_paths(exportplus_export.output_file(file_path, format_name))
+
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start(TRACE_FRAMES)
+    elif hasattr(tracemalloc, "reset_peak"):  # Python 3.9+
+        tracemalloc.reset_peak()
+    rss_before = exportplus_memory.current_rss()
+    sampler = _Sampler(interval)
+    profiler = cProfile.Profile() if mode == "deterministic" else None
+
+    status = "ok"
+    start = time.perf_counter()
+    sampler.start()
+    try:
+        if profiler is not None:
+            profiler.enable()
+        try:
+            exportplus_export.export_with_scaling(file_path, objects, format_name, export_func, **kwargs)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+    except Exception as e:
+        status = f"failed: {e}"
+        raise
+    finally:
+        seconds = time.perf_counter() - start
+        sampler.stop()
+        traced_end, traced_peak = tracemalloc.get_traced_memory()
+        end_snapshot = tracemalloc.take_snapshot()
+        if not was_tracing:
+            tracemalloc.stop()
+
+        info = {
+            "output": file_path,
+            "format": format_name,
+            "status": status,
+            "seconds": seconds,
+            "traced_end": traced_end,
+            "traced_peak": traced_peak,
+            "rss_before": rss_before,
+            "rss_after": exportplus_memory.current_rss(),
+            "rss_peak": exportplus_memory.peak_rss(),
+        }
+        _write_folded(paths["folded"], sampler.stacks)
+        if profiler is not None:
+            profiler.dump_stats(paths["prof"])
+        else:
+            del paths["prof"]
+        _write_memory(paths["memory"], info, sampler, end_snapshot)
+        FreeCAD.Console.PrintMessage(
+            f"ExportPlus: Profile saved to {', '.join(paths.values())}\n"
+        )
+    return paths
@@ -0,0 +1,226 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2026 ExportPlus Workbench                               *
+# *                                                                         *
+# *   This file is part of the ExportPlus FreeCAD Workbench.                *
+# *                                                                         *
+# *   ExportPlus is free software: you can redistribute it and/or modify    *
+# *   it under the terms of the GNU Lesser General Public License as        *
+# *   published by the Free Software Foundation, either version 2.1 of the  *
+# *   License, or (at your option) any later version.                       *
+# *                                                                         *
+# *   ExportPlus is distributed in the hope that it will be useful, but     *
+# *   WITHOUT ANY WARRANTY; without even the implied warranty of            *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU      *
+# *   Lesser General Public License for more details.                       *
+# *                                                                         *
+# *   You should have received a copy of the GNU Lesser General Public      *
+# *   License along with ExportPlus. If not, see                            *
+# *   <https://www.gnu.org/licenses/>.                                      *
+# *                                                                         *
+# ***************************************************************************
+
+"""Named export profiles
+
+A profile bundles a format, a scaling factor and the tessellation and
+writer settings to use, e.g. "Customer A - STEP inches" or "Printer - fine
+STL". Profiles are stored as JSON in the ExportProfiles preference and can
+be run one at a time or together in one batch. A batch runs profiles with
+the same scale and tessellation back to back with the tessellation cache
+enabled, so their geometry is only meshed once.
+"""
+
+import json
+import os
+import re
+from collections import OrderedDict, namedtuple
+
+import FreeCAD
+
+import exportplus_check
+import exportplus_export
+import exportplus_mesh
+import exportplus_selection
+import exportplus_settings
+
+
+ExportProfile = namedtuple("ExportProfile", ["name", "format", "scale", "settings", "suffix"])
+ExportProfile.__new__.__defaults__ = (None, None, "")
+
+# Settings a profile may carry; scale factors are covered by "scale"
+PROFILE_SETTINGS = tuple(
+    name for name in exportplus_settings.PARAMETERS
+    if name.startswith(("Mesh", "Projection", "Output")) or name == "VerifyExports"
+)
+
+
+def _params():
+    return FreeCAD.ParamGet(exportplus_settings.PARAM_PATH)
+
+
+def from_dict(values):
+    """Build an ExportProfile from its JSON form, validating format and settings"""
+    format_name = values["format"].upper()
+    if format_name not in exportplus_export.EXPORT_FUNCTIONS:
+        raise ValueError(f"Unknown format '{format_name}' in profile '{values['name']}'")
+    settings = dict(values.get("settings") or {})
+    unknown = [name for name in settings if name not in PROFILE_SETTINGS]
+    if unknown:
+        raise ValueError(f"Unknown settings in profile '{values['name']}': {', '.join(unknown)}")
+    scale = values.get("scale")
+    return ExportProfile(
+        values["name"],
+        format_name,
+        float(scale) if scale is not None else None,
+        settings,
+        values.get("suffix") or "",
+    )
+
+
+def to_dict(profile):
+    return {
+        "name": profile.name,
+        "format": profile.format,
+        "scale": profile.scale,
+        "settings": dict(profile.settings or {}),
+        "suffix": profile.suffix,
+    }
+
+
+def load_profiles():
+    """Return the stored profiles by name"""
+    text = exportplus_settings.current().ExportProfiles
+    profiles = OrderedDict()
+    if not text.strip():
+        return profiles
+    try:
+        entries = json.loads(text)
+    except ValueError as e:
+        FreeCAD.Console.PrintError(f"ExportPlus: Export profiles are not valid JSON: {e}\n")
+        return profiles
+    for entry in entries:
+        try:
+            profile = from_dict(entry)
+        except (KeyError, ValueError, TypeError) as e:
+            FreeCAD.Console.PrintWarning(f"ExportPlus: Skipping export profile: {e}\n")
+            continue
+        profiles[profile.name] = profile
+    return profiles
+
+
+def save_profiles(profiles):
+    """Store profiles (an iterable of ExportProfile) in the preferences"""
+    _params().SetString("ExportProfiles", json.dumps([to_dict(p) for p in profiles], indent=1))
+    exportplus_settings.invalidate()
+
+
+def add_profile(profile):
+    """Store profile, replacing a stored profile of the same name"""
+    profiles = load_profiles()
+    profiles[profile.name] = profile
+    save_profiles(profiles.values())
+
+
+def remove_profile(name):
+    profiles = load_profiles()
+    if profiles.pop(name, None) is not None:
+        save_profiles(profiles.values())
+
+
+def profile_from_current(name, format_name, suffix=""):
+    """Capture the current preferences for format_name as a profile"""
+    settings = exportplus_settings.current()
+    values = {key: settings[key] for key in PROFILE_SETTINGS}
+    return ExportProfile(name, format_name.upper(), settings.scaling_factor(format_name), values, suffix)
+
+
+def profile_settings(profile, base=None):
+    """Return the Settings to export profile with"""
+    base = base or exportplus_settings.current()
+    return base.override(**(profile.settings or {}))
+
+
+def profile_scale(profile, settings):
+    if profile.scale is not None:
+        return profile.scale
+    return settings.scaling_factor(profile.format)
+
+
+def _safe_name(name):
+    return re.sub(r"[^\w.-]+", "_", name).strip("_") or "profile"
+
+
+def output_path(folder, stem, profile):
+    """Return the output path of profile for a batch: <folder>/<stem><suffix><ext>"""
+    suffix = profile.suffix or f"_{_safe_name(profile.name)}"
+    return os.path.join(folder, stem + suffix + exportplus_export.FORMAT_EXTENSIONS[profile.format])
+
+
+def export_profile(path, objects, profile):
+    """Export objects to path with the format, scale and settings of profile"""
+    settings = profile_settings(profile)
+    with exportplus_settings.using(settings):
+        resolved = exportplus_selection.resolve_selection(objects, profile.format)
+        if not resolved:
+            raise ValueError(f"No exportable objects for profile '{profile.name}'")
+        exportplus_export.export_with_scaling(
+            path,
+            resolved,
+            profile.format,
+            exportplus_export.EXPORT_FUNCTIONS[profile.format],
+            scale_factor=profile_scale(profile, settings),
+        )
+
+
+def _geometry_key(profile, settings):
+    """Profiles with equal keys produce the same scaled geometry and tessellation"""
+    linear, angular = exportplus_mesh.get_tessellation()
+    return (profile_scale(profile, settings), linear, angular)
+
+
+def run_profiles(objects, profiles, folder, stem):
+    """
+    Export objects with several profiles in one batch
+
+    Parameters:
+    - objects: Objects to export
+    - profiles: ExportProfile list
+    - folder: Output folder
+    - stem: File name stem, each profile adds its suffix and extension
+
+    Returns a list of (profile, path, error) tuples, error is None on success.
+    """
+    groups = OrderedDict()
+    for profile in profiles:
+        settings = profile_settings(profile)
+        with exportplus_settings.using(settings):
+            groups.setdefault(_geometry_key(profile, settings), []).append(profile)
+
+    exportplus_check.check_batch(objects)
+
+    # Share tessellations between profiles of a group, unless a cache is already active
+    own_cache = exportplus_mesh.tessellation_cache() is None
+    if own_cache:
+        exportplus_mesh.enable_tessellation_cache()
+
+    results = []
+    try:
+        for group in groups.values():
+            for profile in group:
+                path = output_path(folder, stem, profile)
+                try:
+                    export_profile(path, objects, profile)
+                    results.append((profile, path, None))
+                except Exception as e:
+                    FreeCAD.Console.PrintError(f"ExportPlus: Profile '{profile.name}' failed: {e}\n")
+                    results.append((profile, path, str(e)))
+    finally:
+        if own_cache:
+            exportplus_mesh.disable_tessellation_cache()
+
+    done = sum(1 for _, _, error in results if error is None)
+    FreeCAD.Console.PrintMessage(
+        f"ExportPlus: Exported {done} of {len(results)} profile(s) to {folder}\n"
+    )
+    return results
@@ -0,0 +1,336 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2026 ExportPlus Workbench                               *
+# *                                                                         *
+# *   This file is part of the ExportPlus FreeCAD Workbench.                *
+# *                                                                         *
+# *   ExportPlus is free software: you can redistribute it and/or modify    *
+# *   it under the terms of the GNU Lesser General Public License as        *
+# *   published by the Free Software Foundation, either version 2.1 of the  *
+# *   License, or (at your option) any later version.                       *
+# *                                                                         *
+# *   ExportPlus is distributed in the hope that it will be useful, but     *
+# *   WITHOUT ANY WARRANTY; without even the implied warranty of            *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU      *
+# *   Lesser General Public License for more details.                       *
+# *                                                                         *
+# *   You should have received a copy of the GNU Lesser General Public      *
+# *   License along with ExportPlus. If not, see                            *
+# *   <https://www.gnu.org/licenses/>.                                      *
+# *                                                                         *
+# ***************************************************************************
+
+"""Hidden-line projection stage for the 2D export formats (DXF, SVG, PDF)
+
+3D bodies are projected with hidden-line removal before being handed to
+the 2D writers. Every (shape, view) pair is an independent job, so the
+views of a multi-view sheet - or the objects of a large selection - are
+projected concurrently in a worker pool. Results are cached by shape
+digest and view direction, so re-exports and repeated views skip the
+HLR work entirely.
+"""
+
+from collections import namedtuple
+from contextlib import contextmanager
+
+import FreeCAD
+import Part
+
+import exportplus_cache
+import exportplus_fingerprint
+import exportplus_history
+import exportplus_parallel
+import exportplus_settings
+
+
+# Projection directions (view normal pointing towards the viewer)
+VIEW_DIRECTIONS = {
+    "Top": (0.0, 0.0, 1.0),
+    "Bottom": (0.0, 0.0, -1.0),
+    "Front": (0.0, -1.0, 0.0),
+    "Rear": (0.0, 1.0, 0.0),
+    "Right": (1.0, 0.0, 0.0),
+    "Side": (1.0, 0.0, 0.0),
+    "Left": (-1.0, 0.0, 0.0),
+    "Iso": (1.0, -1.0, 1.0),
+}
+
+# Gap between views on a multi-view sheet, relative to the largest view
+VIEW_GAP = 0.1
+
+ProjectedView = namedtuple("ProjectedView", ["name", "visible", "hidden"])
+
+_projection_cache = exportplus_cache.ResultCache(max_entries=256)
+
+
+def is_enabled():
+    """Return True if 3D bodies should be projected for 2D exports"""
+    return exportplus_settings.current().ProjectionEnabled
+
+
+def get_views():
+    """Return the configured list of view names (e.g. ["Top", "Front"])"""
+    names = exportplus_settings.current().ProjectionViews
+    views = []
+    for name in names.replace(";", ",").split(","):
+        name = name.strip().capitalize()
+        if not name:
+            continue
+        if name in VIEW_DIRECTIONS:
+            views.append(name)
+        else:
+            FreeCAD.Console.PrintWarning(f"ExportPlus: Unknown projection view '{name}' ignored\n")
+    return views or ["Top"]
+
+
+def needs_projection(obj):
+    """Return True if obj is a 3D body rather than flat 2D geometry"""
+    shape = getattr(obj, "Shape", None)
+    if shape is None or shape.isNull() or not shape.Faces:
+        return False
+    # Flat geometry lying in the XY plane is exported as-is
+    return shape.BoundBox.ZLength > 1e-7
+
+
+def _projector():
+    """Return the module providing projectEx (TechDraw, or Drawing on old versions)"""
+    try:
+        import TechDraw
+        return TechDraw
+    except ImportError:
+        import Drawing
+        return Drawing
+
+
+def _compound_brep(shapes):
+    shapes = [s for s in shapes if s is not None and not s.isNull() and s.Edges]
+    if not shapes:
+        return ""
+    return Part.makeCompound(shapes).exportBrepToString()
+
+
+def _project_worker(task):
+    """Run HLR for one (shape, direction) job - executed in a worker"""
+    brep, direction, include_hidden = task
+    shape = exportplus_cache.shape_from_brep(brep)
+    # projectEx returns visible groups (hard, smooth, seam, outline, iso)
+    # followed by the same five groups for hidden edges
+    groups = _projector().projectEx(shape, FreeCAD.Vector(*direction))
+    visible = _compound_brep(groups[:5])
+    hidden = _compound_brep(groups[5:]) if include_hidden else ""
+    return visible, hidden
+
+
+def _to_shape(brep):
+    if not brep:
+        return None
+    return exportplus_cache.shape_from_brep(brep)
+
+
+def _combine(shapes):
+    shapes = [s for s in shapes if s is not None]
+    if not shapes:
+        return None
+    if len(shapes) == 1:
+        return shapes[0]
+    return Part.makeCompound(shapes)
+
+
+def _layout(views):
+    """Arrange views left to right, keeping the first view in place"""
+    if len(views) < 2:
+        return views
+
+    def bounds(view):
+        box = FreeCAD.BoundBox()
+        for shape in (view.visible, view.hidden):
+            if shape is not None:
+                box.add(shape.BoundBox)
+        return box
+
+    boxes = [bounds(view) for view in views]
+    valid = [box for box in boxes if box.isValid()]
+    if not valid:
+        return views
+    gap = VIEW_GAP * max(max(box.XLength, box.YLength) for box in valid)
+    x = valid[0].XMin
+    y = valid[0].YMin
+
+    placed = []
+    for view, box in zip(views, boxes):
+        if not box.isValid():
+            placed.append(view)
+            continue
+        offset = FreeCAD.Vector(x - box.XMin, y - box.YMin, 0)
+        shapes = []
+        for shape in (view.visible, view.hidden):
+            if shape is not None:
+                shape = shape.copy()
+                shape.translate(offset)
+            shapes.append(shape)
+        placed.append(ProjectedView(view.name, shapes[0], shapes[1]))
+        x += box.XLength + gap
+    return placed
+
+
+def project_objects(objects, views=None, split=None, include_hidden=None):
+    """
+    Project 3D objects for a 2D export
+
+    Parameters:
+    - objects: Objects with a Shape to project
+    - views: View names from VIEW_DIRECTIONS (defaults to ProjectionViews)
+    - split: "view" projects the whole selection once per view, "object"
+      projects every object separately (defaults to ProjectionSplit)
+    - include_hidden: Also return hidden edges (defaults to ProjectionHiddenLines)
+
+    Returns a list of ProjectedView, laid out side by side on one sheet.
+    """
+    settings = exportplus_settings.current()
+    if views is None:
+        views = get_views()
+    if split is None:
+        split = settings.ProjectionSplit.lower()
+    if include_hidden is None:
+        include_hidden = settings.ProjectionHiddenLines
+    _projection_cache.max_bytes = settings.ProjectionCacheMB * 1024 * 1024
+
+    shapes = [obj.Shape for obj in objects if hasattr(obj, "Shape") and not obj.Shape.isNull()]
+    if not shapes:
+        return []
+    if split == "object":
+        groups = shapes
+    else:
+        groups = [shapes[0] if len(shapes) == 1 else Part.makeCompound(shapes)]
+
+    # results[(group, view)] = (visible_brep, hidden_brep)
+    results = {}
+    tasks = []
+    task_keys = []
+    for group_index, shape in enumerate(groups):
+        fingerprint = exportplus_fingerprint.shape_fingerprint(shape)
+        brep = None
+        for view in views:
+            direction = VIEW_DIRECTIONS[view]
+            cache_key = (fingerprint, direction, include_hidden)
+            cached = _projection_cache.get(cache_key)
+            if cached is not None:
+                results[(group_index, view)] = cached
+            else:
+                if brep is None:
+                    brep = exportplus_cache.shape_to_brep(shape)
+                tasks.append((brep, direction, include_hidden))
+                task_keys.append(((group_index, view), cache_key))
+
+    FreeCAD.Console.PrintLog(
+        f"ExportPlus: Projecting {len(tasks)} view(s), "
+        f"{len(results)} taken from cache\n"
+    )
+
+    with exportplus_history.stage("project"):
+        task_results = exportplus_parallel.map_parallel(_project_worker, tasks)
+    for (result_key, cache_key), result in zip(task_keys, task_results):
+        results[result_key] = result
+        _projection_cache.put(cache_key, result, size=len(result[0]) + len(result[1]))
+
+    projected = []
+    for view in views:
+        visible = _combine([_to_shape(results[(i, view)][0]) for i in range(len(groups))])
+        hidden = _combine([_to_shape(results[(i, view)][1]) for i in range(len(groups))])
+        projected.append(ProjectedView(view, visible, hidden))
+    return _layout(projected)
+
+
+@contextmanager
+def projected_objects(objects):
+    """
+    Context manager replacing 3D bodies by temporary projected features
+
+    Flat objects are passed through unchanged. The temporary features are
+    removed from the document on exit.
+    """
+    objects = list(objects)
+    bodies = [obj for obj in objects if needs_projection(obj)] if is_enabled() else []
+    if not bodies:
+        yield objects
+        return
+
+    others = [obj for obj in objects if not any(obj is body for body in bodies)]
+    doc = bodies[0].Document
+    temp_objs = []
+    try:
+        for view in project_objects(bodies):
+            for suffix, shape in (("", view.visible), ("Hidden", view.hidden)):
+                if shape is None:
+                    continue
+                temp_obj = doc.addObject("Part::Feature", "TempProjected")
+                temp_obj.Label = f"{view.name}{suffix}"
+                temp_obj.Shape = shape
+                temp_objs.append(temp_obj)
+        yield others + temp_objs
+    finally:
+        for obj in temp_objs:
+            try:
+                doc.removeObject(obj.Name)
+            except:
+                pass  # Object might already be deleted
+
+
+def write_pdf(path, views, margin=10.0):
+    """
+    Draw projected views into a single-page PDF
+
+    Drawing units map to millimeters on paper (one unit per mm); sheets that
+    would exceed the maximum PDF page size are scaled down to fit. Needs
+    the FreeCAD GUI (QPdfWriter); raises RuntimeError without it.
+    """
+    if not FreeCAD.GuiUp:
+        raise RuntimeError("Drawing a PDF needs the FreeCAD GUI, it is not available headless")
+    from PySide import QtCore, QtGui
+
+    box = FreeCAD.BoundBox()
+    for view in views:
+        for shape in (view.visible, view.hidden):
+            if shape is not None:
+                box.add(shape.BoundBox)
+    if not box.isValid():
+        return False
+
+    max_page = 5000.0  # mm, just under the 200 inch PDF page limit
+    fit = min(1.0, (max_page - 2 * margin) / max(box.XLength, box.YLength, 1e-9))
+    width = box.XLength * fit + 2 * margin
+    height = box.YLength * fit + 2 * margin
+
+    writer = QtGui.QPdfWriter(path)
+    writer.setResolution(600)
+    writer.setPageSize(QtGui.QPageSize(QtCore.QSizeF(width, height), QtGui.QPageSize.Millimeter))
+    writer.setPageMargins(QtCore.QMarginsF(0, 0, 0, 0))
+    px = writer.resolution() / 25.4
+    deflection = max(box.DiagonalLength * 1e-4, 1e-3)
+
+    def to_point(v):
+        return QtCore.QPointF(
+            ((v.x - box.XMin) * fit + margin) * px,
+            ((box.YMax - v.y) * fit + margin) * px,
+        )
+
+    visible_pen = QtGui.QPen(QtCore.Qt.black)
+    visible_pen.setWidthF(0.35 * px)
+    hidden_pen = QtGui.QPen(QtCore.Qt.darkGray)
+    hidden_pen.setWidthF(0.18 * px)
+    hidden_pen.setStyle(QtCore.Qt.DashLine)
+
+    painter = QtGui.QPainter(writer)
+    try:
+        for view in views:
+            for pen, shape in ((hidden_pen, view.hidden), (visible_pen, view.visible)):
+                if shape is None:
+                    continue
+                painter.setPen(pen)
+                for edge in shape.Edges:
+                    points = edge.discretize(Deflection=deflection)
+                    painter.drawPolyline(QtGui.QPolygonF([to_point(p) for p in points]))
+    finally:
+        painter.end()
+    return True
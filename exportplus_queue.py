@@ -0,0 +1,457 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2026 ExportPlus Workbench                               *
+# *                                                                         *
+# *   This file is part of the ExportPlus FreeCAD Workbench.                *
+# *                                                                         *
+# *   ExportPlus is free software: you can redistribute it and/or modify    *
+# *   it under the terms of the GNU Lesser General Public License as        *
+# *   published by the Free Software Foundation, either version 2.1 of the  *
+# *   License, or (at your option) any later version.                       *
+# *                                                                         *
+# *   ExportPlus is distributed in the hope that it will be useful, but     *
+# *   WITHOUT ANY WARRANTY; without even the implied warranty of            *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU      *
+# *   Lesser General Public License for more details.                       *
+# *                                                                         *
+# *   You should have received a copy of the GNU Lesser General Public      *
+# *   License along with ExportPlus. If not, see                            *
+# *   <https://www.gnu.org/licenses/>.                                      *
+# *                                                                         *
+# ***************************************************************************
+
+"""Job queue for distributing batch exports across machines
+
+Jobs are the same dicts the export daemon accepts (document, objects,
+formats, scale, output). They are stored either as lease files in a
+shared directory, or in a local SQLite database as a single-machine
+stand-in. Any number of workers - on any node that sees the directory -
+claim jobs, run them, and report results; a worker that dies simply lets
+its lease expire and the job is re-queued for someone else.
+
+Submitting (plain Python, FreeCAD not required):
+
+    import exportplus_queue
+    queue = exportplus_queue.open_queue("/shared/export-queue")
+    exportplus_queue.submit_batch(queue, glob.glob("/parts/*.FCStd"), ["STEP", "STL"], output="/exports")
+
+Working (one per core and node):
+
+    FreeCADCmd -c "import exportplus_queue; exportplus_queue.run_worker(exportplus_queue.open_queue('/shared/export-queue'))"
+
+Leases are compared against each node's wall clock, so the nodes'
+clocks must be kept in sync (NTP). Jobs are delivered at least once.
+"""
+
+import itertools
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+
+
+DEFAULT_LEASE_SECONDS = 600
+DEFAULT_MAX_ATTEMPTS = 3
+
+# Seconds after which a file grabbed by a worker that died is put back
+CLAIM_TIMEOUT = 60
+
+STATES = ("pending", "leased", "done", "failed")
+
+# Keeps ids of jobs submitted within the same millisecond in submission order
+_sequence = itertools.count()
+
+
+def _new_record(job, max_attempts):
+    now = time.time()
+    return {
+        "id": f"{int(now * 1000):013d}-{next(_sequence) % 1000000:06d}-{uuid.uuid4().hex[:8]}",
+        "job": job,
+        "state": "pending",
+        "attempts": 0,
+        "max_attempts": max_attempts,
+        "worker": None,
+        "lease_until": 0.0,
+        "error": None,
+        "result": None,
+        "created": now,
+        "updated": now,
+    }
+
+
+class FileJobQueue:
+    """Job queue kept as JSON lease files in a (shared) directory
+
+    A job moves between the pending/, leased/, done/ and failed/
+    subdirectories. Every change first renames the job's file to a name
+    private to the caller (an atomic step exactly one worker wins), rewrites
+    it there and renames it to its new place, so a record is never visible
+    half updated and only the worker holding the lease can change it.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        for state in STATES:
+            os.makedirs(os.path.join(directory, state), exist_ok=True)
+
+    def _path(self, state, job_id):
+        return os.path.join(self.directory, state, f"{job_id}.json")
+
+    def _write(self, path, record):
+        record["updated"] = time.time()
+        temp_path = f"{path}.{socket.gethostname()}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(record, f)
+        os.replace(temp_path, path)
+
+    @staticmethod
+    def _read(path):
+        with open(path) as f:
+            return json.load(f)
+
+    def _grab(self, state, job_id):
+        """Rename a job's file to a name private to this call; returns that path, or None if it is gone"""
+        private_path = os.path.join(
+            self.directory, "leased", f".{job_id}.{int(time.time())}.{uuid.uuid4().hex[:8]}.claim"
+        )
+        try:
+            os.rename(self._path(state, job_id), private_path)
+        except (FileNotFoundError, PermissionError):
+            return None  # Moved by another worker
+        return private_path
+
+    def _release(self, private_path, record, state):
+        """Write record to a grabbed file and rename it into place under state/"""
+        record["state"] = state
+        self._write(private_path, record)
+        os.replace(private_path, self._path(state, record["id"]))
+
+    def _grab_owned(self, record):
+        """Grab a leased job if it is still held by record's worker and attempt"""
+        private_path = self._grab("leased", record["id"])
+        if private_path is None:
+            return None
+        current = self._read(private_path)
+        if current["worker"] != record["worker"] or current["attempts"] != record["attempts"]:
+            os.rename(private_path, self._path("leased", record["id"]))
+            return None
+        return private_path
+
+    def submit(self, job, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        record = _new_record(job, max_attempts)
+        self._write(self._path("pending", record["id"]), record)
+        return record["id"]
+
+    def claim(self, worker_id, lease_seconds=DEFAULT_LEASE_SECONDS):
+        self.requeue_stale()
+        pending = os.path.join(self.directory, "pending")
+        for name in sorted(os.listdir(pending)):
+            if not name.endswith(".json"):
+                continue
+            private_path = self._grab("pending", name[:-len(".json")])
+            if private_path is None:
+                continue  # Claimed by another worker
+            record = self._read(private_path)
+            record.update(
+                worker=worker_id,
+                attempts=record["attempts"] + 1,
+                lease_until=time.time() + lease_seconds,
+            )
+            # The record only shows up in leased/ with its lease already set
+            self._release(private_path, record, "leased")
+            return record
+        return None
+
+    def renew(self, record, lease_seconds=DEFAULT_LEASE_SECONDS):
+        private_path = self._grab_owned(record)
+        if private_path is None:
+            return False
+        record["lease_until"] = time.time() + lease_seconds
+        self._release(private_path, record, "leased")
+        return True
+
+    def complete(self, record, result):
+        private_path = self._grab_owned(record)
+        if private_path is None:
+            return False
+        record.update(result=result, error=None, lease_until=0.0)
+        self._release(private_path, record, "done")
+        return True
+
+    def fail(self, record, error):
+        private_path = self._grab_owned(record)
+        if private_path is None:
+            return False
+        record.update(error=error, lease_until=0.0)
+        self._release(private_path, record, "pending" if record["attempts"] < record["max_attempts"] else "failed")
+        return True
+
+    def requeue_stale(self):
+        """Move jobs whose lease has expired back to pending"""
+        now = time.time()
+        leased = os.path.join(self.directory, "leased")
+        requeued = 0
+        for name in os.listdir(leased):
+            if name.endswith(".claim"):
+                # Left behind by a worker that died between its two renames
+                job_id, grabbed = name[1:].split(".")[:2]
+                if int(grabbed) + CLAIM_TIMEOUT < now:
+                    try:
+                        os.rename(os.path.join(leased, name), self._path("leased", job_id))
+                    except FileNotFoundError:
+                        pass
+                continue
+            if not name.endswith(".json"):
+                continue
+            try:
+                record = self._read(os.path.join(leased, name))
+            except (FileNotFoundError, ValueError):
+                continue  # Being moved right now
+            if record["lease_until"] >= now:
+                continue
+            private_path = self._grab("leased", record["id"])
+            if private_path is None:
+                continue
+            record = self._read(private_path)
+            if record["lease_until"] >= now:
+                # Renewed since it was read
+                os.rename(private_path, self._path("leased", record["id"]))
+                continue
+            record["error"] = f"Lease of {record['worker']} expired"
+            self._release(private_path, record, "pending" if record["attempts"] < record["max_attempts"] else "failed")
+            requeued += 1
+        return requeued
+
+    def counts(self):
+        return {
+            state: sum(1 for name in os.listdir(os.path.join(self.directory, state)) if name.endswith(".json"))
+            for state in STATES
+        }
+
+    def records(self, state):
+        folder = os.path.join(self.directory, state)
+        for name in sorted(os.listdir(folder)):
+            if name.endswith(".json"):
+                try:
+                    yield self._read(os.path.join(folder, name))
+                except (FileNotFoundError, ValueError):
+                    continue
+
+
+class SQLiteJobQueue:
+    """Job queue kept in a local SQLite database (single machine stand-in)"""
+
+    def __init__(self, path):
+        self.path = path
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " id TEXT PRIMARY KEY, job TEXT, state TEXT, attempts INTEGER,"
+                " max_attempts INTEGER, worker TEXT, lease_until REAL, error TEXT,"
+                " result TEXT, created REAL, updated REAL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, id)")
+
+    def _connect(self):
+        # One connection per call keeps the queue usable from heartbeat threads
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @staticmethod
+    def _record(row):
+        record = dict(row)
+        record["job"] = json.loads(record["job"])
+        record["result"] = json.loads(record["result"]) if record["result"] else None
+        return record
+
+    def submit(self, job, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        record = _new_record(job, max_attempts)
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs VALUES (?, ?, 'pending', 0, ?, NULL, 0, NULL, NULL, ?, ?)",
+                (record["id"], json.dumps(job), max_attempts, record["created"], record["updated"]),
+            )
+        return record["id"]
+
+    def claim(self, worker_id, lease_seconds=DEFAULT_LEASE_SECONDS):
+        self.requeue_stale()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE state = 'pending' ORDER BY id LIMIT 1"
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            now = time.time()
+            conn.execute(
+                "UPDATE jobs SET state = 'leased', worker = ?, attempts = attempts + 1,"
+                " lease_until = ?, updated = ? WHERE id = ?",
+                (worker_id, now + lease_seconds, now, row["id"]),
+            )
+            record = self._record(conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone())
+            conn.execute("COMMIT")
+            return record
+        except:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def _update(self, record, sql, params):
+        with self._connect() as conn:
+            cursor = conn.execute(
+                sql + " WHERE id = ? AND state = 'leased' AND worker = ? AND attempts = ?",
+                params + (record["id"], record["worker"], record["attempts"]),
+            )
+            return cursor.rowcount == 1
+
+    def renew(self, record, lease_seconds=DEFAULT_LEASE_SECONDS):
+        now = time.time()
+        return self._update(record, "UPDATE jobs SET lease_until = ?, updated = ?", (now + lease_seconds, now))
+
+    def complete(self, record, result):
+        return self._update(
+            record,
+            "UPDATE jobs SET state = 'done', result = ?, error = NULL, lease_until = 0, updated = ?",
+            (json.dumps(result), time.time()),
+        )
+
+    def fail(self, record, error):
+        state = "pending" if record["attempts"] < record["max_attempts"] else "failed"
+        return self._update(
+            record,
+            "UPDATE jobs SET state = ?, error = ?, lease_until = 0, updated = ?",
+            (state, error, time.time()),
+        )
+
+    def requeue_stale(self):
+        now = time.time()
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET error = 'Lease of ' || worker || ' expired', updated = ?,"
+                " state = CASE WHEN attempts < max_attempts THEN 'pending' ELSE 'failed' END"
+                " WHERE state = 'leased' AND lease_until < ?",
+                (now, now),
+            )
+            return cursor.rowcount
+
+    def counts(self):
+        counts = dict.fromkeys(STATES, 0)
+        with self._connect() as conn:
+            for row in conn.execute("SELECT state, COUNT(*) AS n FROM jobs GROUP BY state"):
+                counts[row["state"]] = row["n"]
+        return counts
+
+    def records(self, state):
+        with self._connect() as conn:
+            rows = conn.execute("SELECT * FROM jobs WHERE state = ? ORDER BY id", (state,)).fetchall()
+        return [self._record(row) for row in rows]
+
+
+def open_queue(location):
+    """Open a queue: a .sqlite/.db file gives SQLiteJobQueue, anything else a FileJobQueue directory"""
+    if os.path.splitext(location)[1].lower() in (".sqlite", ".sqlite3", ".db"):
+        return SQLiteJobQueue(location)
+    return FileJobQueue(location)
+
+
+def submit_batch(queue, documents, formats, output=None, scale=None, objects=None,
+                 max_attempts=DEFAULT_MAX_ATTEMPTS):
+    """Submit one job per document and return the job ids"""
+    job_ids = []
+    for document in documents:
+        job = {"document": os.path.abspath(document), "formats": list(formats)}
+        if output:
+            job["output"] = output
+        if scale is not None:
+            job["scale"] = scale
+        if objects:
+            job["objects"] = list(objects)
+        job_ids.append(queue.submit(job, max_attempts))
+    return job_ids
+
+
+class _Heartbeat(threading.Thread):
+    """Renews a lease while its job runs"""
+
+    def __init__(self, queue, record, lease_seconds):
+        super(_Heartbeat, self).__init__(name="ExportPlusLease", daemon=True)
+        self.queue = queue
+        self.record = dict(record)
+        self.lease_seconds = lease_seconds
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.lease_seconds / 3.0):
+            try:
+                self.queue.renew(self.record, self.lease_seconds)
+            except (OSError, sqlite3.Error):
+                pass  # Retried on the next beat; the lease may expire meanwhile
+
+
+def run_worker(queue, worker_id=None, lease_seconds=None, poll_interval=5.0,
+               max_jobs=None, stop_when_empty=False):
+    """
+    Claim and run jobs until stopped (runs inside FreeCADCmd)
+
+    Parameters:
+    - queue: Queue from open_queue()
+    - worker_id: Name recorded with each lease (default: host:pid)
+    - lease_seconds: Lease length, renewed while a job runs (default: QueueLeaseSeconds preference)
+    - poll_interval: Seconds to wait when the queue is empty
+    - max_jobs: Stop after this many jobs
+    - stop_when_empty: Stop as soon as no job is pending
+    """
+    import FreeCAD
+    import exportplus_daemon
+    import exportplus_settings
+
+    settings = exportplus_settings.current()
+    if lease_seconds is None:
+        lease_seconds = settings.QueueLeaseSeconds
+    if worker_id is None:
+        worker_id = f"{socket.gethostname()}:{os.getpid()}"
+
+    runner = exportplus_daemon.ExportDaemon(
+        max_documents=settings.DaemonMaxDocuments,
+        tessellation_cache_mb=settings.DaemonTessellationCacheMB,
+    )
+    done = 0
+    FreeCAD.Console.PrintMessage(f"ExportPlus worker {worker_id} started\n")
+    while max_jobs is None or done < max_jobs:
+        record = queue.claim(worker_id, lease_seconds)
+        if record is None:
+            if stop_when_empty:
+                break
+            time.sleep(poll_interval)
+            continue
+
+        heartbeat = _Heartbeat(queue, record, lease_seconds)
+        heartbeat.start()
+        try:
+            result = runner.run_job(record["job"])
+        except Exception as e:
+            # The heartbeat must not hold the lease file while the job is reported
+            heartbeat.stopped.set()
+            heartbeat.join()
+            FreeCAD.Console.PrintError(
+                f"ExportPlus worker: job {record['id']} failed (attempt {record['attempts']}): {e}\n"
+            )
+            queue.fail(record, str(e))
+        else:
+            heartbeat.stopped.set()
+            heartbeat.join()
+            if not queue.complete(record, result):
+                FreeCAD.Console.PrintWarning(
+                    f"ExportPlus worker: lease on job {record['id']} was lost before completion\n"
+                )
+        done += 1
+    FreeCAD.Console.PrintMessage(f"ExportPlus worker {worker_id} stopped after {done} job(s)\n")
+    return done
@@ -0,0 +1,276 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2026 ExportPlus Workbench                               *
+# *                                                                         *
+# *   This file is part of the ExportPlus FreeCAD Workbench.                *
+# *                                                                         *
+# *   ExportPlus is free software: you can redistribute it and/or modify    *
+# *   it under the terms of the GNU Lesser General Public License as        *
+# *   published by the Free Software Foundation, either version 2.1 of the  *
+# *   License, or (at your option) any later version.                       *
+# *                                                                         *
+# *   ExportPlus is distributed in the hope that it will be useful, but     *
+# *   WITHOUT ANY WARRANTY; without even the implied warranty of            *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU      *
+# *   Lesser General Public License for more details.                       *
+# *                                                                         *
+# *   You should have received a copy of the GNU Lesser General Public      *
+# *   License along with ExportPlus. If not, see                            *
+# *   <https://www.gnu.org/licenses/>.                                      *
+# *                                                                         *
+# ***************************************************************************
+
+"""Selection resolver - expand containers to the shapes worth exporting
+
+Selecting a group, Body or App::Part used to either export nothing useful
+or, with recursive selection, pull in sketches, datums and intermediate
+features. The resolver walks containers once and keeps only the final
+shapes: a Body stands for its Tip, groups and parts are replaced by their
+visible top-level features, and every object is returned at most once.
+Shapes inside placed App::Parts are exported in global coordinates
+(see placed_objects).
+"""
+
+import fnmatch
+from contextlib import contextmanager
+
+import FreeCAD
+
+import exportplus_settings
+
+
+# Helper geometry that is never exported when reached through a container
+HELPER_TYPES = (
+    "Sketcher::SketchObject",
+    "Part::Datum",
+    "PartDesign::ShapeBinder",
+    "PartDesign::SubShapeBinder",
+    "App::Origin",
+    "App::OriginFeature",
+)
+
+# Formats whose writers understand App::Part assemblies natively
+ASSEMBLY_FORMATS = ("STEP",)
+
+# Properties that only attach an object to another one, without consuming its shape
+ATTACHMENT_PROPERTIES = ("AttachmentSupport", "Support", "MapMode")
+
+
+def _patterns(value):
+    return [p.strip() for p in value.replace(";", ",").split(",") if p.strip()]
+
+
+def get_filters():
+    """Return the configured (include_types, exclude_types, include_labels, exclude_labels)"""
+    settings = exportplus_settings.current()
+    return (
+        _patterns(settings.SelectionIncludeTypes),
+        _patterns(settings.SelectionExcludeTypes),
+        _patterns(settings.SelectionIncludeLabels),
+        _patterns(settings.SelectionExcludeLabels),
+    )
+
+
+def _is_type(obj, types):
+    return any(obj.isDerivedFrom(t) for t in types)
+
+
+def _matches_type(obj, patterns):
+    """Match TypeId against fnmatch patterns, or exact base class names"""
+    return any(
+        fnmatch.fnmatchcase(obj.TypeId, p) or ("*" not in p and obj.isDerivedFrom(p))
+        for p in patterns
+    )
+
+
+def _matches_label(obj, patterns):
+    return any(fnmatch.fnmatchcase(obj.Label, p) for p in patterns)
+
+
+def _has_shape(obj):
+    shape = getattr(obj, "Shape", None)
+    return shape is not None and not shape.isNull()
+
+
+def _is_visible(obj):
+    visibility = getattr(obj, "Visibility", None)
+    return True if visibility is None else bool(visibility)
+
+
+def _references(value, obj):
+    """True if a link property value (object, list, or (object, subnames) tuples) contains obj"""
+    if isinstance(value, (list, tuple)):
+        return any(_references(item, obj) for item in value)
+    return value is not None and not isinstance(value, str) and value == obj
+
+
+def _consumes(parent, obj):
+    """True if parent links to obj other than through its attachment"""
+    for name in parent.PropertiesList:
+        if name in ATTACHMENT_PROPERTIES:
+            continue
+        if not parent.getTypeIdOfProperty(name).startswith("App::PropertyLink"):
+            continue
+        if _references(getattr(parent, name, None), obj):
+            return True
+    return False
+
+
+def _is_intermediate(obj):
+    """True if another shape-producing feature consumes obj (e.g. the base of a Cut)"""
+    for parent in obj.InList:
+        if parent.isDerivedFrom("App::DocumentObjectGroup") or parent.isDerivedFrom("App::Part"):
+            continue
+        if parent.isDerivedFrom("PartDesign::Body") or _is_type(parent, HELPER_TYPES):
+            continue
+        if _has_shape(parent) and _consumes(parent, obj):
+            return True
+    return False
+
+
+def _is_container(obj):
+    return (
+        obj.isDerivedFrom("App::DocumentObjectGroup")
+        or obj.isDerivedFrom("App::Part")
+        or obj.isDerivedFrom("PartDesign::Body")
+    )
+
+
+def resolve_selection(objects, format_name=None, filters=None, explicit=True):
+    """
+    Expand a selection to the final shapes to export
+
+    Parameters:
+    - objects: Selected objects
+    - format_name: Target format; assemblies are kept whole for formats
+      in ASSEMBLY_FORMATS
+    - filters: (include_types, exclude_types, include_labels, exclude_labels)
+      lists of patterns (defaults to the Selection* preferences)
+    - explicit: The objects were picked by the user. Picked objects are
+      always kept (unless filtered out), so a selected sketch can still be
+      exported to DXF; with explicit=False they are treated like the
+      contents of a container.
+
+    Objects reached through a container must be visible, final shapes.
+    """
+    if not exportplus_settings.current().SmartSelection:
+        return list(objects)
+
+    include_types, exclude_types, include_labels, exclude_labels = filters or get_filters()
+    result = []
+    seen = set()
+
+    def accept(obj):
+        if include_types and not _matches_type(obj, include_types):
+            return
+        if exclude_types and _matches_type(obj, exclude_types):
+            return
+        if include_labels and not _matches_label(obj, include_labels):
+            return
+        if exclude_labels and _matches_label(obj, exclude_labels):
+            return
+        result.append(obj)
+
+    def walk(obj, direct):
+        key = (obj.Document.Name, obj.Name)
+        if key in seen:
+            return
+        seen.add(key)
+
+        if obj.isDerivedFrom("PartDesign::Body"):
+            # The Body's Shape is its Tip, placed with the Body's placement
+            if obj.Tip is not None and _has_shape(obj):
+                accept(obj)
+            return
+
+        if obj.isDerivedFrom("App::Part") and format_name in ASSEMBLY_FORMATS:
+            accept(obj)
+            return
+
+        if _is_container(obj):
+            for child in obj.Group:
+                walk(child, False)
+            return
+
+        if direct:
+            accept(obj)
+            return
+        if _is_type(obj, HELPER_TYPES) or not _has_shape(obj):
+            return
+        if not _is_visible(obj) or _is_intermediate(obj):
+            return
+        accept(obj)
+
+    for obj in objects:
+        walk(obj, explicit)
+
+    if len(result) != len(objects):
+        FreeCAD.Console.PrintLog(
+            f"ExportPlus: Selection of {len(objects)} object(s) resolved to {len(result)}\n"
+        )
+    return result
+
+
+def container_placement(obj):
+    """Return the combined placement of the App::Parts around obj, or None if there is none"""
+    placement = None
+    get_parent = getattr(obj, "getParentGeoFeatureGroup", None)
+    parent = get_parent() if get_parent is not None else None
+    while parent is not None:
+        # Body placements are already part of their shapes
+        if parent.isDerivedFrom("App::Part"):
+            placement = parent.Placement if placement is None else parent.Placement.multiply(placement)
+        parent = parent.getParentGeoFeatureGroup()
+    return None if placement is None or placement.isIdentity() else placement
+
+
+def global_shape(obj):
+    """Return obj.Shape in global coordinates, with the placements of its App::Parts applied"""
+    placement = container_placement(obj)
+    if placement is None:
+        return obj.Shape
+    shape = obj.Shape.copy()
+    shape.Placement = placement.multiply(shape.Placement)
+    return shape
+
+
+@contextmanager
+def placed_objects(objects, format_name=None, object_scales=None):
+    """
+    Context manager replacing the contents of placed App::Parts by
+    temporary features holding their shapes in global coordinates
+
+    Yields (objects, object_scales), the per-object scales renamed to the
+    temporary features. Nothing is replaced for ASSEMBLY_FORMATS, whose
+    writers place the objects themselves. The temporary features are
+    removed from the document on exit.
+    """
+    objects = list(objects)
+    if format_name in ASSEMBLY_FORMATS:
+        yield objects, object_scales
+        return
+
+    result = []
+    scales = dict(object_scales) if object_scales else None
+    temp_objs = []
+    try:
+        for obj in objects:
+            placement = container_placement(obj) if _has_shape(obj) else None
+            if placement is None:
+                result.append(obj)
+                continue
+            temp_obj = obj.Document.addObject("Part::Feature", "TempPlaced")
+            temp_obj.Label = obj.Label
+            temp_obj.Shape = global_shape(obj)
+            temp_objs.append(temp_obj)
+            result.append(temp_obj)
+            if scales and obj.Name in scales:
+                scales[temp_obj.Name] = scales[obj.Name]
+        yield result, scales
+    finally:
+        for obj in temp_objs:
+            try:
+                obj.Document.removeObject(obj.Name)
+            except:
+                pass  # Object might already be deleted
@@ -0,0 +1,317 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2026 ExportPlus Workbench                               *
+# *                                                                         *
+# *   This file is part of the ExportPlus FreeCAD Workbench.                *
+# *                                                                         *
+# *   ExportPlus is free software: you can redistribute it and/or modify    *
+# *   it under the terms of the GNU Lesser General Public License as        *
+# *   published by the Free Software Foundation, either version 2.1 of the  *
+# *   License, or (at your option) any later version.                       *
+# *                                                                         *
+# *   ExportPlus is distributed in the hope that it will be useful, but     *
+# *   WITHOUT ANY WARRANTY; without even the implied warranty of            *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU      *
+# *   Lesser General Public License for more details.                       *
+# *                                                                         *
+# *   You should have received a copy of the GNU Lesser General Public      *
+# *   License along with ExportPlus. If not, see                            *
+# *   <https://www.gnu.org/licenses/>.                                      *
+# *                                                                         *
+# ***************************************************************************
+
+"""Immutable snapshot of the ExportPlus preferences
+
+Reading the parameter group on every call is slow when a batch export asks
+for the same values thousands of times, and worker processes cannot see
+preferences changed in the GUI but not yet saved. Settings are therefore
+read once into an immutable Settings object, which is rebuilt only when a
+parameter observer reports a change. A snapshot can be overridden per job,
+turned into a plain dict and sent to worker processes.
+"""
+
+import contextlib
+import threading
+from types import MappingProxyType
+
+import FreeCAD
+
+
+PARAM_PATH = "User parameter:BaseApp/Preferences/Mod/ExportPlus"
+MESH_PARAM_PATH = "User parameter:BaseApp/Preferences/Mod/Mesh"
+
+FORMATS = ("STEP", "STL", "OBJ", "DXF", "SVG", "PDF", "PLY", "NPZ")
+
+# Parameter name: (type, default)
+PARAMETERS = {
+    "GlobalScalingFactor": (float, 1.0),
+    **{f"{format_name}ScalingFactor": (float, 0.0) for format_name in FORMATS},
+    # Tessellation
+    "MeshLinearDeflection": (float, 0.0),
+    "MeshAngularDeflection": (float, 28.5),
+    # Mesh budget and split mode
+    "MeshBudgetTriangles": (int, 0),
+    "MeshBudgetBytes": (int, 0),
+    "MeshSplitMode": (str, "none"),
+    "MeshTileSize": (float, 1000.0),
+    "MeshSplitZip": (bool, False),
+    # Point clouds
+    "PointCount": (int, 10000),
+    "PointSeed": (int, 0),
+    # Projection
+    "ProjectionEnabled": (bool, False),
+    "ProjectionViews": (str, "Top"),
+    "ProjectionSplit": (str, "view"),
+    "ProjectionHiddenLines": (bool, False),
+    "ProjectionCacheMB": (int, 256),
+    # Output
+    "OutputCompression": (str, "none"),
+    "OutputBufferKB": (int, 1024),
+    "VerifyExports": (bool, False),
+    # Content-addressed output store
+    "OutputStore": (bool, False),
+    "StorePath": (str, ""),
+    "StoreLinkMode": (str, "auto"),
+    "StoreMaxMB": (int, 4096),
+    "StoreMaxAgeDays": (int, 30),
+    # Tessellate shapes with at least this many faces in parallel (0 = never)
+    "ParallelTessellationFaces": (int, 2000),
+    # Memory-bounded mesh exports (0 = unbounded)
+    "MemoryLimitMB": (int, 0),
+    # Recompute touched dependencies of the exported objects first
+    "RecomputeBeforeExport": (bool, True),
+    # Pre-export shape check
+    "PreCheckMode": (str, "off"),
+    "PreCheckSelfIntersection": (bool, False),
+    # Change detection: full BREP digests instead of cheap fingerprints
+    "FingerprintStrict": (bool, False),
+    # Profiled exports
+    "ProfilerMode": (str, "sampling"),
+    "ProfilerIntervalMs": (int, 5),
+    # Idle-time warmer
+    "WarmerEnabled": (bool, False),
+    "WarmerFormats": (str, ""),
+    "WarmerMemoryMB": (int, 256),
+    "WarmerDelayMs": (int, 1500),
+    # Workers
+    "WorkerCount": (int, 0),
+    "UseProcessWorkers": (bool, True),
+    # Selection
+    "SmartSelection": (bool, True),
+    "SelectionIncludeTypes": (str, ""),
+    "SelectionExcludeTypes": (str, ""),
+    "SelectionIncludeLabels": (str, ""),
+    "SelectionExcludeLabels": (str, ""),
+    # Export profiles (JSON list, see exportplus_profiles)
+    "ExportProfiles": (str, ""),
+    # Export history
+    "HistoryEnabled": (bool, True),
+    "HistoryPath": (str, ""),
+    "HistoryHashOutputs": (bool, True),
+    # Watch mode
+    "WatchDelayMs": (int, 1000),
+    # Export daemon and distributed batch workers
+    "DaemonAddress": (str, "127.0.0.1:47801"),
+    "DaemonMaxDocuments": (int, 8),
+    "DaemonTessellationCacheMB": (int, 512),
+    "QueueLeaseSeconds": (int, 600),
+}
+
+# Values read from other modules' parameter groups: name: (group, parameter, type, default)
+EXTERNAL_PARAMETERS = {
+    "MeshMaxDeviationExport": (MESH_PARAM_PATH, "MaxDeviationExport", float, 0.1),
+}
+
+_GETTERS = {float: "GetFloat", int: "GetInt", bool: "GetBool", str: "GetString"}
+
+_lock = threading.Lock()
+_snapshot = None
+_observer = None
+_local = threading.local()
+
+
+def _kind(name):
+    if name in PARAMETERS:
+        return PARAMETERS[name][0]
+    if name in EXTERNAL_PARAMETERS:
+        return EXTERNAL_PARAMETERS[name][2]
+    raise KeyError(f"Unknown ExportPlus setting '{name}'")
+
+
+_TRUE = ("true", "1", "yes", "on")
+_FALSE = ("false", "0", "no", "off", "")
+
+
+def _coerce(name, value):
+    """Convert value to the type of setting name; strings like "false" are parsed, not cast"""
+    kind = _kind(name)
+    if kind is bool:
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, int) and value in (0, 1):
+            return bool(value)
+        if isinstance(value, str) and value.strip().lower() in _TRUE + _FALSE:
+            return value.strip().lower() in _TRUE
+    elif kind is str:
+        if isinstance(value, str):
+            return value
+    elif not isinstance(value, bool):
+        try:
+            number = float(value) if isinstance(value, str) else value
+            if isinstance(number, (int, float)) and (kind is float or float(number).is_integer()):
+                return kind(number)
+        except ValueError:
+            pass
+    raise ValueError(f"Setting '{name}' expects {kind.__name__}, got {value!r}")
+
+
+class Settings:
+    """Read-only set of ExportPlus preferences, accessed as attributes"""
+
+    __slots__ = ("_values",)
+
+    def __init__(self, values):
+        object.__setattr__(self, "_values", MappingProxyType(dict(values)))
+
+    def __getattr__(self, name):
+        try:
+            return self._values[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Settings are immutable, use override()")
+
+    def __getitem__(self, name):
+        return self._values[name]
+
+    def __eq__(self, other):
+        return isinstance(other, Settings) and dict(self._values) == dict(other._values)
+
+    def __hash__(self):
+        return hash(tuple(sorted(self._values.items())))
+
+    def __reduce__(self):
+        return (Settings, (dict(self._values),))
+
+    def __repr__(self):
+        changed = {k: v for k, v in self._values.items() if v != _default(k)}
+        return f"<Settings {changed}>"
+
+    def get(self, name, default=None):
+        return self._values.get(name, default)
+
+    def to_dict(self):
+        """Return the values as a plain dict (JSON serializable)"""
+        return dict(self._values)
+
+    def override(self, **values):
+        """Return a copy with some values replaced, e.g. override(STLScalingFactor=25.4)"""
+        merged = dict(self._values)
+        for name, value in values.items():
+            merged[name] = _coerce(name, value)
+        return Settings(merged)
+
+    def scaling_factor(self, format_name):
+        """Return the scaling factor for a format, falling back to the global one"""
+        scale = self._values.get(f"{format_name}ScalingFactor", 0.0)
+        if scale == 0.0:
+            scale = self._values["GlobalScalingFactor"]
+        return scale
+
+
+def _default(name):
+    if name in PARAMETERS:
+        return PARAMETERS[name][1]
+    return EXTERNAL_PARAMETERS[name][3]
+
+
+def defaults():
+    """Return Settings holding the default of every parameter"""
+    values = {name: default for name, (_, default) in PARAMETERS.items()}
+    values.update({name: spec[3] for name, spec in EXTERNAL_PARAMETERS.items()})
+    return Settings(values)
+
+
+def from_dict(values):
+    """Build Settings from a (possibly partial) dict, e.g. sent by another process"""
+    return defaults().override(**values)
+
+
+def load():
+    """Read all settings from the parameter groups"""
+    param_grp = FreeCAD.ParamGet(PARAM_PATH)
+    values = {}
+    for name, (kind, default) in PARAMETERS.items():
+        values[name] = getattr(param_grp, _GETTERS[kind])(name, default)
+    for name, (path, parameter, kind, default) in EXTERNAL_PARAMETERS.items():
+        values[name] = getattr(FreeCAD.ParamGet(path), _GETTERS[kind])(parameter, default)
+    return Settings(values)
+
+
+class _ParamObserver:
+    """Drops the cached snapshot whenever a watched parameter changes"""
+
+    def OnChange(self, param_grp, reason):
+        invalidate()
+
+
+def _attach_observer():
+    global _observer
+    if _observer is not None:
+        return
+    _observer = _ParamObserver()
+    paths = {PARAM_PATH} | {spec[0] for spec in EXTERNAL_PARAMETERS.values()}
+    for path in paths:
+        try:
+            FreeCAD.ParamGet(path).Attach(_observer)
+        except (AttributeError, RuntimeError) as e:
+            FreeCAD.Console.PrintLog(f"ExportPlus: Cannot observe {path}: {e}\n")
+
+
+def invalidate():
+    """Forget the cached snapshot; the next current() reads the preferences again"""
+    global _snapshot
+    with _lock:
+        _snapshot = None
+
+
+def current():
+    """Return the active Settings: a job override if one is active, else the preferences"""
+    active = getattr(_local, "settings", None)
+    if active is not None:
+        return active
+    global _snapshot
+    snapshot = _snapshot
+    if snapshot is None:
+        with _lock:
+            _attach_observer()
+            if _snapshot is None:
+                _snapshot = load()
+            snapshot = _snapshot
+    return snapshot
+
+
+@contextlib.contextmanager
+def using(settings):
+    """Make settings the active Settings of the current thread while the block runs"""
+    previous = getattr(_local, "settings", None)
+    _local.settings = settings
+    try:
+        yield settings
+    finally:
+        _local.settings = previous
+
+
+def install(values):
+    """Replace the preferences snapshot of this process - worker initializer"""
+    global _snapshot
+    with _lock:
+        _snapshot = from_dict(values)
+
+
+def call_with(settings, func, item):
+    """Call func(item) with settings active - used to carry settings into workers"""
+    with using(settings):
+        return func(item)
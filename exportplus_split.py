@@ -0,0 +1,224 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2026 ExportPlus Workbench                               *
+# *                                                                         *
+# *   This file is part of the ExportPlus FreeCAD Workbench.                *
+# *                                                                         *
+# *   ExportPlus is free software: you can redistribute it and/or modify    *
+# *   it under the terms of the GNU Lesser General Public License as        *
+# *   published by the Free Software Foundation, either version 2.1 of the  *
+# *   License, or (at your option) any later version.                       *
+# *                                                                         *
+# *   ExportPlus is distributed in the hope that it will be useful, but     *
+# *   WITHOUT ANY WARRANTY; without even the implied warranty of            *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU      *
+# *   Lesser General Public License for more details.                       *
+# *                                                                         *
+# *   You should have received a copy of the GNU Lesser General Public      *
+# *   License along with ExportPlus. If not, see                            *
+# *   <https://www.gnu.org/licenses/>.                                      *
+# *                                                                         *
+# ***************************************************************************
+
+"""Split mode for mesh exports (STL, OBJ)
+
+Instead of one merged file, the selection is written as several chunks:
+one per object, per label family, per material or per spatial tile. The
+chunks are tessellated and written in parallel and described by an index
+file listing every chunk's bounding box, so viewers can stream and load
+only the parts they need. Optionally everything is bundled into one zip.
+"""
+
+import json
+import math
+import os
+import re
+import shutil
+import tempfile
+import zipfile
+
+import FreeCAD
+import Part
+
+import exportplus_cache
+import exportplus_history
+import exportplus_mesh
+import exportplus_output
+import exportplus_parallel
+from exportplus_meshdata import MeshData
+import exportplus_settings
+
+
+SPLIT_MODES = ("none", "object", "label", "material", "tile")
+
+
+def get_split_mode():
+    """Return the configured split mode (one of SPLIT_MODES)"""
+    mode = exportplus_settings.current().MeshSplitMode.lower()
+    if mode not in SPLIT_MODES:
+        FreeCAD.Console.PrintWarning(f"ExportPlus: Unknown split mode '{mode}', not splitting\n")
+        return "none"
+    return mode
+
+
+def is_split_export(format_name):
+    """Return True if exports of format_name are written as several chunk files"""
+    return format_name in exportplus_mesh.MESH_FORMATS and get_split_mode() != "none"
+
+
+def _safe_name(name):
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", name).strip("_") or "chunk"
+
+
+def _label_family(label):
+    """Strip FreeCAD's numeric suffixes, so Bolt, Bolt001 and Bolt002 group together"""
+    return re.sub(r"[\s_.-]*\d+$", "", label) or label
+
+
+def _material_name(obj):
+    material = getattr(obj, "ShapeMaterial", None)
+    name = getattr(material, "Name", "") if material is not None else ""
+    if not name:
+        material = getattr(obj, "Material", None)
+        name = getattr(material, "Label", "") if material is not None else ""
+    return name or "NoMaterial"
+
+
+def _tile_key(point, tile_size):
+    return tuple(int(math.floor(c / tile_size)) for c in (point.x, point.y, point.z))
+
+
+def group_chunks(objs, mode, tile_size=1000.0):
+    """
+    Group the shapes of objs into named chunks
+
+    Returns a dict {chunk name: (shapes, object labels)} in a stable order.
+    """
+    chunks = {}
+
+    def add(key, shape, label):
+        shapes, labels = chunks.setdefault(key, ([], []))
+        shapes.append(shape)
+        if label not in labels:
+            labels.append(label)
+
+    for obj in objs:
+        shape = getattr(obj, "Shape", None)
+        if shape is None or shape.isNull():
+            continue
+        if mode == "object":
+            add(obj.Label, shape, obj.Label)
+        elif mode == "label":
+            add(_label_family(obj.Label), shape, obj.Label)
+        elif mode == "material":
+            add(_material_name(obj), shape, obj.Label)
+        elif mode == "tile":
+            # Faces are assigned to the tile containing their bounding box center
+            for face in shape.Faces:
+                ix, iy, iz = _tile_key(face.BoundBox.Center, tile_size)
+                add(f"tile_{ix}_{iy}_{iz}", face, obj.Label)
+    return chunks
+
+
+def _write_chunk(task):
+    """Tessellate and write one chunk - executed in a worker"""
+    brep, path, linear, angular, budget = task
+    shape = exportplus_cache.shape_from_brep(brep)
+    if budget:
+        data = MeshData.from_mesh(exportplus_mesh.mesh_to_budget(shape, budget, linear, angular))
+    else:
+        data = exportplus_mesh.tessellate_data(shape, linear, angular)
+    with exportplus_output.atomic_output(path) as temp_path:
+        data.write(temp_path, buffer_size=exportplus_output.get_buffer_size())
+    bounds = data.bounds()
+    return data.triangle_count, list(bounds) if bounds is not None else None
+
+
+def export_split(path, objs, format_name):
+    """
+    Write objects as several mesh files plus an index
+
+    For path "plant.stl" the chunks are written as "plant_<chunk>.stl" next
+    to an index "plant.index.json", or bundled in "plant.zip" with an
+    "index.json" entry when MeshSplitZip is enabled.
+    """
+    settings = exportplus_settings.current()
+    mode = get_split_mode()
+    tile_size = settings.MeshTileSize
+    if tile_size <= 0.0:
+        tile_size = 1000.0
+    bundle = settings.MeshSplitZip
+
+    chunks = group_chunks(objs, mode, tile_size)
+    if not chunks:
+        return
+
+    folder, filename = os.path.split(path)
+    stem, ext = os.path.splitext(filename)
+    out_dir = tempfile.mkdtemp(prefix="exportplus_", dir=folder or None) if bundle else folder
+
+    linear, angular = exportplus_mesh.get_tessellation()
+    shapes = [Part.makeCompound(chunk_shapes) for chunk_shapes, _ in chunks.values()]
+    total_budget = exportplus_mesh.get_budget(format_name)
+    budgets = (
+        exportplus_mesh.allocate_budget(shapes, total_budget) if total_budget else [0] * len(shapes)
+    )
+
+    tasks = []
+    entries = []
+    used_names = set()
+    for (name, (_, labels)), shape, budget in zip(chunks.items(), shapes, budgets):
+        safe = _safe_name(name)
+        unique = safe
+        counter = 1
+        while unique in used_names:
+            counter += 1
+            unique = f"{safe}_{counter}"
+        used_names.add(unique)
+        chunk_file = f"{stem}_{unique}{ext}"
+        tasks.append((
+            exportplus_cache.shape_to_brep(shape),
+            os.path.join(out_dir, chunk_file),
+            linear,
+            angular,
+            budget,
+        ))
+        entries.append({"name": name, "file": chunk_file, "objects": labels})
+
+    try:
+        with exportplus_history.stage("chunks"):
+            results = exportplus_parallel.map_parallel(_write_chunk, tasks)
+        for entry, (triangles, bbox) in zip(entries, results):
+            entry["triangles"] = triangles
+            entry["bbox"] = bbox
+
+        index = {
+            "format": format_name,
+            "mode": mode,
+            "chunks": entries,
+        }
+        if mode == "tile":
+            index["tile_size"] = tile_size
+
+        if bundle:
+            zip_path = os.path.join(folder, f"{stem}.zip")
+            with exportplus_output.atomic_output(zip_path) as temp_path:
+                with zipfile.ZipFile(temp_path, "w", zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+                    archive.writestr("index.json", json.dumps(index, indent=2))
+                    for entry in entries:
+                        archive.write(os.path.join(out_dir, entry["file"]), entry["file"])
+            target = zip_path
+        else:
+            index_path = os.path.join(folder, f"{stem}.index.json")
+            with exportplus_output.open_atomic(index_path, "w") as f:
+                json.dump(index, f, indent=2)
+            target = index_path
+    finally:
+        if bundle:
+            shutil.rmtree(out_dir, ignore_errors=True)
+
+    FreeCAD.Console.PrintMessage(
+        f"ExportPlus: Split export wrote {len(entries)} {format_name} chunk(s), index: {target}\n"
+    )
+    return {"triangles": sum(entry["triangles"] for entry in entries)}
@@ -0,0 +1,293 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2026 ExportPlus Workbench                               *
+# *                                                                         *
+# *   This file is part of the ExportPlus FreeCAD Workbench.                *
+# *                                                                         *
+# *   ExportPlus is free software: you can redistribute it and/or modify    *
+# *   it under the terms of the GNU Lesser General Public License as        *
+# *   published by the Free Software Foundation, either version 2.1 of the  *
+# *   License, or (at your option) any later version.                       *
+# *                                                                         *
+# *   ExportPlus is distributed in the hope that it will be useful, but     *
+# *   WITHOUT ANY WARRANTY; without even the implied warranty of            *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU      *
+# *   Lesser General Public License for more details.                       *
+# *                                                                         *
+# *   You should have received a copy of the GNU Lesser General Public      *
+# *   License along with ExportPlus. If not, see                            *
+# *   <https://www.gnu.org/licenses/>.                                      *
+# *                                                                         *
+# ***************************************************************************
+
+
+"""Content-addressed output store - write identical exports only once
+
+With OutputStore enabled, every export is keyed by what determines its
+bytes: the fingerprints and labels of the source objects, the format and
+output suffix, the scale and the writer settings. The first export with a
+key writes the file as usual and adds it to the store; later exports with
+the same key reflink, hardlink or copy the stored file to the requested
+path instead of scaling, meshing and writing again.
+
+The store is pruned by age of last use (StoreMaxAgeDays) and total size
+(StoreMaxMB). Removing a stored file never affects exported copies.
+Hardlinked outputs share their bytes with the store, so they must be
+replaced rather than edited in place - ExportPlus itself always replaces.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+
+import FreeCAD
+
+import exportplus_fingerprint
+import exportplus_settings
+
+
+LINK_MODES = ("auto", "reflink", "hardlink", "copy")
+
+# Settings that do not change the bytes of an export
+NEUTRAL_SETTINGS = (
+    "Daemon", "ExportProfiles", "Fingerprint", "History", "OutputBufferKB", "PreCheck",
+    "Queue", "Store", "OutputStore", "UseProcessWorkers", "VerifyExports", "Warmer",
+    "Watch", "WorkerCount",
+)
+
+# Seconds between two automatic garbage collections
+GC_INTERVAL = 300
+
+# Linux ioctl cloning a file's extents (btrfs, XFS, ...)
+_FICLONE = 0x40049409
+
+_last_gc = 0.0
+
+
+def is_enabled():
+    """Return True if exports go through the output store"""
+    return exportplus_settings.current().OutputStore
+
+
+def get_store_path():
+    """Return the folder of the output store"""
+    path = exportplus_settings.current().StorePath
+    if not path:
+        path = os.path.join(FreeCAD.getUserAppDataDir(), "ExportPlus", "store")
+    return path
+
+
+def get_link_mode():
+    mode = exportplus_settings.current().StoreLinkMode.lower()
+    return mode if mode in LINK_MODES else "auto"
+
+
+def _writer_settings():
+    return {
+        name: value
+        for name, value in sorted(exportplus_settings.current().to_dict().items())
+        if not name.startswith(NEUTRAL_SETTINGS)
+    }
+
+
+def artifact_key(objects, format_name, path, scale_factor, object_scales=None):
+    """
+    Return the store key of an export, or None if it cannot be stored
+
+    Objects without a shape (e.g. TechDraw pages) have no fingerprint, so
+    exports including them bypass the store.
+    """
+    sources = []
+    for obj in objects:
+        shape = getattr(obj, "Shape", None)
+        if shape is None or shape.isNull():
+            return None
+        scale = object_scales.get(obj.Name, scale_factor) if object_scales else scale_factor
+        sources.append((exportplus_fingerprint.object_fingerprint(obj), obj.Label, scale))
+
+    suffix = os.path.basename(path).partition(".")[2].lower()
+    description = {
+        "sources": sources,
+        "format": format_name,
+        "suffix": suffix,
+        "settings": _writer_settings(),
+    }
+    return hashlib.sha256(json.dumps(description, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _entry_paths(key):
+    folder = os.path.join(get_store_path(), key[:2])
+    return os.path.join(folder, key), os.path.join(folder, key + ".json")
+
+
+def _reflink(source, target):
+    import fcntl
+
+    with open(source, "rb") as src, open(target, "wb") as dst:
+        fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+
+
+def _link_methods(mode):
+    methods = {"reflink": _reflink, "hardlink": os.link, "copy": shutil.copyfile}
+    if mode == "auto":
+        return [("reflink", _reflink), ("hardlink", os.link), ("copy", shutil.copyfile)]
+    return [(mode, methods[mode])]
+
+
+def link_file(source, target, mode=None):
+    """
+    Place a copy of source at target, replacing it atomically
+
+    Tries the link mode (or reflink, hardlink and copy in turn for "auto")
+    and returns the method that succeeded.
+    """
+    if mode is None:
+        mode = get_link_mode()
+    folder, filename = os.path.split(target)
+    temp_path = os.path.join(folder or os.curdir, f".{filename}.{uuid.uuid4().hex[:8]}.link")
+    error = None
+    for method, link in _link_methods(mode):
+        try:
+            link(source, temp_path)
+        except (OSError, ImportError) as e:
+            error = e
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            continue
+        try:
+            os.replace(temp_path, target)
+        except OSError:
+            os.remove(temp_path)
+            raise
+        return method
+    raise error
+
+
+def fetch(key, path):
+    """Place the stored artifact for key at path; return its statistics, or None if not stored"""
+    artifact, meta = _entry_paths(key)
+    try:
+        with open(meta, "r", encoding="utf-8") as f:
+            info = json.load(f)
+        if os.path.getsize(artifact) != info["size"]:
+            raise ValueError("size mismatch")
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError) as e:
+        FreeCAD.Console.PrintWarning(f"ExportPlus: Dropping damaged store entry {key}: {e}\n")
+        _remove_entry(key)
+        return None
+
+    try:
+        method = link_file(artifact, path)
+        # The metadata file's time is the last use, for garbage collection
+        os.utime(meta)
+    except OSError as e:
+        # A store problem must not fail an export that can still be written normally
+        FreeCAD.Console.PrintWarning(f"ExportPlus: Cannot use store entry {key}, dropping it: {e}\n")
+        try:
+            _remove_entry(key)
+        except OSError:
+            pass
+        return None
+    FreeCAD.Console.PrintMessage(f"ExportPlus: {path} taken from the output store ({method})\n")
+    return info.get("stats") or {}
+
+
+def put(key, path, stats=None):
+    """Add an exported file to the store (failures are reported, not raised)"""
+    artifact, meta = _entry_paths(key)
+    try:
+        os.makedirs(os.path.dirname(artifact), exist_ok=True)
+        link_file(path, artifact)
+        info = {
+            "size": os.path.getsize(artifact),
+            "stats": {k: v for k, v in (stats or {}).items() if isinstance(v, (int, float, str))},
+            "created": time.time(),
+        }
+        temp_meta = meta + ".tmp"
+        with open(temp_meta, "w", encoding="utf-8") as f:
+            json.dump(info, f)
+        os.replace(temp_meta, meta)
+    except OSError as e:
+        FreeCAD.Console.PrintWarning(f"ExportPlus: Could not add {path} to the output store: {e}\n")
+        return
+    maybe_collect()
+
+
+def _remove_entry(key):
+    for entry in _entry_paths(key):
+        try:
+            os.remove(entry)
+        except FileNotFoundError:
+            pass
+
+
+def collect_garbage(max_mb=None, max_age_days=None):
+    """
+    Remove store entries unused for max_age_days, then the least recently
+    used ones until the store is below max_mb (0 disables either limit)
+
+    Returns (entries removed, bytes freed).
+    """
+    settings = exportplus_settings.current()
+    if max_mb is None:
+        max_mb = settings.StoreMaxMB
+    if max_age_days is None:
+        max_age_days = settings.StoreMaxAgeDays
+
+    entries = []
+    root = get_store_path()
+    if not os.path.isdir(root):
+        return 0, 0
+    for folder in os.listdir(root):
+        folder_path = os.path.join(root, folder)
+        if not os.path.isdir(folder_path):
+            continue
+        for name in os.listdir(folder_path):
+            if not name.endswith(".json"):
+                continue
+            key = name[:-len(".json")]
+            try:
+                used = os.path.getmtime(os.path.join(folder_path, name))
+                size = os.path.getsize(os.path.join(folder_path, key))
+            except OSError:
+                used, size = 0.0, 0
+            entries.append((used, size, key))
+
+    entries.sort()
+    total = sum(size for _, size, _ in entries)
+    cutoff = time.time() - max_age_days * 86400 if max_age_days > 0 else None
+    max_bytes = max_mb * 1024 * 1024
+    removed = freed = 0
+    for used, size, key in entries:
+        expired = cutoff is not None and used < cutoff
+        if not expired and (not max_bytes or total <= max_bytes):
+            break
+        _remove_entry(key)
+        total -= size
+        removed += 1
+        freed += size
+
+    if removed:
+        FreeCAD.Console.PrintLog(
+            f"ExportPlus: Output store removed {removed} entries ({freed // (1024 * 1024)} MB)\n"
+        )
+    return removed, freed
+
+
+def maybe_collect():
+    """Run collect_garbage() at most once every GC_INTERVAL seconds"""
+    global _last_gc
+    now = time.time()
+    if now - _last_gc < GC_INTERVAL:
+        return
+    _last_gc = now
+    try:
+        collect_garbage()
+    except OSError as e:
+        FreeCAD.Console.PrintWarning(f"ExportPlus: Output store cleanup failed: {e}\n")
@@ -0,0 +1,279 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2026 ExportPlus Workbench                               *
+# *                                                                         *
+# *   This file is part of the ExportPlus FreeCAD Workbench.                *
+# *                                                                         *
+# *   ExportPlus is free software: you can redistribute it and/or modify    *
+# *   it under the terms of the GNU Lesser General Public License as        *
+# *   published by the Free Software Foundation, either version 2.1 of the  *
+# *   License, or (at your option) any later version.                       *
+# *                                                                         *
+# *   ExportPlus is distributed in the hope that it will be useful, but     *
+# *   WITHOUT ANY WARRANTY; without even the implied warranty of            *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU      *
+# *   Lesser General Public License for more details.                       *
+# *                                                                         *
+# *   You should have received a copy of the GNU Lesser General Public      *
+# *   License along with ExportPlus. If not, see                            *
+# *   <https://www.gnu.org/licenses/>.                                      *
+# *                                                                         *
+# ***************************************************************************
+
+
+"""Stream output - export to file-like objects instead of paths
+
+export_to_stream() (and export_with_scaling() when given a stream) writes
+an export to any writable binary file object: io.BytesIO, a pipe, a socket
+(or socket.makefile("wb")), or "-" / sys.stdout for command line chaining.
+
+STL, OBJ and PLY are produced incrementally: objects are scaled and meshed
+(or sampled) ahead in the worker pool and each object is written and
+flushed as soon as it is ready, so a consumer can start on the first
+objects while later ones are still being meshed. The triangle count of a
+binary STL comes first in the file, so a non-seekable stream only receives
+an STL once everything is meshed. The other formats, and STL/OBJ in mesh
+budget mode, are written by FreeCAD to a temporary file that is then
+copied to the stream. With OutputCompression "gzip" the stream is gzipped.
+
+When streaming to stdout from FreeCADCmd, keep the report view output off
+stdout, or it ends up inside the export.
+"""
+
+import gzip
+import io
+import math
+import os
+import shutil
+import struct
+import sys
+import tempfile
+
+import FreeCAD
+
+import exportplus_cache
+import exportplus_check
+import exportplus_export
+import exportplus_fingerprint
+import exportplus_history
+import exportplus_mesh
+import exportplus_meshdata
+import exportplus_output
+import exportplus_parallel
+import exportplus_points
+import exportplus_selection
+import exportplus_settings
+
+
+# Formats written object by object
+INCREMENTAL_FORMATS = ("STL", "OBJ", "PLY")
+
+
+def is_stream(target):
+    """Return True if target is a stream (or "-") rather than a file path"""
+    if isinstance(target, (str, bytes, os.PathLike)):
+        return target == "-"
+    return hasattr(target, "write") or hasattr(target, "sendall")
+
+
+def _binary_stream(target):
+    """Return (binary stream, wrapper to close when done or None)"""
+    if target == "-":
+        target = sys.stdout
+    if isinstance(target, io.TextIOBase):
+        buffer = getattr(target, "buffer", None)
+        if buffer is None:
+            raise TypeError("ExportPlus streams must be binary, got a text stream without a buffer")
+        target.flush()
+        return buffer, None
+    if not hasattr(target, "write"):
+        # A socket: write through a buffered file object, leave the socket open
+        wrapper = target.makefile("wb", buffering=exportplus_output.get_buffer_size())
+        return wrapper, wrapper
+    return target, None
+
+
+def _seekable(stream):
+    try:
+        return stream.seekable() and stream.tell() >= 0
+    except (AttributeError, OSError, ValueError):
+        return False
+
+
+def _stream_name(target):
+    if target == "-":
+        return "<stdout>"
+    name = getattr(target, "name", None)
+    return name if isinstance(name, str) else f"<{type(target).__name__}>"
+
+
+def iter_meshes(objects, scale_factor=1.0, object_scales=None):
+    """
+    Yield one MeshData per object with a shape, in order
+
+    Shapes are scaled here and meshed ahead in the worker pool; cached
+    tessellations are used without meshing again.
+    """
+    linear, angular = exportplus_mesh.get_tessellation()
+    cache = exportplus_mesh.tessellation_cache()
+    meshes = []
+    tasks = []
+    for obj in objects:
+        if not hasattr(obj, "Shape") or obj.Shape.isNull():
+            continue
+        shape = obj.Shape.copy()
+        factor = object_scales.get(obj.Name, scale_factor) if object_scales else scale_factor
+        if factor != 1.0:
+            shape.scale(factor)
+        data = None
+        if cache is not None:
+            data = cache.get((exportplus_fingerprint.shape_fingerprint(shape), linear, angular))
+        if data is not None:
+            meshes.append(exportplus_meshdata.MeshData(
+                data.points, data.facets, [(obj.Label, 0, data.triangle_count)]
+            ))
+        else:
+            meshes.append(None)
+            tasks.append((exportplus_cache.shape_to_brep(shape), 1.0, linear, angular, obj.Label))
+
+    computed = exportplus_parallel.imap_parallel(exportplus_mesh.tessellate_brep, tasks)
+    for mesh in meshes:
+        yield mesh if mesh is not None else next(computed)
+
+
+def _write_mesh(out, seekable, objects, format_name, scale_factor, object_scales):
+    meshes = iter_meshes(objects, scale_factor, object_scales)
+    triangles = vertices = 0
+    if format_name == "STL":
+        count = 0
+        if not seekable:
+            # The triangle count leads the file, so everything is meshed first
+            meshes = list(meshes)
+            count = sum(mesh.triangle_count for mesh in meshes)
+        header_position = out.tell() if seekable else None
+        out.write(exportplus_meshdata.STL_HEADER)
+        out.write(struct.pack("<I", count))
+
+    for mesh in meshes:
+        if format_name == "STL":
+            mesh.write_stl_records(out)
+        else:
+            mesh.write_obj(out, vertices)
+        triangles += mesh.triangle_count
+        vertices += mesh.vertex_count
+        out.flush()
+
+    if format_name == "STL" and seekable:
+        end = out.tell()
+        out.seek(header_position + 80)
+        out.write(struct.pack("<I", triangles))
+        out.seek(end)
+    return {"triangles": triangles}
+
+
+def _write_points(out, objects, scale_factor, object_scales):
+    # Objects without a surface are left out before the header fixes the
+    # point count, as export_points does
+    objects = exportplus_points.sampleable(objects)
+    scales = {
+        obj.Name: object_scales.get(obj.Name, scale_factor) if object_scales else scale_factor
+        for obj in objects
+    }
+    count = exportplus_points.get_point_count()
+    out.write(exportplus_points.ply_header(count * len(objects)))
+    for index, (label, points, normals) in enumerate(
+        exportplus_points.iter_samples(objects, count, scales)
+    ):
+        if len(points) != count:
+            raise ValueError(f"{label} has no surface to sample points from")
+        out.write(exportplus_points.ply_records(points, normals, index))
+        out.flush()
+    return {"points": count * len(objects)}
+
+
+def _export_incremental(target, out, seekable, objects, format_name, scale_factor, object_scales):
+    tessellation = None
+    if format_name in exportplus_mesh.MESH_FORMATS:
+        linear, angular = exportplus_mesh.get_tessellation()
+        tessellation = (linear, math.degrees(angular))
+
+    with exportplus_history.ExportRecord(
+        _stream_name(target), objects, format_name, scale_factor, tessellation
+    ) as record:
+        if exportplus_settings.current().RecomputeBeforeExport:
+            with record.stage("recompute"):
+                exportplus_export.recompute_subgraph(objects)
+        if exportplus_check.get_mode() != "off":
+            with record.stage("check"):
+                objects = exportplus_check.precheck(objects)
+
+        with exportplus_selection.placed_objects(objects, format_name, object_scales) as (objects, object_scales):
+            with record.stage("write"):
+                if format_name == "PLY":
+                    record.update(_write_points(out, objects, scale_factor, object_scales))
+                else:
+                    record.update(_write_mesh(out, seekable, objects, format_name, scale_factor, object_scales))
+
+
+def _export_via_file(out, objects, format_name, export_func, scale_factor, object_scales):
+    """Export to a temporary file with export_with_scaling() and copy it to the stream"""
+    folder = tempfile.mkdtemp(prefix="exportplus-")
+    path = os.path.join(folder, "export" + exportplus_export.FORMAT_EXTENSIONS[format_name])
+    # One plain file: compression is applied to the stream, split mode cannot apply
+    settings = exportplus_settings.current().override(OutputCompression="none", MeshSplitMode="none")
+    try:
+        with exportplus_settings.using(settings):
+            exportplus_export.export_with_scaling(
+                path, objects, format_name, export_func, scale_factor, object_scales
+            )
+        with open(path, "rb") as f:
+            shutil.copyfileobj(f, out, exportplus_output.get_buffer_size())
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+def _incremental(format_name):
+    if format_name not in INCREMENTAL_FORMATS:
+        return False
+    # A triangle budget is shared out over the whole selection at once
+    return format_name == "PLY" or not exportplus_mesh.get_budget(format_name)
+
+
+def export_to_stream(target, objects, format_name, export_func=None, scale_factor=None, object_scales=None):
+    """
+    Export objects to a writable binary stream
+
+    Parameters:
+    - target: Binary file object, socket, text stream with a buffer
+      (e.g. sys.stdout) or "-" for stdout
+    - objects: Objects to export
+    - format_name: Format identifier (e.g., "STL", "PLY")
+    - export_func: Writer for formats that are not streamed incrementally
+      (defaults to EXPORT_FUNCTIONS[format_name])
+    - scale_factor, object_scales: As for export_with_scaling()
+
+    The stream is flushed, but not closed.
+    """
+    if scale_factor is None:
+        scale_factor = exportplus_export.get_scaling_factor(format_name)
+    if export_func is None:
+        export_func = exportplus_export.EXPORT_FUNCTIONS[format_name]
+    if exportplus_output.get_compression() == "zip":
+        FreeCAD.Console.PrintWarning("ExportPlus: Streams cannot be zipped, use gzip compression\n")
+
+    stream, wrapper = _binary_stream(target)
+    compressed = exportplus_output.get_compression() == "gzip"
+    seekable = not compressed and _seekable(stream)
+    out = gzip.GzipFile(fileobj=stream, mode="wb") if compressed else stream
+    try:
+        if _incremental(format_name):
+            _export_incremental(target, out, seekable, objects, format_name, scale_factor, object_scales)
+        else:
+            _export_via_file(out, objects, format_name, export_func, scale_factor, object_scales)
+        if compressed:
+            out.close()
+        stream.flush()
+    finally:
+        if wrapper is not None:
+            wrapper.close()
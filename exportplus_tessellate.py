@@ -0,0 +1,174 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2026 ExportPlus Workbench                               *
+# *                                                                         *
+# *   This file is part of the ExportPlus FreeCAD Workbench.                *
+# *                                                                         *
+# *   ExportPlus is free software: you can redistribute it and/or modify    *
+# *   it under the terms of the GNU Lesser General Public License as        *
+# *   published by the Free Software Foundation, either version 2.1 of the  *
+# *   License, or (at your option) any later version.                       *
+# *                                                                         *
+# *   ExportPlus is distributed in the hope that it will be useful, but     *
+# *   WITHOUT ANY WARRANTY; without even the implied warranty of            *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU      *
+# *   Lesser General Public License for more details.                       *
+# *                                                                         *
+# *   You should have received a copy of the GNU Lesser General Public      *
+# *   License along with ExportPlus. If not, see                            *
+# *   <https://www.gnu.org/licenses/>.                                      *
+# *                                                                         *
+# ***************************************************************************
+
+"""Parallel tessellation of a single large shape
+
+Worker pools across objects do not help when one body with thousands of
+faces dominates an export. Such a shape is split into spatially coherent
+batches of faces which are tessellated concurrently and welded back into
+one mesh.
+
+To keep the result watertight every batch is meshed together with a halo
+of the faces adjacent to it. An edge on a batch border then sees the same
+neighbouring faces in both batches and is discretized identically on both
+sides; only the triangles of the batch's own faces are kept. If a closed
+shape still ends up with open edges it is tessellated serially instead.
+"""
+
+import numpy
+
+import FreeCAD
+import Part
+
+import exportplus_cache
+import exportplus_parallel
+import exportplus_settings
+from exportplus_meshdata import MeshData
+
+
+# Batches smaller than this are not worth a worker
+MIN_FACES_PER_BATCH = 100
+
+
+def get_face_threshold():
+    """Return the face count from which shapes are tessellated in parallel (0 = never)"""
+    return max(exportplus_settings.current().ParallelTessellationFaces, 0)
+
+
+def is_large(shape):
+    threshold = get_face_threshold()
+    return bool(threshold) and len(shape.Faces) >= threshold
+
+
+def _face_batches(faces, batch_count):
+    """Split face indices into batch_count spatially coherent batches"""
+    centers = numpy.array([
+        (face.BoundBox.Center.x, face.BoundBox.Center.y, face.BoundBox.Center.z) for face in faces
+    ])
+    # Sort along the longest extent, then along the second one within slabs
+    extent = centers.max(axis=0) - centers.min(axis=0)
+    axes = numpy.argsort(extent)[::-1]
+    slabs = max(1, int(round(batch_count ** 0.5)))
+    order = numpy.argsort(centers[:, axes[0]], kind="stable")
+    batches = []
+    for slab in numpy.array_split(order, slabs):
+        slab = slab[numpy.argsort(centers[slab, axes[1]], kind="stable")]
+        per_slab = max(1, int(round(float(batch_count) / slabs)))
+        batches.extend(part.tolist() for part in numpy.array_split(slab, per_slab) if len(part))
+    return batches
+
+
+def _halos(faces, batches):
+    """Return for every batch the indices of adjacent faces outside it"""
+    edge_faces = {}
+    face_edges = []
+    for index, face in enumerate(faces):
+        keys = [edge.hashCode() for edge in face.Edges]
+        face_edges.append(keys)
+        for key in keys:
+            edge_faces.setdefault(key, []).append(index)
+
+    halos = []
+    for batch in batches:
+        members = set(batch)
+        halo = set()
+        for index in batch:
+            for key in face_edges[index]:
+                halo.update(edge_faces[key])
+        halos.append(sorted(halo - members))
+    return halos
+
+
+def _batch_worker(task):
+    """Mesh a batch with its halo and return the batch faces as MeshData - executed in a worker"""
+    import MeshPart
+
+    brep, own_count, linear, angular = task
+    compound = exportplus_cache.shape_from_brep(brep)
+    # Meshing the compound stores one triangulation per face, shared edges included
+    MeshPart.meshFromShape(
+        Shape=compound,
+        LinearDeflection=linear,
+        AngularDeflection=angular,
+        Relative=False,
+    )
+    parts = []
+    for face in compound.Faces[:own_count]:
+        # Reuses the stored triangulation as long as it is at least this fine
+        points, triangles = face.tessellate(linear * 1.5)
+        if triangles:
+            parts.append(MeshData(
+                numpy.array([(p.x, p.y, p.z) for p in points], dtype=numpy.float64),
+                numpy.array(triangles, dtype=numpy.uint32),
+            ))
+    return MeshData.merge(parts)
+
+
+def open_edge_count(data):
+    """Return the number of edges used by only one triangle"""
+    if not data.triangle_count:
+        return 0
+    edges = numpy.concatenate([data.facets[:, [0, 1]], data.facets[:, [1, 2]], data.facets[:, [2, 0]]])
+    edges.sort(axis=1)
+    _, counts = numpy.unique(edges, axis=0, return_counts=True)
+    return int((counts == 1).sum())
+
+
+def tessellate_parallel(shape, linear_deflection, angular_deflection, max_workers=None):
+    """
+    Tessellate one shape with its faces split over the worker pool
+
+    Returns MeshData, or None if the parallel result is not watertight
+    where the shape is closed (the caller then meshes serially).
+    """
+    faces = shape.Faces
+    if max_workers is None:
+        max_workers = exportplus_parallel.get_worker_count()
+    batch_count = min(max_workers * 2, len(faces) // MIN_FACES_PER_BATCH)
+    if batch_count < 2:
+        return None
+
+    batches = _face_batches(faces, batch_count)
+    halos = _halos(faces, batches)
+    tasks = []
+    for batch, halo in zip(batches, halos):
+        # Faces come from one shape, so the compound keeps their shared edges
+        compound = Part.makeCompound([faces[i] for i in batch] + [faces[i] for i in halo])
+        tasks.append((exportplus_cache.shape_to_brep(compound), len(batch), linear_deflection, angular_deflection))
+
+    results = exportplus_parallel.map_parallel(_batch_worker, tasks, max_workers=max_workers)
+    # Border vertices are computed identically on both sides, only rounding differs
+    tolerance = max(shape.BoundBox.DiagonalLength * 1e-9, 1e-9)
+    data = MeshData.merge(results).welded(tolerance)
+
+    if shape.isClosed() and shape.Solids:
+        open_edges = open_edge_count(data)
+        if open_edges:
+            FreeCAD.Console.PrintWarning(
+                f"ExportPlus: Parallel tessellation left {open_edges} open edge(s), meshing serially\n"
+            )
+            return None
+    FreeCAD.Console.PrintLog(
+        f"ExportPlus: Tessellated {len(faces)} faces in {len(batches)} parallel batches\n"
+    )
+    return data
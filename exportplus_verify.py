@@ -0,0 +1,439 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2026 ExportPlus Workbench                               *
+# *                                                                         *
+# *   This file is part of the ExportPlus FreeCAD Workbench.                *
+# *                                                                         *
+# *   ExportPlus is free software: you can redistribute it and/or modify    *
+# *   it under the terms of the GNU Lesser General Public License as        *
+# *   published by the Free Software Foundation, either version 2.1 of the  *
+# *   License, or (at your option) any later version.                       *
+# *                                                                         *
+# *   ExportPlus is distributed in the hope that it will be useful, but     *
+# *   WITHOUT ANY WARRANTY; without even the implied warranty of            *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU      *
+# *   Lesser General Public License for more details.                       *
+# *                                                                         *
+# *   You should have received a copy of the GNU Lesser General Public      *
+# *   License along with ExportPlus. If not, see                            *
+# *   <https://www.gnu.org/licenses/>.                                      *
+# *                                                                         *
+# ***************************************************************************
+
+"""Post-export verification of mesh and point cloud files
+
+After an STL or OBJ export the written file is memory-mapped and read back
+with vectorized numpy operations to compute its triangle count, bounds and
+enclosed volume. These are compared with the values expected from the
+source shapes times the scaling factor, so a wrong scale, a truncated file
+or NaN coordinates are reported right away without re-importing the file
+through FreeCAD. PLY point clouds are checked for a consistent header,
+record count, finite coordinates and scaled bounds.
+"""
+
+import mmap
+import os
+import re
+
+import FreeCAD
+
+import exportplus_settings
+
+
+VERIFY_FORMATS = ("STL", "OBJ", "PLY")
+
+# Triangles processed per block when reading binary STL, bounds memory use
+BLOCK_TRIANGLES = 1 << 20
+
+_STL_RECORD = None
+_STL_VERTEX = re.compile(rb"vertex\s+(\S+)\s+(\S+)\s+(\S+)")
+_OBJ_VERTEX = re.compile(rb"^v\s+(\S+)\s+(\S+)\s+(\S+)", re.MULTILINE)
+_OBJ_FACE = re.compile(rb"^f\s+(.+?)\s*$", re.MULTILINE)
+# Triangle faces only, capturing the vertex index of each corner ("7", "7/1" or "7//3")
+_OBJ_TRIANGLE = re.compile(rb"^f\s+(-?\d+)\S*\s+(-?\d+)\S*\s+(-?\d+)\S*\s*$", re.MULTILINE)
+
+
+def is_enabled():
+    """Return True if exports should be verified after writing (VerifyExports)"""
+    return exportplus_settings.current().VerifyExports
+
+
+def _stl_record():
+    global _STL_RECORD
+    if _STL_RECORD is None:
+        import numpy
+        _STL_RECORD = numpy.dtype([
+            ("normal", "<f4", (3,)),
+            ("vertices", "<f4", (3, 3)),
+            ("attribute", "<u2"),
+        ])
+    return _STL_RECORD
+
+
+class MeshStats:
+    """Triangle count, bounds and volume of a mesh file"""
+
+    def __init__(self, triangles, bounds, volume, finite):
+        self.triangles = triangles
+        self.bounds = bounds  # (xmin, ymin, zmin, xmax, ymax, zmax) or None
+        self.volume = volume
+        self.finite = finite
+
+    def __repr__(self):
+        return f"<MeshStats {self.triangles} triangles, volume {self.volume:.6g}>"
+
+
+class PointStats:
+    """Point count, bounds and largest object index of a PLY point cloud"""
+
+    def __init__(self, points, bounds, finite, objects):
+        self.points = points
+        self.bounds = bounds  # (xmin, ymin, zmin, xmax, ymax, zmax) or None
+        self.finite = finite
+        self.objects = objects  # number of object indices used (largest + 1)
+
+    def __repr__(self):
+        return f"<PointStats {self.points} points>"
+
+
+class _Accumulator:
+    """Accumulates bounds and signed volume over blocks of triangles"""
+
+    def __init__(self):
+        self.triangles = 0
+        self.low = None
+        self.high = None
+        self.volume = 0.0
+        self.finite = True
+
+    def add(self, vertices):
+        """Add an (n, 3, 3) array of triangle corner coordinates"""
+        import numpy
+
+        if not len(vertices):
+            return
+        vertices = numpy.asarray(vertices, dtype=numpy.float64)
+        self.triangles += len(vertices)
+        if not numpy.isfinite(vertices).all():
+            self.finite = False
+            vertices = vertices[numpy.isfinite(vertices).all(axis=(1, 2))]
+            if not len(vertices):
+                return
+        points = vertices.reshape(-1, 3)
+        low, high = points.min(axis=0), points.max(axis=0)
+        self.low = low if self.low is None else numpy.minimum(self.low, low)
+        self.high = high if self.high is None else numpy.maximum(self.high, high)
+        cross = numpy.cross(vertices[:, 1], vertices[:, 2])
+        self.volume += float(numpy.einsum("ij,ij->", vertices[:, 0], cross)) / 6.0
+
+    def result(self):
+        bounds = None
+        if self.low is not None:
+            bounds = tuple(float(v) for v in self.low) + tuple(float(v) for v in self.high)
+        return MeshStats(self.triangles, bounds, abs(self.volume), self.finite)
+
+
+def _is_binary_stl(data, size):
+    if size < 84:
+        return False
+    count = int.from_bytes(data[80:84], "little")
+    return size == 84 + 50 * count
+
+
+def _read_stl(data, size):
+    import numpy
+
+    acc = _Accumulator()
+    if _is_binary_stl(data, size):
+        count = (size - 84) // 50
+        records = numpy.frombuffer(data, dtype=_stl_record(), count=count, offset=84)
+        for start in range(0, count, BLOCK_TRIANGLES):
+            acc.add(records["vertices"][start:start + BLOCK_TRIANGLES])
+        del records
+    else:
+        coords = numpy.array(_STL_VERTEX.findall(data), dtype=numpy.float64)
+        acc.add(coords.reshape(-1, 3, 3))
+    return acc.result()
+
+
+def _obj_sections(data):
+    """Return the number of "v" and "f" lines of an OBJ and their numbers, parsed with numpy
+
+    The mapped buffer is split into lines without leaving numpy; the bytes of
+    all lines of one kind are then parsed in a single numpy.fromstring() call.
+    """
+    import numpy
+
+    buf = numpy.frombuffer(data, dtype=numpy.uint8)
+    newlines = numpy.flatnonzero(buf == ord("\n"))
+    starts = numpy.concatenate(([0], newlines + 1))
+    ends = numpy.concatenate((newlines, [len(buf)]))
+    lines = ends - starts > 1
+    starts, ends = starts[lines], ends[lines]
+    first = buf[starts]
+    blank = numpy.isin(buf[starts + 1], (ord(" "), ord("\t")))
+
+    sections = []
+    for kind, dtype in ((b"v", numpy.float64), (b"f", numpy.int64)):
+        chosen = (first == kind[0]) & blank
+        # +1 where a chosen line's values start, -1 where it ends
+        marks = numpy.zeros(len(buf) + 1, dtype=numpy.int8)
+        marks[starts[chosen] + 1] = 1
+        marks[ends[chosen]] -= 1
+        inside = numpy.cumsum(marks[:-1], dtype=numpy.int8).view(numpy.bool_)
+        del marks
+        # Each chosen line starts with a blank, so lines stay separated
+        text = buf[inside].tobytes()
+        del inside
+        # Slashes ("7/1/3") cannot be parsed as plain numbers, leave them to the slow path
+        if kind == b"f" and b"/" in text:
+            sections.append((int(chosen.sum()), None))
+            continue
+        sections.append((int(chosen.sum()), numpy.fromstring(text, dtype=dtype, sep=" ")))
+    return sections
+
+
+def _obj_polygons(data, count):
+    """Fan-triangulate all faces of an OBJ file, including polygons (slow path)"""
+    triangles = []
+    for match in _OBJ_FACE.finditer(data):
+        corners = [int(token.split(b"/")[0]) for token in match.group(1).split()]
+        corners = [c - 1 if c > 0 else count + c for c in corners]
+        for i in range(1, len(corners) - 1):
+            triangles.append((corners[0], corners[i], corners[i + 1]))
+    return triangles
+
+
+def _read_obj(data):
+    import numpy
+
+    (vertex_count, coords), (face_count, corners) = _obj_sections(data)
+    # Every "v" and "f" line has at least three values, so matching totals
+    # mean plain "v x y z" vertices and "f a b c" triangles, as ExportPlus writes them
+    if len(coords) == 3 * vertex_count and corners is not None and len(corners) == 3 * face_count:
+        points = coords.reshape(-1, 3)
+        triangles = corners.reshape(-1, 3)
+        triangles = numpy.where(triangles > 0, triangles - 1, len(points) + triangles)
+        acc = _Accumulator()
+        if len(triangles):
+            acc.add(points[triangles])
+        return acc.result()
+    del coords, corners
+
+    # Other writers: vertex colors, texture / normal indices or polygons
+    points = numpy.array(_OBJ_VERTEX.findall(data), dtype=numpy.float64).reshape(-1, 3)
+    corners = _OBJ_TRIANGLE.findall(data)
+    if len(corners) == sum(1 for _ in _OBJ_FACE.finditer(data)):
+        # Triangles only, as ExportPlus writes them: convert all indices at once
+        triangles = numpy.array(corners, dtype=bytes).reshape(-1, 3).astype(numpy.int64)
+        triangles = numpy.where(triangles > 0, triangles - 1, len(points) + triangles)
+    else:
+        triangles = numpy.array(_obj_polygons(data, len(points)), dtype=numpy.int64)
+    acc = _Accumulator()
+    if len(triangles):
+        acc.add(points[triangles])
+    return acc.result()
+
+
+def _read_ply(data, size):
+    """Check the header of an ExportPlus PLY and return the PointStats of its records"""
+    import numpy
+
+    import exportplus_points
+
+    end = data.find(b"end_header\n", 0, 4096)
+    if data[:4] != b"ply\n" or end < 0:
+        raise ValueError("no PLY header")
+    header = data[:end].decode("ascii", "replace").splitlines()
+    count = None
+    properties = []
+    for line in header:
+        words = line.split()
+        if words[:1] == ["format"] and words[1:2] != ["binary_little_endian"]:
+            raise ValueError(f"unexpected PLY format '{line}'")
+        if words[:2] == ["element", "vertex"] and len(words) == 3:
+            count = int(words[2])
+        if words[:1] == ["property"]:
+            properties.append(tuple(words[1:]))
+    expected = exportplus_points.ply_header(0).decode("ascii").splitlines()
+    if count is None:
+        raise ValueError("PLY header has no vertex element")
+    if properties != [tuple(line.split()[1:]) for line in expected if line.startswith("property")]:
+        raise ValueError("PLY properties do not match the ExportPlus point layout")
+
+    offset = end + len(b"end_header\n")
+    record = exportplus_points.PLY_RECORD
+    if size != offset + count * record.itemsize:
+        raise ValueError(
+            f"PLY size {size} does not match {count} points of {record.itemsize} bytes"
+        )
+    records = numpy.frombuffer(data, dtype=record, count=count, offset=offset)
+    low = high = None
+    finite = True
+    objects = 0
+    for start in range(0, count, BLOCK_TRIANGLES):
+        block = records[start:start + BLOCK_TRIANGLES]
+        points = numpy.stack([block["x"], block["y"], block["z"]], axis=1).astype(numpy.float64)
+        valid = numpy.isfinite(points).all(axis=1)
+        if not valid.all():
+            finite = False
+            points = points[valid]
+        if len(points):
+            block_low, block_high = points.min(axis=0), points.max(axis=0)
+            low = block_low if low is None else numpy.minimum(low, block_low)
+            high = block_high if high is None else numpy.maximum(high, block_high)
+        if len(block):
+            objects = max(objects, int(block["object"].max()) + 1)
+    del records
+    bounds = None
+    if low is not None:
+        bounds = tuple(float(v) for v in low) + tuple(float(v) for v in high)
+    return PointStats(count, bounds, finite, objects)
+
+
+def read_point_stats(path):
+    """Memory-map a written PLY point cloud and return its PointStats"""
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return _read_ply(data, size)
+
+
+def read_mesh_stats(path):
+    """Memory-map a written STL or OBJ file and return its MeshStats"""
+    size = os.path.getsize(path)
+    if size == 0:
+        return MeshStats(0, None, 0.0, True)
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if path.lower().endswith(".obj"):
+                return _read_obj(data)
+            return _read_stl(data, size)
+
+
+def expected_values(objects, scale_factor, object_scales=None):
+    """Return (bounds, volume, area) of the source objects scaled by scale_factor"""
+    low = high = None
+    volume = area = 0.0
+    closed = True
+    for obj in objects:
+        shape = getattr(obj, "Shape", None)
+        if shape is None or shape.isNull():
+            continue
+        factor = (object_scales or {}).get(getattr(obj, "Name", None), scale_factor)
+        box = shape.BoundBox
+        corners = [(box.XMin * factor, box.YMin * factor, box.ZMin * factor),
+                   (box.XMax * factor, box.YMax * factor, box.ZMax * factor)]
+        box_low = tuple(min(a, b) for a, b in zip(*corners))
+        box_high = tuple(max(a, b) for a, b in zip(*corners))
+        low = box_low if low is None else tuple(map(min, low, box_low))
+        high = box_high if high is None else tuple(map(max, high, box_high))
+        area += shape.Area * factor ** 2
+        if shape.Solids and shape.isClosed():
+            volume += shape.Volume * abs(factor) ** 3
+        else:
+            closed = False
+    if low is None:
+        return None, None, 0.0
+    return low + high, volume if closed else None, area
+
+
+def _verify_points(path, objects, scale_factor, points=None, object_scales=None):
+    """Compare a written PLY point cloud with its source objects, return a list of problems"""
+    stats = read_point_stats(path)
+    bounds, _, _ = expected_values(objects, scale_factor, object_scales)
+    problems = []
+
+    if not stats.finite:
+        problems.append("file contains NaN or infinite coordinates")
+    if points is not None and stats.points != points:
+        problems.append(f"{stats.points} points in the file, {points} written")
+    if stats.objects > len(objects):
+        problems.append(f"points refer to {stats.objects} objects, {len(objects)} exported")
+
+    if bounds is not None and stats.bounds is not None:
+        diagonal = sum((bounds[i + 3] - bounds[i]) ** 2 for i in range(3)) ** 0.5
+        # Samples lie on the surface, only float32 rounding can move them outside the box
+        tolerance = 1e-5 * diagonal + 1e-6
+        outside = max(
+            max(bounds[i] - stats.bounds[i] for i in range(3)),
+            max(stats.bounds[i + 3] - bounds[i + 3] for i in range(3)),
+        )
+        if outside > tolerance:
+            problems.append(
+                f"points lie up to {outside:.6g} outside the scaled source bounds (tolerance {tolerance:.3g})"
+            )
+    return problems
+
+
+def verify_export(path, objects, scale_factor, triangles=None, object_scales=None):
+    """
+    Compare a written mesh or point cloud file with its source objects and return a list of problems
+
+    Parameters:
+    - path: Written STL, OBJ or PLY file
+    - objects: Source objects, before scaling
+    - scale_factor: Scaling factor applied by the export
+    - triangles: Triangle (PLY: point) count reported by the writer, if known
+    - object_scales: {object name: factor} for objects scaled differently
+    """
+    import exportplus_mesh
+
+    if path.lower().endswith(".ply"):
+        return _verify_points(path, objects, scale_factor, triangles, object_scales)
+
+    stats = read_mesh_stats(path)
+    bounds, volume, area = expected_values(objects, scale_factor, object_scales)
+    linear, _ = exportplus_mesh.get_tessellation()
+    format_name = "OBJ" if path.lower().endswith(".obj") else "STL"
+    # Budget mode coarsens and decimates beyond the configured deflection,
+    # so the geometric tolerances below would not hold
+    budget = exportplus_mesh.get_budget(format_name)
+    problems = []
+
+    if not stats.finite:
+        problems.append("file contains NaN or infinite coordinates")
+    if stats.triangles == 0 and bounds is not None:
+        problems.append("file contains no triangles")
+    if triangles is not None and stats.triangles != triangles:
+        problems.append(f"{stats.triangles} triangles in the file, {triangles} written")
+
+    if bounds is not None and stats.bounds is not None and not budget:
+        diagonal = sum((bounds[i + 3] - bounds[i]) ** 2 for i in range(3)) ** 0.5
+        # Mesh vertices lie on the surface, curved extremes may fall short by the deflection
+        tolerance = 2.0 * linear + 1e-5 * diagonal
+        worst = max(abs(a - b) for a, b in zip(bounds, stats.bounds))
+        if worst > tolerance:
+            problems.append(
+                "bounds differ from the scaled source by {:.6g} (tolerance {:.3g}): {} vs {}".format(
+                    worst, tolerance,
+                    ", ".join(f"{v:.6g}" for v in stats.bounds),
+                    ", ".join(f"{v:.6g}" for v in bounds),
+                )
+            )
+
+    if volume and not budget:
+        # Chordal error of the tessellation is at most deflection times area
+        tolerance = linear * area + 1e-3 * volume
+        if abs(stats.volume - volume) > tolerance:
+            problems.append(f"volume {stats.volume:.6g} differs from the scaled source {volume:.6g}")
+
+    return problems
+
+
+def report(path, objects, scale_factor, triangles=None, object_scales=None):
+    """Verify a written file and print the result, return True if it matched"""
+    try:
+        problems = verify_export(path, objects, scale_factor, triangles, object_scales)
+    except ImportError:
+        FreeCAD.Console.PrintWarning("ExportPlus: numpy is not available, skipping verification\n")
+        return True
+    except (OSError, ValueError) as e:
+        problems = [f"could not read the file back: {e}"]
+    if problems:
+        for problem in problems:
+            FreeCAD.Console.PrintWarning(f"ExportPlus: Verification of {path}: {problem}\n")
+        return False
+    FreeCAD.Console.PrintMessage(f"ExportPlus: Verified {path}\n")
+    return True
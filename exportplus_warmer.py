@@ -0,0 +1,326 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2026 ExportPlus Workbench                               *
+# *                                                                         *
+# *   This file is part of the ExportPlus FreeCAD Workbench.                *
+# *                                                                         *
+# *   ExportPlus is free software: you can redistribute it and/or modify    *
+# *   it under the terms of the GNU Lesser General Public License as        *
+# *   published by the Free Software Foundation, either version 2.1 of the  *
+# *   License, or (at your option) any later version.                       *
+# *                                                                         *
+# *   ExportPlus is distributed in the hope that it will be useful, but     *
+# *   WITHOUT ANY WARRANTY; without even the implied warranty of            *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU      *
+# *   Lesser General Public License for more details.                       *
+# *                                                                         *
+# *   You should have received a copy of the GNU Lesser General Public      *
+# *   License along with ExportPlus. If not, see                            *
+# *   <https://www.gnu.org/licenses/>.                                      *
+# *                                                                         *
+# ***************************************************************************
+
+
+"""Idle-time warmer - prepare Quick Export while the user is not looking
+
+When enabled (WarmerEnabled), a recompute or selection change starts a
+debounce timer. Once the GUI has been idle for WarmerDelayMs, the selected
+objects are scaled for the user's usual formats and their tessellations
+(STL, OBJ) or hidden-line projections (DXF, SVG, PDF) are computed in the
+background and stored in the same caches the exporters read. Shapes are
+prepared one per timer tick and nothing is started while a mouse button is
+held, a popup or modal dialog is open or a task panel is active, so the
+GUI stays responsive. Warming stops at WarmerMemoryMB of cached meshes.
+"""
+
+import collections
+import threading
+
+import FreeCAD
+import FreeCADGui
+from PySide import QtCore, QtGui
+
+import exportplus_cache
+import exportplus_export
+import exportplus_fingerprint
+import exportplus_history
+import exportplus_memory
+import exportplus_mesh
+import exportplus_parallel
+import exportplus_projection
+import exportplus_selection
+import exportplus_settings
+
+
+# Formats whose expensive preparation is cached and can be warmed
+WARM_FORMATS = exportplus_mesh.MESH_FORMATS + ("DXF", "SVG", "PDF")
+
+# Exports looked at to find the usual formats, and how many to warm
+HISTORY_SAMPLE = 50
+USUAL_FORMAT_COUNT = 2
+
+# Interval of the preparation timer while waiting for the user or a batch
+BUSY_INTERVAL_MS = 100
+
+_warmer = None
+_observer = None
+
+
+def is_enabled():
+    """Return True if idle-time warming is switched on"""
+    return exportplus_settings.current().WarmerEnabled
+
+
+def get_memory_limit():
+    """Return the memory cap for warmed meshes in bytes"""
+    return max(exportplus_settings.current().WarmerMemoryMB, 1) * 1024 * 1024
+
+
+def usual_formats():
+    """Return the formats to warm: WarmerFormats, else the most exported ones"""
+    configured = [
+        name.strip().upper()
+        for name in exportplus_settings.current().WarmerFormats.split(",")
+        if name.strip()
+    ]
+    if configured:
+        return [name for name in configured if name in WARM_FORMATS]
+
+    counts = collections.Counter()
+    try:
+        for row in exportplus_history.query(limit=HISTORY_SAMPLE):
+            if row["format"] in WARM_FORMATS:
+                counts[row["format"]] += 1
+    except Exception as e:
+        FreeCAD.Console.PrintLog(f"ExportPlus: Warmer could not read the export history: {e}\n")
+    formats = [name for name, _ in counts.most_common(USUAL_FORMAT_COUNT)]
+    return formats or ["STL"]
+
+
+def _user_busy():
+    """Return True while the user is interacting with the GUI"""
+    app = QtGui.QApplication
+    if app.mouseButtons() != QtCore.Qt.NoButton:
+        return True
+    if app.activePopupWidget() is not None or app.activeModalWidget() is not None:
+        return True
+    return FreeCADGui.Control.activeDialog()
+
+
+class _Prepared:
+    """Stand-in object carrying a scaled shape for project_objects()"""
+
+    def __init__(self, shape):
+        self.Shape = shape
+
+
+class _WarmJob:
+    """Objects to prepare for one format at one scale"""
+
+    def __init__(self, format_name, scale_factor, object_names):
+        self.format_name = format_name
+        self.scale_factor = scale_factor
+        self.object_names = list(object_names)
+        self.index = 0
+        # Mesh formats: (cache key, task); projection formats: scaled shapes
+        self.items = []
+
+    @property
+    def prepared(self):
+        return self.index >= len(self.object_names)
+
+
+class ExportWarmer:
+    """Fills the export caches for the current selection while the GUI is idle"""
+
+    def __init__(self):
+        self._jobs = collections.deque()
+        self._doc_name = None
+        self._thread = None
+        self._own_cache = False
+
+        self._timer = QtCore.QTimer()
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._start)
+
+        self._tick_timer = QtCore.QTimer()
+        self._tick_timer.timeout.connect(self._tick)
+
+    def schedule(self):
+        """Drop pending work and start warming once the GUI has been idle"""
+        self._jobs.clear()
+        self._tick_timer.stop()
+        if not is_enabled():
+            self._release_cache()
+            return
+        self._timer.start(max(0, exportplus_settings.current().WarmerDelayMs))
+
+    def stop(self):
+        self._timer.stop()
+        self._tick_timer.stop()
+        self._jobs.clear()
+        self._release_cache()
+
+    def _release_cache(self):
+        if self._own_cache and self._thread is None:
+            exportplus_mesh.disable_tessellation_cache()
+            self._own_cache = False
+
+    def _cache(self):
+        """Return the tessellation cache, creating one capped at WarmerMemoryMB"""
+        cache = exportplus_mesh.tessellation_cache()
+        limit = get_memory_limit()
+        if cache is None:
+            cache = exportplus_mesh.enable_tessellation_cache(max_mb=limit // (1024 * 1024))
+            self._own_cache = True
+        elif self._own_cache:
+            cache.max_bytes = limit
+        return cache
+
+    def _start(self):
+        """Queue one job per usual format for the current selection"""
+        if not is_enabled() or FreeCAD.ActiveDocument is None:
+            return
+        selection = FreeCADGui.Selection.getSelection()
+        if not selection:
+            return
+        self._doc_name = FreeCAD.ActiveDocument.Name
+
+        for format_name in usual_formats():
+            objects = exportplus_selection.resolve_selection(selection, format_name)
+            if format_name not in exportplus_mesh.MESH_FORMATS:
+                # PDF projects bodies regardless of ProjectionEnabled
+                if format_name != "PDF" and not exportplus_projection.is_enabled():
+                    continue
+                objects = [obj for obj in objects if exportplus_projection.needs_projection(obj)]
+            names = [obj.Name for obj in objects if hasattr(obj, "Shape")]
+            if names:
+                scale_factor = exportplus_export.get_scaling_factor(format_name)
+                self._jobs.append(_WarmJob(format_name, scale_factor, names))
+
+        if self._jobs:
+            self._cache()
+            self._tick_timer.start(0)
+
+    def _over_limit(self):
+        cache = exportplus_mesh.tessellation_cache()
+        if cache is not None and cache.total_bytes >= get_memory_limit():
+            return True
+        ceiling = exportplus_mesh.get_memory_limit()
+        if not ceiling:
+            return False
+        rss = exportplus_memory.current_rss()
+        # Unknown RSS (unsupported platform) never blocks warming
+        return rss is not None and rss >= ceiling
+
+    def _tick(self):
+        """Prepare one object, or hand a prepared job to the background thread"""
+        if self._thread is not None or _user_busy():
+            self._tick_timer.setInterval(BUSY_INTERVAL_MS)
+            return
+        self._tick_timer.setInterval(0)
+
+        if not self._jobs:
+            self._tick_timer.stop()
+            return
+        if self._over_limit():
+            FreeCAD.Console.PrintLog("ExportPlus: Warmer stopped at its memory cap\n")
+            self._jobs.clear()
+            self._tick_timer.stop()
+            return
+
+        try:
+            doc = FreeCAD.getDocument(self._doc_name)
+        except NameError:
+            self.stop()
+            return
+
+        job = self._jobs[0]
+        if not job.prepared:
+            self._prepare(doc, job, job.object_names[job.index])
+            job.index += 1
+            return
+
+        self._jobs.popleft()
+        if job.items:
+            self._thread = threading.Thread(
+                target=self._run, args=(job, exportplus_settings.current()),
+                name="ExportPlusWarmer", daemon=True,
+            )
+            self._thread.start()
+
+    def _prepare(self, doc, job, name):
+        """Scale one object the way export_with_scaling does (GUI thread)"""
+        obj = doc.getObject(name)
+        if obj is None or obj.Shape.isNull():
+            return
+        shape = exportplus_selection.global_shape(obj).copy()
+        if job.scale_factor != 1.0:
+            shape.scale(job.scale_factor)
+
+        if job.format_name not in exportplus_mesh.MESH_FORMATS:
+            job.items.append(shape)
+            return
+
+        linear, angular = exportplus_mesh.get_tessellation()
+        key = (exportplus_fingerprint.shape_fingerprint(shape), linear, angular)
+        if key not in self._cache():
+            job.items.append((key, (exportplus_cache.shape_to_brep(shape), 1.0, linear, angular)))
+
+    def _run(self, job, settings):
+        """Compute the prepared job and store the results in the caches (worker thread)"""
+        try:
+            with exportplus_settings.using(settings):
+                if job.format_name in exportplus_mesh.MESH_FORMATS:
+                    keys = [key for key, _ in job.items]
+                    tasks = [task for _, task in job.items]
+                    results = exportplus_parallel.map_parallel(exportplus_mesh.tessellate_brep, tasks)
+                    cache = exportplus_mesh.tessellation_cache()
+                    if cache is not None:
+                        for key, data in zip(keys, results):
+                            exportplus_mesh.cache_put(cache, key, data)
+                else:
+                    exportplus_projection.project_objects([_Prepared(shape) for shape in job.items])
+            FreeCAD.Console.PrintLog(
+                f"ExportPlus: Warmed {len(job.items)} object(s) for {job.format_name}\n"
+            )
+        except Exception as e:
+            FreeCAD.Console.PrintLog(f"ExportPlus: Warming {job.format_name} failed: {e}\n")
+        finally:
+            self._thread = None
+
+
+class _WarmerObserver:
+    """Document and selection observer restarting the warmer's idle timer"""
+
+    def slotRecomputedDocument(self, doc):
+        _warmer.schedule()
+
+    def slotDeletedDocument(self, doc):
+        if _warmer._doc_name == doc.Name:
+            _warmer.stop()
+
+    def setSelection(self, doc):
+        _warmer.schedule()
+
+    def addSelection(self, doc, obj, sub, pnt):
+        _warmer.schedule()
+
+    def removeSelection(self, doc, obj, sub):
+        _warmer.schedule()
+
+    def clearSelection(self, doc):
+        _warmer.schedule()
+
+
+def install():
+    """Start observing recomputes and selection changes (once, from the GUI)"""
+    global _warmer, _observer
+    if _warmer is not None:
+        return _warmer
+    _warmer = ExportWarmer()
+    _observer = _WarmerObserver()
+    FreeCAD.addDocumentObserver(_observer)
+    FreeCADGui.Selection.addObserver(_observer)
+    return _warmer
@@ -0,0 +1,225 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2026 ExportPlus Workbench                               *
+# *                                                                         *
+# *   This file is part of the ExportPlus FreeCAD Workbench.                *
+# *                                                                         *
+# *   ExportPlus is free software: you can redistribute it and/or modify    *
+# *   it under the terms of the GNU Lesser General Public License as        *
+# *   published by the Free Software Foundation, either version 2.1 of the  *
+# *   License, or (at your option) any later version.                       *
+# *                                                                         *
+# *   ExportPlus is distributed in the hope that it will be useful, but     *
+# *   WITHOUT ANY WARRANTY; without even the implied warranty of            *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU      *
+# *   Lesser General Public License for more details.                       *
+# *                                                                         *
+# *   You should have received a copy of the GNU Lesser General Public      *
+# *   License along with ExportPlus. If not, see                            *
+# *   <https://www.gnu.org/licenses/>.                                      *
+# *                                                                         *
+# ***************************************************************************
+
+"""Watch mode - keep a mesh export up to date while the design changes
+
+A watch binds a set of objects to an output file. After every recompute
+of the document the watch is (debounced) re-run: objects whose geometry
+fingerprint changed are re-tessellated in the worker pool from a background
+thread, unchanged objects reuse their cached meshes, and the merged mesh
+replaces the output file atomically - the GUI is never blocked and the
+slicer never sees a half-written file.
+"""
+
+import os
+import threading
+
+import FreeCAD
+from PySide import QtCore
+
+import exportplus_cache
+import exportplus_export
+import exportplus_fingerprint
+import exportplus_mesh
+import exportplus_output
+import exportplus_parallel
+import exportplus_selection
+import exportplus_settings
+from exportplus_meshdata import MeshData
+
+
+# Formats a watch can keep up to date
+WATCH_FORMATS = ("STL", "OBJ")
+
+# Active watches and the document observer driving them
+_watches = []
+_observer = None
+
+
+class ExportWatch:
+    """Keeps one output file in sync with a set of document objects"""
+
+    def __init__(self, doc, objects, path, format_name):
+        self.doc_name = doc.Name
+        self.object_names = [obj.Name for obj in objects if hasattr(obj, "Shape")]
+        self.path = path
+        self.format_name = format_name
+
+        self._fingerprints = {}
+        self._meshes = {}
+        self._settings = None
+        self._busy = False
+
+        self._timer = QtCore.QTimer()
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._run)
+
+    def __repr__(self):
+        return f"<ExportWatch {self.format_name} {self.path} ({len(self.object_names)} objects)>"
+
+    def schedule(self, delay=None):
+        """(Re)start the debounce timer"""
+        if delay is None:
+            delay = exportplus_settings.current().WatchDelayMs
+        self._timer.start(max(0, delay))
+
+    def stop(self):
+        self._timer.stop()
+
+    def _run(self):
+        """Collect changed objects (GUI thread) and export them in the background"""
+        if self._busy:
+            # Previous export still running - look again once it is done
+            self.schedule()
+            return
+
+        try:
+            doc = FreeCAD.getDocument(self.doc_name)
+        except NameError:
+            stop_watch(self)
+            return
+
+        scale_factor = exportplus_export.get_scaling_factor(self.format_name)
+        linear, angular = exportplus_mesh.get_tessellation()
+        settings = (scale_factor, linear, angular)
+        if settings != self._settings:
+            # Scale or tessellation changed - every cached mesh is stale
+            self._fingerprints.clear()
+            self._meshes.clear()
+            self._settings = settings
+
+        names = []
+        fingerprints = []
+        tasks = []
+        present = set()
+        for name in self.object_names:
+            obj = doc.getObject(name)
+            if obj is None or obj.Shape.isNull():
+                continue
+            present.add(name)
+            # Moving an enclosing App::Part changes the exported geometry but not the object
+            placement = exportplus_selection.container_placement(obj)
+            fingerprint = (
+                exportplus_fingerprint.object_fingerprint(obj),
+                tuple(placement.toMatrix().A) if placement is not None else None,
+            )
+            if self._fingerprints.get(name) != fingerprint:
+                names.append(name)
+                fingerprints.append(fingerprint)
+                tasks.append((
+                    exportplus_cache.shape_to_brep(exportplus_selection.global_shape(obj)),
+                    scale_factor, linear, angular,
+                ))
+
+        removed = [name for name in self._meshes if name not in present]
+        for name in removed:
+            del self._meshes[name]
+            self._fingerprints.pop(name, None)
+
+        if not tasks and not removed:
+            return
+
+        self._busy = True
+        thread = threading.Thread(
+            target=self._export, args=(names, fingerprints, tasks), name="ExportPlusWatch", daemon=True
+        )
+        thread.start()
+
+    def _export(self, names, fingerprints, tasks):
+        """Tessellate changed objects, merge with cached meshes and write (worker thread)"""
+        try:
+            results = exportplus_parallel.map_parallel(exportplus_mesh.tessellate_brep, tasks)
+            for name, fingerprint, data in zip(names, fingerprints, results):
+                self._meshes[name] = data
+                self._fingerprints[name] = fingerprint
+
+            merged = MeshData.merge(
+                [self._meshes[name] for name in self.object_names if name in self._meshes]
+            )
+            with exportplus_output.atomic_output(self.path) as temp_path:
+                merged.write(temp_path, self.format_name, exportplus_output.get_buffer_size())
+            FreeCAD.Console.PrintMessage(
+                f"ExportPlus: Watch re-exported {len(names)} changed object(s) to {self.path}\n"
+            )
+        except Exception as e:
+            FreeCAD.Console.PrintError(f"ExportPlus: Watch export to {self.path} failed: {e}\n")
+        finally:
+            self._busy = False
+
+
+class _WatchObserver:
+    """Document observer forwarding recomputes to the matching watches"""
+
+    def slotRecomputedDocument(self, doc):
+        for watch in list(_watches):
+            if watch.doc_name == doc.Name:
+                watch.schedule()
+
+    def slotDeletedDocument(self, doc):
+        for watch in list(_watches):
+            if watch.doc_name == doc.Name:
+                stop_watch(watch)
+
+
+def start_watch(doc, objects, path, format_name):
+    """Start watching objects and export them to path now and after every change"""
+    global _observer
+
+    if format_name not in WATCH_FORMATS:
+        raise ValueError(f"Watch mode supports {', '.join(WATCH_FORMATS)}, not {format_name}")
+
+    # Only one watch per output file
+    for watch in list(_watches):
+        if os.path.abspath(watch.path) == os.path.abspath(path):
+            stop_watch(watch)
+
+    watch = ExportWatch(doc, objects, path, format_name)
+    _watches.append(watch)
+    if _observer is None:
+        _observer = _WatchObserver()
+        FreeCAD.addDocumentObserver(_observer)
+    watch.schedule(0)
+    return watch
+
+
+def stop_watch(watch):
+    """Stop a single watch"""
+    global _observer
+
+    watch.stop()
+    if watch in _watches:
+        _watches.remove(watch)
+    if not _watches and _observer is not None:
+        FreeCAD.removeDocumentObserver(_observer)
+        _observer = None
+
+
+def stop_all():
+    """Stop every active watch"""
+    for watch in list(_watches):
+        stop_watch(watch)
+
+
+def active_watches():
+    """Return the list of active watches"""
+    return list(_watches)